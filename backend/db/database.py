@@ -5,7 +5,7 @@ import os
 import logging
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import String, case, create_engine, inspect, text, type_coerce, update
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
@@ -15,7 +15,7 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///tradingjournalapp.db")
-logger.info(f"Using database URL: {DATABASE_URL}")
+logger.info("Using database URL: %s", DATABASE_URL)
 
 # Ensure the database directory exists
 if DATABASE_URL.startswith("sqlite:///"):
@@ -23,7 +23,7 @@ if DATABASE_URL.startswith("sqlite:///"):
     dir_path = os.path.dirname(db_path)
     if dir_path:
         os.makedirs(dir_path, exist_ok=True)
-        logger.info(f"Ensured database directory exists: {dir_path}")
+        logger.info("Ensured database directory exists: %s", dir_path)
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -67,12 +67,60 @@ def initialize_db() -> None:
         # Create tables
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        upgrade_trade_group_keys(engine)
         logger.info("Database tables created successfully")
         
     except Exception as e:
-        logger.error(f"Failed to initialize database: {str(e)}")
+        logger.error("Failed to initialize database: %s", e)
         raise
 
+def upgrade_trade_group_keys(bind=None) -> None:
+    """
+    Add and backfill the trade group key columns on databases created before them
+    
+    create_all never alters an existing table, so older databases lack
+    emotional_state_key and plan_adherence_key and their indexes. Rows with a
+    NULL key are filled from the enum column the same way Trade's flush
+    events fill new rows, so statistics grouped on the keys include them.
+    
+    Args:
+        bind: Engine to upgrade. Defaults to the application engine.
+    """
+    from ..models.trade import Trade, TRADE_GROUP_KEY_ENUMS
+    
+    bind = bind if bind is not None else engine
+    inspector = inspect(bind)
+    if not inspector.has_table(Trade.__tablename__):
+        return
+    
+    columns = {column["name"] for column in inspector.get_columns(Trade.__tablename__)}
+    trades = Trade.__table__
+    
+    with bind.begin() as conn:
+        for field, enum_class in TRADE_GROUP_KEY_ENUMS.items():
+            key = f"{field}_key"
+            if key not in columns:
+                logger.info("Adding column %s.%s", Trade.__tablename__, key)
+                conn.execute(text(f"ALTER TABLE {Trade.__tablename__} ADD COLUMN {key} VARCHAR"))
+            
+            for index in trades.indexes:
+                if key in index.columns:
+                    index.create(conn, checkfirst=True)
+            
+            # Enum columns store member names; keys hold member values
+            stored = type_coerce(trades.c[field], String)
+            result = conn.execute(
+                update(trades)
+                .where(trades.c[key].is_(None), trades.c[field].isnot(None))
+                .values({key: case(
+                    {member.name: member.value for member in enum_class},
+                    value=stored,
+                    else_=stored
+                )})
+            )
+            if result.rowcount:
+                logger.info("Backfilled %s on %d trades", key, result.rowcount)
+
 def get_engine():
     """
     Get SQLAlchemy engine
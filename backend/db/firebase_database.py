@@ -37,7 +37,7 @@ class FirebaseDatabase:
                     # Use service account credentials
                     cred = credentials.Certificate(cred_path)
                     self.app = firebase_admin.initialize_app(cred)
-                    logger.info(f"Initialized Firebase with service account: {cred_path}")
+                    logger.info("Initialized Firebase with service account: %s", cred_path)
                 else:
                     # Use default credentials (for cloud environments)
                     self.app = firebase_admin.initialize_app()
@@ -51,7 +51,7 @@ class FirebaseDatabase:
             logger.info("Firebase/Firestore initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize Firebase: {str(e)}")
+            logger.error("Failed to initialize Firebase: %s", e)
             raise
 
     def get_client(self) -> Client:
@@ -106,7 +106,7 @@ class FirebaseDatabase:
                 return doc_ref[1].id
                 
         except Exception as e:
-            logger.error(f"Failed to add document to {collection_name}: {str(e)}")
+            logger.error("Failed to add document to %s: %s", collection_name, e)
             raise
 
     def get_document(self, collection_name: str, document_id: str) -> Optional[Dict[str, Any]]:
@@ -132,7 +132,7 @@ class FirebaseDatabase:
                 return None
                 
         except Exception as e:
-            logger.error(f"Failed to get document {document_id} from {collection_name}: {str(e)}")
+            logger.error("Failed to get document %s from %s: %s", document_id, collection_name, e)
             raise
 
     def update_document(self, collection_name: str, document_id: str, data: Dict[str, Any]) -> bool:
@@ -156,7 +156,7 @@ class FirebaseDatabase:
             return True
             
         except Exception as e:
-            logger.error(f"Failed to update document {document_id} in {collection_name}: {str(e)}")
+            logger.error("Failed to update document %s in %s: %s", document_id, collection_name, e)
             raise
 
     def delete_document(self, collection_name: str, document_id: str) -> bool:
@@ -176,7 +176,7 @@ class FirebaseDatabase:
             return True
             
         except Exception as e:
-            logger.error(f"Failed to delete document {document_id} from {collection_name}: {str(e)}")
+            logger.error("Failed to delete document %s from %s: %s", document_id, collection_name, e)
             raise
 
     def query_documents(self, collection_name: str, filters: Optional[List] = None, 
@@ -224,7 +224,7 @@ class FirebaseDatabase:
             return results
             
         except Exception as e:
-            logger.error(f"Failed to query {collection_name}: {str(e)}")
+            logger.error("Failed to query %s: %s", collection_name, e)
             raise
 
     def get_user_documents(self, collection_name: str, user_id: str, 
@@ -277,7 +277,7 @@ class FirebaseDatabase:
             return True
             
         except Exception as e:
-            logger.error(f"Failed to perform batch write: {str(e)}")
+            logger.error("Failed to perform batch write: %s", e)
             raise
 
     def get_statistics(self, user_id: str) -> Dict[str, Any]:
@@ -325,7 +325,7 @@ class FirebaseDatabase:
             }
             
         except Exception as e:
-            logger.error(f"Failed to calculate statistics for user {user_id}: {str(e)}")
+            logger.error("Failed to calculate statistics for user %s: %s", user_id, e)
             raise
 
 # Global Firebase database instance
@@ -1,15 +1,16 @@
 # File: backend/db/repository.py
 # Purpose: Generic repository pattern implementation for database operations
 
-from typing import Generic, Type, TypeVar, List, Optional, Any, Dict
-from sqlalchemy.orm import Session
+from typing import Generic, Type, TypeVar, List, Optional, Any, Dict, Iterator, Tuple, Callable, Iterable
+from sqlalchemy import case, func, insert, or_, select
+from sqlalchemy.orm import Session, selectinload
 from pydantic import BaseModel
 from fastapi.encoders import jsonable_encoder
 import json
 from datetime import datetime
 
 from .database import Base
-from ..models.trade import Trade
+from ..models.trade import Trade, TradeOutcome, PlanAdherence, TRADE_GROUP_KEY_ENUMS, trade_group_key
 from ..models.user import User
 from ..models.journal import Journal
 from ..utils.json_helpers import process_json_field
@@ -20,6 +21,38 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def set_trade_group_keys(trade_data: Dict[str, Any]) -> None:
+    """
+    Fill the string key columns from the enum fields present in trade data
+    
+    ORM flushes derive the keys themselves; this is for Core inserts such as
+    create_many, which bypass the mapper events.
+    
+    Args:
+        trade_data (Dict[str, Any]): Trade column values, updated in place
+    """
+    for field in TRADE_GROUP_KEY_ENUMS:
+        if field in trade_data:
+            trade_data[f"{field}_key"] = trade_group_key(field, trade_data[field])
+
+# Functions called with the IDs of users whose trades a repository write
+# changed, after the write commits. Services register cache invalidation
+# here so every write path, not just their own methods, clears their caches.
+_trade_write_listeners: List[Callable[[Iterable[Any]], None]] = []
+
+def on_trade_write(listener: Callable[[Iterable[Any]], None]) -> Callable[[Iterable[Any]], None]:
+    """
+    Register a function to call with affected user IDs after trades are written
+    
+    Args:
+        listener (Callable[[Iterable[Any]], None]): Function taking the affected user IDs
+    
+    Returns:
+        Callable[[Iterable[Any]], None]: The listener, so this can be used as a decorator
+    """
+    _trade_write_listeners.append(listener)
+    return listener
+
 class Repository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Generic repository for database operations
@@ -38,17 +71,34 @@ class Repository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.model = model
         self.db = db
     
+    def _notify_write(self, user_ids: Iterable[Any]) -> None:
+        """
+        Tell the trade write listeners which users' trades changed
+        
+        Args:
+            user_ids (Iterable[Any]): IDs of the users whose trades were written
+        """
+        if self.model is not Trade:
+            return
+        
+        user_ids = set(user_ids)
+        for listener in _trade_write_listeners:
+            listener(user_ids)
+    
     def get_by_id(self, id: Any) -> Optional[ModelType]:
         """
         Get model by ID
         
+        Instances already loaded in the session are returned from its
+        identity map without a query.
+        
         Args:
             id (Any): Model ID
         
         Returns:
             Optional[ModelType]: Model instance if found, None otherwise
         """
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        return self.db.get(self.model, id)
     
     def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """
@@ -63,15 +113,15 @@ class Repository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return self.db.query(self.model).offset(skip).limit(limit).all()
     
-    def create(self, obj_in: CreateSchemaType) -> ModelType:
+    def _prepare_create_data(self, obj_in: CreateSchemaType) -> Dict[str, Any]:
         """
-        Create a new model instance
+        Convert a creation schema into column values for the model
         
         Args:
             obj_in (CreateSchemaType): Model creation schema
         
         Returns:
-            ModelType: Created model instance
+            Dict[str, Any]: Column values
         """
         # Convert Pydantic model to dict
         obj_in_data = jsonable_encoder(obj_in)
@@ -98,17 +148,78 @@ class Repository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 parsed_date = parse_date_string(obj_in_data["exit_time"])
                 if parsed_date:
                     obj_in_data["exit_time"] = parsed_date
+            
+            set_trade_group_keys(obj_in_data)
         
+        return obj_in_data
+    
+    def create(self, obj_in: CreateSchemaType) -> ModelType:
+        """
+        Create a new model instance
+        
+        Args:
+            obj_in (CreateSchemaType): Model creation schema
+        
+        Returns:
+            ModelType: Created model instance
+        """
         # Create model instance
-        db_obj = self.model(**obj_in_data)
+        db_obj = self.model(**self._prepare_create_data(obj_in))
         
         # Add to database
         self.db.add(db_obj)
         self.db.commit()
         self.db.refresh(db_obj)
+        self._notify_write([getattr(db_obj, "user_id", None)])
+        
+        return db_obj
+    
+    def create_from_dict(self, data: Dict[str, Any]) -> ModelType:
+        """
+        Create a new model instance from column values
+        
+        Unlike create, no schema conversion or field mapping is applied.
+        
+        Args:
+            data (Dict[str, Any]): Column values
+        
+        Returns:
+            ModelType: Created model instance
+        """
+        db_obj = self.model(**data)
+        
+        self.db.add(db_obj)
+        self.db.commit()
+        self.db.refresh(db_obj)
+        self._notify_write([getattr(db_obj, "user_id", None)])
         
         return db_obj
     
+    def create_many(self, objs_in: List[CreateSchemaType], *returning: Any) -> List[Any]:
+        """
+        Create many model instances with a single INSERT ... RETURNING
+        
+        No ORM instances are built, so this is the path for imports where
+        the caller only needs keys back.
+        
+        Args:
+            objs_in (List[CreateSchemaType]): Model creation schemas
+            *returning (Any): Columns to return per row. Defaults to the model ID.
+        
+        Returns:
+            List[Any]: One row of the returned columns per created instance, in input order
+        """
+        if not objs_in:
+            return []
+        
+        stmt = insert(self.model).returning(*(returning or (self.model.id,)), sort_by_parameter_order=True)
+        values = [self._prepare_create_data(obj_in) for obj_in in objs_in]
+        rows = self.db.execute(stmt, values).all()
+        self.db.commit()
+        self._notify_write(data.get("user_id") for data in values)
+        
+        return rows
+    
     def update(self, id: Any, obj_in: UpdateSchemaType) -> Optional[ModelType]:
         """
         Update model instance
@@ -152,7 +263,8 @@ class Repository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 if parsed_date:
                     obj_in_data["exit_time"] = parsed_date
         
-        # Update model instance
+        # Update model instance, remembering the owner in case it changes
+        previous_user_id = getattr(db_obj, "user_id", None)
         for field, value in obj_in_data.items():
             # Skip fields with None values
             if value is None:
@@ -164,6 +276,7 @@ class Repository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         # Commit changes
         self.db.commit()
         self.db.refresh(db_obj)
+        self._notify_write([previous_user_id, getattr(db_obj, "user_id", None)])
         
         return db_obj
     
@@ -184,8 +297,10 @@ class Repository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             return False
         
         # Delete model instance
+        user_id = getattr(db_obj, "user_id", None)
         self.db.delete(db_obj)
         self.db.commit()
+        self._notify_write([user_id])
         
         return True
     
@@ -270,6 +385,122 @@ class TradeRepository(Repository[Trade, CreateSchemaType, UpdateSchemaType]):
                 query = query.filter(self.model.entry_time <= date_range['end'])
         
         return query.all()
+    
+    # Columns read when trades are summarized for AI analysis
+    ANALYSIS_COLUMNS = (
+        Trade.id,
+        Trade.symbol,
+        Trade.setup_type,
+        Trade.entry_price,
+        Trade.exit_price,
+        Trade.position_size,
+        Trade.entry_time,
+        Trade.exit_time,
+        Trade.planned_risk_reward,
+        Trade.actual_risk_reward,
+        Trade.outcome,
+        Trade.profit_loss,
+        Trade.emotional_state,
+        Trade.plan_adherence,
+        Trade.notes,
+        Trade.tags,
+        Trade.created_at,
+        Trade.updated_at
+    )
+    
+    # Rows fetched per round-trip when streaming analysis rows
+    STREAM_BATCH_SIZE = 1000
+    
+    def _analysis_rows_statement(self, user_id: int, date_range: Optional[Dict[str, Any]] = None):
+        """
+        Build the select of a user's trade analysis columns
+        
+        Args:
+            user_id (int): User ID
+            date_range (Optional[Dict[str, Any]], optional): Date range with 'start' and 'end' keys. Defaults to None.
+        
+        Returns:
+            Select: Analysis column select statement
+        """
+        stmt = select(*self.ANALYSIS_COLUMNS).where(self.model.user_id == user_id)
+        
+        if date_range:
+            if date_range.get('start'):
+                stmt = stmt.where(self.model.entry_time >= date_range['start'])
+            if date_range.get('end'):
+                stmt = stmt.where(self.model.entry_time <= date_range['end'])
+        
+        return stmt
+    
+    def get_analysis_rows_by_user(self, user_id: int, date_range: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """
+        Get the analysis columns of a user's trades as lightweight rows
+        
+        Unlike get_by_user, no ORM instances are built, so reading the rows
+        can never trigger per-trade relationship loads.
+        
+        Args:
+            user_id (int): User ID
+            date_range (Optional[Dict[str, Any]], optional): Date range with 'start' and 'end' keys. Defaults to None.
+        
+        Returns:
+            List[Any]: Rows exposing the ANALYSIS_COLUMNS as attributes
+        """
+        return self.db.execute(self._analysis_rows_statement(user_id, date_range)).all()
+    
+    def iter_analysis_rows_by_user(self, user_id: int, date_range: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """
+        Stream the analysis columns of a user's trades
+        
+        Rows are fetched STREAM_BATCH_SIZE at a time through a server-side
+        cursor, so the full history is never held in memory at once.
+        
+        Args:
+            user_id (int): User ID
+            date_range (Optional[Dict[str, Any]], optional): Date range with 'start' and 'end' keys. Defaults to None.
+        
+        Returns:
+            Iterator[Any]: Rows exposing the ANALYSIS_COLUMNS as attributes
+        """
+        return self.db.execute(
+            self._analysis_rows_statement(user_id, date_range),
+            execution_options={"yield_per": self.STREAM_BATCH_SIZE}
+        )
+    
+    # PlanAdherence values (as stored in plan_adherence_key) counted as high
+    # or low adherence; partially followed plans fall in neither bucket
+    HIGH_ADHERENCE_KEYS = (PlanAdherence.FOLLOWED.value,)
+    LOW_ADHERENCE_KEYS = (PlanAdherence.DEVIATED.value, PlanAdherence.NO_PLAN.value)
+    
+    def adherence_buckets(self, user_id: int) -> Dict[Optional[str], Dict[str, int]]:
+        """
+        Count trades and wins per plan adherence bucket in one GROUP BY
+        
+        Args:
+            user_id (int): User ID
+        
+        Returns:
+            Dict[Optional[str], Dict[str, int]]: 'total' and 'wins' keyed by 'high', 'low',
+                or None for trades that partially followed their plan
+        """
+        bucket = case(
+            (self.model.plan_adherence_key.in_(self.HIGH_ADHERENCE_KEYS), "high"),
+            (self.model.plan_adherence_key.in_(self.LOW_ADHERENCE_KEYS), "low"),
+            else_=None
+        )
+        stmt = select(
+            bucket,
+            func.count(),
+            func.sum(case((self.model.outcome == TradeOutcome.WIN, 1), else_=0))
+        ).where(
+            self.model.user_id == user_id,
+            self.model.plan_adherence_key.isnot(None)
+        ).group_by(bucket)
+        
+        return {
+            name: {"total": total, "wins": wins or 0}
+            for name, total, wins in self.db.execute(stmt)
+        }
 
 
 class UserRepository(Repository[User, CreateSchemaType, UpdateSchemaType]):
@@ -305,6 +536,105 @@ class UserRepository(Repository[User, CreateSchemaType, UpdateSchemaType]):
             Optional[User]: User instance if found, None otherwise
         """
         return self.db.query(self.model).filter(self.model.username == username).first()
+    
+    def username_or_email_taken(
+        self,
+        username: Optional[str] = None,
+        email: Optional[str] = None
+    ) -> Tuple[bool, bool]:
+        """
+        Check whether a username and/or email is already in use, in one query
+        
+        Args:
+            username (Optional[str]): Username to check, skipped if None
+            email (Optional[str]): Email to check, skipped if None
+        
+        Returns:
+            Tuple[bool, bool]: Whether the username and the email are taken
+        """
+        conditions = []
+        if username is not None:
+            conditions.append(User.username == username)
+        if email is not None:
+            conditions.append(User.email == email)
+        
+        if not conditions:
+            return False, False
+        
+        username_taken = email_taken = False
+        rows = self.db.execute(select(User.username, User.email).where(or_(*conditions)).limit(2))
+        for row_username, row_email in rows:
+            username_taken = username_taken or (username is not None and row_username == username)
+            email_taken = email_taken or (email is not None and row_email == email)
+        
+        return username_taken, email_taken
+    
+    def taken_usernames_and_emails(self, usernames: List[str], emails: List[str]) -> Tuple[set, set]:
+        """
+        Find which of many usernames and emails are already in use, in one query
+        
+        Args:
+            usernames (List[str]): Usernames to check
+            emails (List[str]): Emails to check
+        
+        Returns:
+            Tuple[set, set]: Taken usernames and taken emails
+        """
+        stmt = select(User.username, User.email).where(
+            or_(User.username.in_(usernames), User.email.in_(emails))
+        )
+        
+        wanted_usernames = set(usernames)
+        wanted_emails = set(emails)
+        taken_usernames = set()
+        taken_emails = set()
+        for row_username, row_email in self.db.execute(stmt):
+            if row_username in wanted_usernames:
+                taken_usernames.add(row_username)
+            if row_email in wanted_emails:
+                taken_emails.add(row_email)
+        
+        return taken_usernames, taken_emails
+    
+    def get_with_journals(self, id: Any, since: Optional[Any] = None) -> Optional[User]:
+        """
+        Get user by ID with their journals loaded in the same call
+        
+        Args:
+            id (Any): User ID
+            since (Optional[Any], optional): Only load journals dated on or after this date.
+                Defaults to None, which loads every journal.
+        
+        Returns:
+            Optional[User]: User instance with journals populated if found, None otherwise
+        """
+        journals = self.model.journals
+        if since is not None:
+            journals = journals.and_(Journal.date >= since)
+        
+        return self.get_with_relations(id, journals)
+    
+    def get_with_relations(self, id: Any, *relations: Any) -> Optional[User]:
+        """
+        Get user by ID with the given relationships loaded up front
+        
+        Each relationship is loaded with one extra SELECT ... IN query
+        instead of a lazy load on first access.
+        
+        Args:
+            id (Any): User ID
+            *relations (Any): User relationship attributes, e.g. User.journals
+        
+        Returns:
+            Optional[User]: User instance with the relationships populated if found, None otherwise
+        """
+        if not relations:
+            return self.get_by_id(id)
+        
+        stmt = select(self.model).where(self.model.id == id).options(
+            *(selectinload(relation) for relation in relations)
+        )
+        return self.db.execute(stmt).scalars().first()
 
 
 class JournalRepository(Repository[Journal, CreateSchemaType, UpdateSchemaType]):
@@ -3,6 +3,7 @@
 
 import logging
 import httpx
+import orjson
 from typing import Dict, Any, List, Optional
 from fastapi import FastAPI, Depends, HTTPException, Body
 from pydantic import BaseModel
@@ -13,6 +14,12 @@ from ..mcp_server import MCPServer
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Trade payloads carry native datetimes and may carry NumPy values from the
+# pattern tools; orjson serializes both directly. Naive trade times are sent
+# without an offset, as the trade analysis client does, since their timezone
+# is not known.
+AI_REQUEST_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
 # Models for request/response
 class TradeAnalysisRequest(BaseModel):
     """Trade analysis request model"""
@@ -314,7 +321,7 @@ class AIClient:
             # Make request
             response = await self.http_client.post(
                 f"{self.url}/api/v1/trades/analyze",
-                json=request_data,
+                content=orjson.dumps(request_data, option=AI_REQUEST_JSON_OPTIONS),
                 headers=self.headers
             )
             
@@ -546,7 +553,7 @@ class AIClient:
             # Make request
             response = await self.http_client.post(
                 f"{self.url}/api/v1/ask",
-                json=request_data,
+                content=orjson.dumps(request_data, option=AI_REQUEST_JSON_OPTIONS),
                 headers=self.headers
             )
             
@@ -568,19 +575,27 @@ class AIClient:
         """Close HTTP client"""
         await self.http_client.aclose()
 
+# Shared AI client, created on first use so its connection pool is reused
+# across requests instead of opening a new one per call
+_ai_client: Optional[AIClient] = None
+
 # Function to get AI client
 async def get_ai_client() -> AIClient:
     """
-    Get AI client
+    Get the shared AI client
     
     Returns:
         AIClient: AI client
     """
-    # In a real implementation, this might get the URL from configuration
-    # For now, using a hardcoded URL
-    url = "http://localhost:8001"
+    global _ai_client
     
-    # Create client
-    client = AIClient(url)
+    # No await between the check and the assignment, so concurrent
+    # coroutines on the event loop cannot create a second client
+    if _ai_client is None:
+        # In a real implementation, this might get the URL from configuration
+        # For now, using a hardcoded URL
+        url = "http://localhost:8001"
+        
+        _ai_client = AIClient(url)
     
-    return client
+    return _ai_client
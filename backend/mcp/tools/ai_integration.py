@@ -4,6 +4,7 @@
 import os
 import logging
 import json
+import re
 import httpx
 import asyncio
 from typing import Dict, List, Any, Optional
@@ -13,6 +14,9 @@ from pydantic import BaseModel, Field
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A bulleted ("-", "•", "*") or single-digit numbered ("1. ", "1) ") list item
+_LIST_ITEM_PATTERN = re.compile(r"[-•*]|\d(?:\. |\) )")
+
 class ClaudeClient:
     """
     Client for Anthropic Claude API integration
@@ -591,11 +595,11 @@ Provide your analysis in the following format:
                     summary = line
             elif current_section == "insights":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     insights.append({"type": "pattern", "description": line.split(". ", 1)[-1] if ". " in line else line[2:]})
             elif current_section == "recommendations":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     recommendations.append(line.split(". ", 1)[-1] if ". " in line else line[2:])
             elif current_section == "conclusion":
                 if not summary:  # Use conclusion as summary if no summary found
@@ -606,7 +610,7 @@ Provide your analysis in the following format:
             # Try to extract bullet points or numbered items
             for line in lines:
                 line = line.strip()
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     # Decide if it's more likely an insight or recommendation
                     if "should" in line.lower() or "consider" in line.lower() or "try" in line.lower():
                         recommendations.append(line.split(". ", 1)[-1] if ". " in line else line[2:])
@@ -689,15 +693,15 @@ Provide your analysis in the following format:
             # Process line based on current section
             if current_section == "strengths":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     strengths.append(line.split(". ", 1)[-1] if ". " in line else line[2:])
             elif current_section == "weaknesses":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     weaknesses.append(line.split(". ", 1)[-1] if ". " in line else line[2:])
             elif current_section == "short_term":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     action_text = line.split(". ", 1)[-1] if ". " in line else line[2:]
                     
                     # Try to extract timeframe and measurable if formatted with colons
@@ -726,7 +730,7 @@ Provide your analysis in the following format:
                     })
             elif current_section == "medium_term":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     action_text = line.split(". ", 1)[-1] if ". " in line else line[2:]
                     
                     # Try to extract timeframe and measurable if formatted with colons
@@ -755,7 +759,7 @@ Provide your analysis in the following format:
                     })
             elif current_section == "long_term":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     action_text = line.split(". ", 1)[-1] if ". " in line else line[2:]
                     
                     # Try to extract timeframe and measurable if formatted with colons
@@ -869,7 +873,7 @@ Provide your analysis in the following format:
             # Process line based on current section
             if current_section == "emotions":
                 # Try to extract emotions from the line
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     # Clean up line
                     emotion_text = line.split(". ", 1)[-1] if ". " in line else line[2:]
                     
@@ -921,11 +925,11 @@ Provide your analysis in the following format:
                     sentiment_trend = "mixed"
             elif current_section == "insights":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     insights.append(line.split(". ", 1)[-1] if ". " in line else line[2:])
             elif current_section == "recommendations":
                 # Check if line starts with a number or bullet
-                if line.startswith(("-", "•", "*")) or (line[0].isdigit() and line[1:3] in (". ", ") ")):
+                if _LIST_ITEM_PATTERN.match(line):
                     recommendations.append(line.split(". ", 1)[-1] if ". " in line else line[2:])
         
         # Remove duplicates while preserving order
@@ -9,6 +9,8 @@ import pandas as pd
 import numpy as np
 from collections import defaultdict
 
+from ...utils.jit_helpers import njit
+
 logger = logging.getLogger(__name__)
 
 def identify_trade_patterns(trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -478,6 +480,49 @@ def detect_revenge_trading(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
         logger.error(f"Error detecting revenge trading: {str(e)}")
         return None
 
+@njit(cache=True)
+def _streak_counts_kernel(is_win, win_streak_min, loss_streak_min):
+    """
+    Count trades that follow long winning and losing streaks
+    
+    A trade follows a long streak when the trade before it belongs to a
+    streak (run of identical outcomes) of at least the given length.
+    
+    Args:
+        is_win (np.ndarray): Boolean win flags in entry time order
+        win_streak_min (int): Minimum length of a winning streak
+        loss_streak_min (int): Minimum length of a losing streak
+        
+    Returns:
+        Tuple[int, int, int, int]: Trades and wins after winning streaks,
+            then trades and wins after losing streaks
+    """
+    n = is_win.shape[0]
+    
+    # Full length of the streak each trade belongs to
+    streak_length = np.empty(n, dtype=np.int64)
+    start = 0
+    for i in range(1, n + 1):
+        if i == n or is_win[i] != is_win[start]:
+            for j in range(start, i):
+                streak_length[j] = i - start
+            start = i
+    
+    after_win_count = after_win_wins = 0
+    after_loss_count = after_loss_wins = 0
+    for i in range(1, n):
+        if is_win[i - 1]:
+            if streak_length[i - 1] >= win_streak_min:
+                after_win_count += 1
+                if is_win[i]:
+                    after_win_wins += 1
+        elif streak_length[i - 1] >= loss_streak_min:
+            after_loss_count += 1
+            if is_win[i]:
+                after_loss_wins += 1
+    
+    return after_win_count, after_win_wins, after_loss_count, after_loss_wins
+
 def analyze_streaks(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     """
     Analyze trading streaks and their impact
@@ -502,44 +547,24 @@ def analyze_streaks(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
         if len(df_sorted) < 10:  # Need at least 10 valid trades
             return None
         
-        # Calculate streaks
-        df_sorted['streak_type'] = df_sorted['outcome']
-        df_sorted['streak_id'] = (df_sorted['streak_type'] != df_sorted['streak_type'].shift(1)).cumsum()
-        
-        # Group by streak
-        streaks = df_sorted.groupby(['streak_id', 'streak_type']).size().reset_index(name='streak_length')
-        
-        # Identify trades after winning and losing streaks
-        df_sorted['prev_streak_type'] = df_sorted['streak_type'].shift(1)
-        df_sorted['prev_streak_id'] = df_sorted['streak_id'].shift(1)
-        
-        # Join streak lengths
-        streak_lengths = streaks.set_index('streak_id')['streak_length']
-        df_sorted['prev_streak_length'] = df_sorted['prev_streak_id'].map(streak_lengths)
-        
-        # Filter to only include trades after streaks
-        after_streak = df_sorted.dropna(subset=['prev_streak_length', 'prev_streak_type'])
-        
-        # Define what counts as a "long" streak
-        long_win_streak = after_streak['prev_streak_length'] >= 3
-        long_loss_streak = after_streak['prev_streak_length'] >= 2
-        
-        # Filter trades after long streaks
-        after_win_streak = after_streak[(after_streak['prev_streak_type'] == 'Win') & long_win_streak]
-        after_loss_streak = after_streak[(after_streak['prev_streak_type'] == 'Loss') & long_loss_streak]
+        # Count trades (and wins) following long winning / losing streaks
+        is_win = (df_sorted['outcome'] == 'Win').to_numpy()
+        after_win_streak_count, after_win_streak_wins, after_loss_streak_count, after_loss_streak_wins = (
+            _streak_counts_kernel(is_win, 3, 2)
+        )
         
         # Calculate win rates
-        if len(after_win_streak) >= 5:
-            win_rate_after_win_streak = (after_win_streak['outcome'] == 'Win').mean() * 100
+        if after_win_streak_count >= 5:
+            win_rate_after_win_streak = after_win_streak_wins / after_win_streak_count * 100
         else:
             win_rate_after_win_streak = None
             
-        if len(after_loss_streak) >= 5:
-            win_rate_after_loss_streak = (after_loss_streak['outcome'] == 'Win').mean() * 100
+        if after_loss_streak_count >= 5:
+            win_rate_after_loss_streak = after_loss_streak_wins / after_loss_streak_count * 100
         else:
             win_rate_after_loss_streak = None
             
-        overall_win_rate = (df_sorted['outcome'] == 'Win').mean() * 100
+        overall_win_rate = is_win.mean() * 100
         
         # Determine which pattern is more significant
         if win_rate_after_win_streak is not None and abs(win_rate_after_win_streak - overall_win_rate) >= 15:
@@ -556,7 +581,7 @@ def analyze_streaks(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
             return None  # No significant pattern found
         
         # Calculate confidence
-        confidence = min(0.85, 0.5 + abs(comparison_rate - overall_win_rate) / 100 + min(1, len(after_win_streak if streak_type == "winning" else after_loss_streak) / 15) * 0.15)
+        confidence = min(0.85, 0.5 + abs(comparison_rate - overall_win_rate) / 100 + min(1, (after_win_streak_count if streak_type == "winning" else after_loss_streak_count) / 15) * 0.15)
         
         # Prepare the appropriate recommendation
         if streak_type == "winning" and direction == "decreases":
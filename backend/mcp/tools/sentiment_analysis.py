@@ -87,6 +87,12 @@ EMOTION_CATEGORIES = {
     'pride': ['proud', 'accomplished', 'satisfied', 'fulfilled', 'content', 'pleased']
 }
 
+# Emotion categories in a fixed order, for callers that index emotions by position
+EMOTION_NAMES = tuple(EMOTION_CATEGORIES)
+
+# Word tokenizer shared by all sentiment helpers
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+
 def analyze_sentiment(text: str) -> float:
     """
     Analyze the sentiment of text and return a sentiment score
@@ -102,7 +108,7 @@ def analyze_sentiment(text: str) -> float:
             return 0.0
         
         # Tokenize text
-        words = re.findall(r'\b\w+\b', text.lower())
+        words = _WORD_PATTERN.findall(text.lower())
         
         # Calculate positive and negative scores
         positive_score = 0
@@ -124,6 +130,29 @@ def analyze_sentiment(text: str) -> float:
         logger.error(f"Error analyzing sentiment: {str(e)}")
         return 0.0
 
+def _emotional_keywords_from_words(words: List[str]) -> List[Dict[str, Any]]:
+    """Find the top 10 emotional keywords among lowercase tokens"""
+    keywords = []
+    for word in words:
+        if word in POSITIVE_WORDS:
+            keywords.append({
+                "word": word,
+                "sentiment": "positive",
+                "intensity": POSITIVE_WORDS[word]
+            })
+        elif word in NEGATIVE_WORDS:
+            keywords.append({
+                "word": word,
+                "sentiment": "negative",
+                "intensity": NEGATIVE_WORDS[word]
+            })
+    
+    # Sort by intensity
+    keywords.sort(key=lambda x: x["intensity"], reverse=True)
+    
+    # Return top 10 keywords
+    return keywords[:10]
+
 def analyze_text_sentiment(text: str) -> Dict[str, Any]:
     """
     Analyze sentiment of text content
@@ -138,8 +167,9 @@ def analyze_text_sentiment(text: str) -> Dict[str, Any]:
                 "keywords": []
             }
         
-        # Tokenize text
-        words = re.findall(r'\b\w+\b', text.lower())
+        # Lowercase and tokenize once; scoring, emotions and keywords share them
+        lowered = text.lower()
+        words = _WORD_PATTERN.findall(lowered)
         
         # Calculate positive and negative scores
         positive_score = 0
@@ -169,14 +199,14 @@ def analyze_text_sentiment(text: str) -> Dict[str, Any]:
         for category, emotion_words in EMOTION_CATEGORIES.items():
             category_score = 0
             for emotion_word in emotion_words:
-                if emotion_word in text.lower():
+                if emotion_word in lowered:
                     category_score += 1
             
             if category_score > 0:
                 emotions[category] = category_score / len(emotion_words)
         
         # Extract emotional keywords
-        keywords = get_emotional_keywords(text)
+        keywords = _emotional_keywords_from_words(words)
         
         return {
             "sentiment": sentiment_label,
@@ -193,6 +223,13 @@ def analyze_text_sentiment(text: str) -> Dict[str, Any]:
             "keywords": []
         }
 
+def analyze_texts_sentiment(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Analyze sentiment of many texts in one call
+    Returns one analysis per text, in input order
+    """
+    return [analyze_text_sentiment(text) for text in texts]
+
 def get_emotional_keywords(text: str) -> List[Dict[str, Any]]:
     """
     Extract emotional keywords from text content
@@ -202,30 +239,7 @@ def get_emotional_keywords(text: str) -> List[Dict[str, Any]]:
         if not text:
             return []
         
-        # Tokenize text
-        words = re.findall(r'\b\w+\b', text.lower())
-        
-        # Find emotional words
-        keywords = []
-        for word in words:
-            if word in POSITIVE_WORDS:
-                keywords.append({
-                    "word": word,
-                    "sentiment": "positive",
-                    "intensity": POSITIVE_WORDS[word]
-                })
-            elif word in NEGATIVE_WORDS:
-                keywords.append({
-                    "word": word,
-                    "sentiment": "negative",
-                    "intensity": NEGATIVE_WORDS[word]
-                })
-        
-        # Sort by intensity
-        keywords.sort(key=lambda x: x["intensity"], reverse=True)
-        
-        # Return top 10 keywords
-        return keywords[:10]
+        return _emotional_keywords_from_words(_WORD_PATTERN.findall(text.lower()))
     except Exception as e:
         logger.error(f"Error extracting emotional keywords: {str(e)}")
         return []
@@ -1,22 +1,82 @@
 # File: backend/mcp/tools/trade_categorization.py
 # Purpose: Tools for trade analysis and categorization
 
+import os
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 
+import httpx
+import orjson
+
 logger = logging.getLogger(__name__)
 
-def get_trade_analysis_client():
+class MockTradeAnalysisClient:
+    """Placeholder trade analysis client used when no MCP server is configured"""
+    
+    def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        logger.info(f"Mock trade analysis: {endpoint}, {data}")
+        return {"status": "success", "analysis": {"quality": "good"}}
+
+class TradeAnalysisClient:
     """
-    Get a client for trade analysis
-    This is a placeholder implementation that can be replaced with a real MCP client
+    HTTP client for the trade analysis MCP server
+    
+    A single instance is shared process-wide so keep-alive connections are
+    reused across trades instead of reconnecting for every analysis call.
     """
-    # This is a mock implementation for now
-    class MockTradeAnalysisClient:
-        def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
-            logger.info(f"Mock trade analysis: {endpoint}, {data}")
-            return {"status": "success", "analysis": {"quality": "good"}}
+    
+    def __init__(self, url: str, timeout: float = 2.0):
+        """
+        Initialize trade analysis client
+        
+        Args:
+            url (str): Trade analysis server URL
+            timeout (float, optional): Request timeout in seconds. Defaults to 2.0.
+        """
+        self.url = url.rstrip("/")
+        self.http_client = httpx.Client(
+            base_url=self.url,
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+    
+    def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Post data to a trade analysis endpoint
+        
+        Args:
+            endpoint (str): Endpoint path relative to the server URL
+            data (Dict[str, Any]): JSON payload
             
+        Returns:
+            Dict[str, Any]: Response data
+        """
+        # orjson serializes datetimes and enums natively and much faster than json
+        response = self.http_client.post(
+            f"/{endpoint.lstrip('/')}",
+            content=orjson.dumps(data),
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def close(self):
+        """Close HTTP client"""
+        self.http_client.close()
+
+@lru_cache()
+def get_trade_analysis_client():
+    """
+    Get the shared client for trade analysis
+    
+    Returns a pooled HTTP client when MCP_TRADE_ANALYSIS_URL is set,
+    otherwise the placeholder mock client.
+    """
+    url = os.environ.get("MCP_TRADE_ANALYSIS_URL")
+    if url:
+        return TradeAnalysisClient(url)
+    
     return MockTradeAnalysisClient()
 
 def categorize_trade_setup(trade_data: Dict[str, Any]) -> str:
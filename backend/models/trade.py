@@ -1,10 +1,11 @@
 # File: backend/models/trade.py
 # Purpose: Trade model to record trading activities
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON, Enum
+from sqlalchemy import event, Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+from typing import Any, Optional
 
 from ..db.database import Base
 
@@ -33,10 +34,50 @@ class PlanAdherence(str, enum.Enum):
     DEVIATED = "Deviated"
     NO_PLAN = "No Plan"
 
+# Enum columns mirrored into plain-string *_key columns for grouping
+TRADE_GROUP_KEY_ENUMS = {
+    "emotional_state": EmotionalState,
+    "plan_adherence": PlanAdherence,
+}
+
+def trade_group_key(field: str, value: Any) -> Optional[str]:
+    """
+    Get the group key for a value of one of the TRADE_GROUP_KEY_ENUMS columns
+    
+    The Enum columns accept a member, its value or its name, so all three are
+    normalized to the member value.
+    
+    Args:
+        field (str): Enum column name
+        value (Any): Column value
+    
+    Returns:
+        Optional[str]: Member value, or None if value is None
+    """
+    if value is None:
+        return None
+    
+    enum_class = TRADE_GROUP_KEY_ENUMS[field]
+    if isinstance(value, enum_class):
+        return value.value
+    
+    member = enum_class._value2member_map_.get(value) or enum_class.__members__.get(value)
+    return member.value if member is not None else str(value)
+
 class Trade(Base):
     """Trade model represents individual trades placed by the user"""
     
     __tablename__ = "trades"
+    __table_args__ = (
+        # Per-user date range scans ordered by entry time
+        Index("ix_trades_user_entry_time", "user_id", "entry_time"),
+        # Per-user lookups by symbol / setup type, ordered by entry time
+        Index("ix_trades_user_symbol_entry_time", "user_id", "symbol", "entry_time"),
+        Index("ix_trades_user_setup_type_entry_time", "user_id", "setup_type", "entry_time"),
+        # Per-user statistics grouped by emotional state / plan adherence
+        Index("ix_trades_user_emotional_state_key", "user_id", "emotional_state_key"),
+        Index("ix_trades_user_plan_adherence_key", "user_id", "plan_adherence_key"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -68,6 +109,11 @@ class Trade(Base):
     emotional_state = Column(Enum(EmotionalState))
     plan_adherence = Column(Enum(PlanAdherence))
     
+    # Plain-string copies of the enum values above, written alongside them
+    # so statistics can group on string columns without enum conversion
+    emotional_state_key = Column(String, nullable=True)
+    plan_adherence_key = Column(String, nullable=True)
+    
     # Notes and media
     notes = Column(Text)
     screenshots = Column(JSON, default=list)  # Store paths to screenshots
@@ -85,3 +131,11 @@ class Trade(Base):
     
     def __repr__(self):
         return f"<Trade(id={self.id}, symbol={self.symbol}, outcome={self.outcome})>"
+
+@event.listens_for(Trade, "before_insert")
+@event.listens_for(Trade, "before_update")
+def _sync_group_keys(mapper, connection, target: Trade) -> None:
+    # Derive the key columns on every ORM flush, so trades created or edited
+    # outside the repository's schema paths never carry NULL or stale keys
+    for field in TRADE_GROUP_KEY_ENUMS:
+        setattr(target, f"{field}_key", trade_group_key(field, getattr(target, field)))
@@ -309,6 +309,16 @@ def calculate_win_rate_by_setup(
     if symbol:
         query = query.filter(Trade.symbol == symbol)
     
+    # Only load the columns this analysis reads
+    query = query.options(
+        sqlalchemy.orm.load_only(
+            Trade.setup_type,
+            Trade.outcome,
+            Trade.profit_loss,
+            Trade.actual_risk_reward
+        )
+    )
+    
     # Execute the query to get all filtered trades
     trades = query.all()
     
@@ -636,6 +646,15 @@ def calculate_emotional_analysis(
     if setup_type:
         query = query.filter(Trade.setup_type == setup_type)
     
+    # Only load the columns this analysis reads
+    query = query.options(
+        sqlalchemy.orm.load_only(
+            Trade.emotional_state,
+            Trade.outcome,
+            Trade.profit_loss
+        )
+    )
+    
     # Execute the query to get all filtered trades
     trades = query.all()
     
@@ -1201,6 +1220,16 @@ def calculate_plan_adherence_analysis(
     if symbol:
         query = query.filter(Trade.symbol == symbol)
     
+    # Only load the columns this analysis reads
+    query = query.options(
+        sqlalchemy.orm.load_only(
+            Trade.plan_adherence,
+            Trade.outcome,
+            Trade.profit_loss,
+            Trade.entry_time
+        )
+    )
+    
     # Execute the query to get all filtered trades
     trades = query.all()
     
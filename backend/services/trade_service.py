@@ -5,22 +5,255 @@
 # It provides both a class-based and function-based API
 
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import date, datetime
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select, case, tuple_, lambda_stmt, false
+import copy
 import json
+import numpy as np
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import BackgroundTasks
 
-from ..db.repository import Repository
-from ..models.trade import Trade
+from ..db.repository import Repository, on_trade_write
+from ..models.trade import Trade, TradeOutcome
 from ..db.schemas import TradeCreate, TradeUpdate, TradeStatistics
 from ..mcp.tools.trade_categorization import get_trade_analysis_client
 from ..utils.date_helpers import parse_date_string
+from ..utils.jit_helpers import njit, prange, NUMBA_AVAILABLE
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application; this module only emits records
 logger = logging.getLogger(__name__)
 
+# Shared worker for fire-and-forget MCP trade analysis
+_analysis_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trade-analysis")
+
+# Minimum number of in-memory trades for the NumPy statistics path
+VECTORIZE_MIN_TRADES = 5000
+
+# Minimum number of trades for the Numba-compiled group reduction
+JIT_MIN_TRADES = 50000
+
+# Upper bound on trades materialized into a list by get_user_trades;
+# larger exports should iterate iter_user_trades instead
+MAX_TRADE_LIST = 10000
+
+# Rows fetched per round-trip when streaming trades
+STREAM_BATCH_SIZE = 1000
+
+# Outcome filter values resolved without going through the enum constructor
+_OUTCOME_BY_VALUE = {outcome.value: outcome for outcome in TradeOutcome}
+
+# Entry-time bounds used when a statistics range is left open
+_MIN_DT = datetime(2000, 1, 1)
+_MAX_DT = datetime(2100, 1, 1)
+
+_ONE_DAY = timedelta(days=1)
+
+# Statistics cache TTL in seconds and maximum number of entries
+STATISTICS_CACHE_TTL = 60
+STATISTICS_CACHE_SIZE = 1024
+
+# Statistics cache keyed by (user_id, start_date, end_date); entries are
+# (timestamp, TradeStatistics). Every repository write to a user's trades
+# drops that user's entries (see _invalidate_statistics_for_users), and callers
+# always get their own copy of the statistics.
+_statistics_cache: Dict[Tuple[Any, ...], Tuple[float, TradeStatistics]] = {}
+_statistics_cache_lock = threading.Lock()
+
+def _start_of_day(value: date) -> datetime:
+    """
+    Get midnight at the start of a date
+    
+    Args:
+        value (date): Date
+        
+    Returns:
+        datetime: Midnight at the start of the date
+    """
+    return datetime(value.year, value.month, value.day)
+
+
+def _empty_trade_statistics() -> TradeStatistics:
+    """
+    Build the statistics reported for a range with no trades
+    
+    Returns:
+        TradeStatistics: Zeroed trade statistics
+    """
+    return TradeStatistics(
+        total_trades=0,
+        winning_trades=0,
+        losing_trades=0,
+        win_rate=0,
+        profit_factor=float('inf'),
+        average_win=0,
+        average_loss=0,
+        largest_win=0,
+        largest_loss=0,
+        net_profit_loss=0,
+        setup_performance={},
+        emotional_state_performance={},
+        plan_adherence_performance={}
+    )
+
+
+def _get_cached_statistics(key: Tuple[Any, ...]) -> Optional[TradeStatistics]:
+    """Get a copy of cached statistics if present and not expired"""
+    with _statistics_cache_lock:
+        entry = _statistics_cache.get(key)
+        if entry is None:
+            return None
+        
+        if time.monotonic() - entry[0] > STATISTICS_CACHE_TTL:
+            del _statistics_cache[key]
+            return None
+        
+        statistics = entry[1]
+    
+    return statistics.model_copy(deep=True)
+
+def _cache_statistics(key: Tuple[Any, ...], statistics: TradeStatistics) -> None:
+    """Add a copy of statistics to the cache, evicting the oldest entries when full"""
+    statistics = statistics.model_copy(deep=True)
+    with _statistics_cache_lock:
+        _statistics_cache[key] = (time.monotonic(), statistics)
+        
+        if len(_statistics_cache) > STATISTICS_CACHE_SIZE:
+            # Remove the oldest 20% of entries
+            entries = sorted(_statistics_cache.items(), key=lambda item: item[1][0])
+            for old_key, _ in entries[:STATISTICS_CACHE_SIZE // 5]:
+                del _statistics_cache[old_key]
+
+def invalidate_statistics_cache(user_id: Any) -> None:
+    """Drop all cached statistics for a user"""
+    _invalidate_statistics_for_users((user_id,))
+
+@on_trade_write
+def _invalidate_statistics_for_users(user_ids) -> None:
+    """Drop all cached statistics for the users whose trades were written"""
+    user_ids = set(user_ids)
+    with _statistics_cache_lock:
+        for key in [key for key in _statistics_cache if key[0] in user_ids]:
+            del _statistics_cache[key]
+
+def _performance_from_buckets(buckets: Dict[Any, List]) -> Dict[Any, Dict[str, Any]]:
+    """Expand [total, wins, profit] buckets into performance dicts"""
+    return {
+        key: {
+            "total_trades": total,
+            "winning_trades": wins,
+            "win_rate": wins / total,
+            "profit_loss": profit_loss
+        }
+        for key, (total, wins, profit_loss) in buckets.items()
+    }
+
+def _group_codes(keys: List[Any], skip) -> Tuple[Dict[Any, int], np.ndarray]:
+    """Map group keys to dense integer codes; skipped keys get -1"""
+    index = {}
+    codes = np.fromiter(
+        (-1 if skip(key) else index.setdefault(key, len(index)) for key in keys),
+        dtype=np.int64,
+        count=len(keys)
+    )
+    return index, codes
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _group_reduce_kernel(codes, wins, profit_loss, n_groups):
+    """Compiled per-group reduction with per-chunk private accumulators"""
+    n = codes.shape[0]
+    n_chunks = 64
+    chunk_size = (n + n_chunks - 1) // n_chunks
+    totals = np.zeros((n_chunks, n_groups), dtype=np.int64)
+    win_counts = np.zeros((n_chunks, n_groups), dtype=np.float64)
+    profits = np.zeros((n_chunks, n_groups), dtype=np.float64)
+    
+    for chunk in prange(n_chunks):
+        stop = min((chunk + 1) * chunk_size, n)
+        for i in range(chunk * chunk_size, stop):
+            group = codes[i]
+            if group >= 0:
+                totals[chunk, group] += 1
+                win_counts[chunk, group] += wins[i]
+                profits[chunk, group] += profit_loss[i]
+    
+    return totals.sum(axis=0), win_counts.sum(axis=0), profits.sum(axis=0)
+
+def _group_reduce(codes: np.ndarray, wins: np.ndarray, profit_loss: np.ndarray, n_groups: int):
+    """Per-group trade count, win count and profit sum for codes >= 0"""
+    # The compiled kernel only pays off once its JIT cost is amortized
+    if NUMBA_AVAILABLE and codes.shape[0] >= JIT_MIN_TRADES:
+        return _group_reduce_kernel(codes, wins, profit_loss, n_groups)
+    
+    mask = codes >= 0
+    codes = codes[mask]
+    return (
+        np.bincount(codes, minlength=n_groups),
+        np.bincount(codes, weights=wins[mask], minlength=n_groups),
+        np.bincount(codes, weights=profit_loss[mask], minlength=n_groups)
+    )
+
+def _vectorized_group_performance(
+    keys: List[Any],
+    skip,
+    wins: np.ndarray,
+    profit_loss: np.ndarray
+) -> Dict[Any, Dict[str, Any]]:
+    """Group performance computed with NumPy reductions"""
+    index, codes = _group_codes(keys, skip)
+    totals, win_counts, profits = _group_reduce(codes, wins, profit_loss, len(index))
+    
+    return {
+        key: {
+            "total_trades": int(totals[i]),
+            "winning_trades": int(win_counts[i]),
+            "win_rate": float(win_counts[i] / totals[i]),
+            "profit_loss": float(profits[i])
+        }
+        for key, i in index.items()
+    }
+
+def _summarize_trades_vectorized(trades) -> TradeStatistics:
+    """NumPy implementation of TradeService.summarize_trades for large inputs"""
+    n = len(trades)
+    profit_loss = np.fromiter((trade.profit_loss for trade in trades), dtype=np.float64, count=n)
+    outcomes = [trade.outcome for trade in trades]
+    wins = np.fromiter((outcome == TradeOutcome.WIN for outcome in outcomes), dtype=np.float64, count=n)
+    is_loss = np.fromiter((outcome == TradeOutcome.LOSS for outcome in outcomes), dtype=bool, count=n)
+    is_win = wins.astype(bool)
+    
+    winning_trades = int(is_win.sum())
+    losing_trades = int(is_loss.sum())
+    gross_profit = float(profit_loss[is_win].sum())
+    gross_loss = float(profit_loss[is_loss].sum())
+    average_loss = gross_loss / losing_trades if losing_trades else 0
+    gross_loss = abs(gross_loss)
+    
+    return TradeStatistics(
+        total_trades=n,
+        winning_trades=winning_trades,
+        losing_trades=losing_trades,
+        win_rate=winning_trades / n,
+        profit_factor=gross_profit / gross_loss if gross_loss != 0 else float('inf'),
+        average_win=gross_profit / winning_trades if winning_trades else 0,
+        average_loss=average_loss,
+        largest_win=float(profit_loss[is_win].max()) if winning_trades else 0,
+        largest_loss=float(profit_loss[is_loss].min()) if losing_trades else 0,
+        net_profit_loss=float(profit_loss.sum()),
+        setup_performance=_vectorized_group_performance(
+            [trade.setup_type for trade in trades], lambda key: False, wins, profit_loss
+        ),
+        emotional_state_performance=_vectorized_group_performance(
+            [trade.emotional_state for trade in trades], lambda key: not key, wins, profit_loss
+        ),
+        plan_adherence_performance=_vectorized_group_performance(
+            [trade.plan_adherence for trade in trades], lambda key: key is None, wins, profit_loss
+        )
+    )
+
 class TradeService:
     """Service for trade management operations"""
     
@@ -38,15 +271,25 @@ class TradeService:
         try:
             self.trade_analysis_client = get_trade_analysis_client()
         except Exception as e:
-            logger.warning(f"Failed to initialize trade analysis client: {str(e)}")
+            logger.warning("Failed to initialize trade analysis client: %s", e)
             self.trade_analysis_client = None
     
-    def create_trade(self, trade_data: TradeCreate) -> Trade:
+    def create_trade(
+        self,
+        trade_data: TradeCreate,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> Trade:
         """
         Create a new trade
         
+        The MCP analysis call is dispatched in the background so it does
+        not add its round-trip to the caller's latency.
+        
         Args:
             trade_data (TradeCreate): Trade data
+            background_tasks (Optional[BackgroundTasks], optional): FastAPI background
+                tasks of the current request. Defaults to None, in which case the
+                analysis runs on a shared worker thread.
             
         Returns:
             Trade: Created trade
@@ -63,39 +306,121 @@ class TradeService:
                 trade_data.exit_time = parsed_date
                 
         # Log data for debugging
-        logger.info(f"Creating trade with processed entry_time: {trade_data.entry_time} (type: {type(trade_data.entry_time)})")
-        logger.info(f"Creating trade with processed exit_time: {trade_data.exit_time} (type: {type(trade_data.exit_time)})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Creating trade with processed entry_time: %s (type: %s)", trade_data.entry_time, type(trade_data.entry_time))
+            logger.debug("Creating trade with processed exit_time: %s (type: %s)", trade_data.exit_time, type(trade_data.exit_time))
                 
         trade = self.repository.create(trade_data)
         
-        # Analyze trade using MCP if available
+        # Analyze trade using MCP if available, off the request path. The
+        # payload is built here because the ORM instance belongs to this
+        # session and must not be touched from another thread.
         if self.trade_analysis_client:
-            try:
-                # Send trade to MCP for analysis
-                analysis_result = self.trade_analysis_client.post(
-                    "trades/analyze",
-                    data={
-                        "trade_id": trade.id,
-                        "symbol": trade.symbol,
-                        "setup_type": trade.setup_type,
-                        "entry_price": trade.entry_price,
-                        "exit_price": trade.exit_price,
-                        "entry_time": trade.entry_time.isoformat(),
-                        "exit_time": trade.exit_time.isoformat(),
-                        "outcome": trade.outcome,
-                        "profit_loss": trade.profit_loss
-                    }
-                )
-                
-                logger.info(f"Trade analysis result: {analysis_result}")
-                
-                # TODO: Update trade with analysis results if needed
+            payload = self._mcp_payload(trade)
             
-            except Exception as e:
-                logger.error(f"Error analyzing trade: {str(e)}")
+            if background_tasks is not None:
+                background_tasks.add_task(self._post_trade_analysis, self.trade_analysis_client, payload)
+            else:
+                _analysis_executor.submit(self._post_trade_analysis, self.trade_analysis_client, payload)
         
         return trade
     
+    def create_trades_bulk(
+        self,
+        trades_data: List[TradeCreate],
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> List[int]:
+        """
+        Create many trades at once, e.g. for CSV imports and backtests
+        
+        All trades are written with one INSERT ... RETURNING and their MCP
+        analysis is queued as a single background job, instead of one
+        insert and one dispatch per trade as with create_trade.
+        
+        Args:
+            trades_data (List[TradeCreate]): Trade data
+            background_tasks (Optional[BackgroundTasks], optional): FastAPI background
+                tasks of the current request. Defaults to None, in which case the
+                analysis runs on a shared worker thread.
+            
+        Returns:
+            List[int]: IDs of the created trades, in input order
+        """
+        trade_ids = [trade_id for trade_id, in self.repository.create_many(trades_data)]
+        
+        if self.trade_analysis_client and trade_ids:
+            payloads = [
+                self._mcp_payload(trade, trade_id)
+                for trade, trade_id in zip(trades_data, trade_ids)
+            ]
+            
+            if background_tasks is not None:
+                background_tasks.add_task(self._post_trade_analysis_batch, self.trade_analysis_client, payloads)
+            else:
+                _analysis_executor.submit(self._post_trade_analysis_batch, self.trade_analysis_client, payloads)
+        
+        return trade_ids
+    
+    @staticmethod
+    def _post_trade_analysis_batch(client, payloads: List[Dict[str, Any]]) -> None:
+        """
+        Send many trades to MCP for analysis over the shared client
+        
+        Args:
+            client: Trade analysis client
+            payloads (List[Dict[str, Any]]): Trade payloads built by _mcp_payload
+        """
+        for payload in payloads:
+            TradeService._post_trade_analysis(client, payload)
+    
+    @staticmethod
+    def _post_trade_analysis(client, payload: Dict[str, Any]) -> None:
+        """
+        Send a trade to MCP for analysis
+        
+        Args:
+            client: Trade analysis client
+            payload (Dict[str, Any]): Trade payload built by _mcp_payload
+        """
+        try:
+            analysis_result = client.post("trades/analyze", data=payload)
+            
+            logger.info("Trade analysis completed for trade %s", payload.get("trade_id"))
+            
+            # The full result can be large; only format it when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Trade analysis result: %s", analysis_result)
+            
+            # TODO: Update trade with analysis results if needed
+        
+        except Exception as e:
+            logger.error("Error analyzing trade: %s", e)
+    
+    @staticmethod
+    def _mcp_payload(trade, trade_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build the MCP analysis payload for a trade
+        
+        Args:
+            trade: Persisted trade, or the trade data it was created from
+            trade_id (Optional[int], optional): Trade ID when trade has none. Defaults to None.
+            
+        Returns:
+            Dict[str, Any]: Payload serializable with orjson
+        """
+        # Datetimes are left as-is; the analysis client serializes with orjson
+        return {
+            "trade_id": trade.id if trade_id is None else trade_id,
+            "symbol": trade.symbol,
+            "setup_type": trade.setup_type,
+            "entry_price": trade.entry_price,
+            "exit_price": trade.exit_price,
+            "entry_time": trade.entry_time,
+            "exit_time": trade.exit_time,
+            "outcome": trade.outcome,
+            "profit_loss": trade.profit_loss
+        }
+    
     def get_trade(self, trade_id: int) -> Optional[Trade]:
         """
         Get trade by ID
@@ -108,6 +433,61 @@ class TradeService:
         """
         return self.repository.get_by_id(trade_id)
     
+    @staticmethod
+    def _filter_trades(
+        stmt,
+        user_id: Optional[int] = None,
+        symbol: Optional[str] = None,
+        setup_type: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        outcome: Optional[str] = None
+    ):
+        """
+        Apply the optional trade list filters to a select statement
+        
+        Args:
+            stmt (StatementLambdaElement): Lambda statement selecting from trades
+            user_id (Optional[int], optional): User ID filter. Defaults to None.
+            symbol (Optional[str], optional): Symbol filter. Defaults to None.
+            setup_type (Optional[str], optional): Setup type filter. Defaults to None.
+            start_date (Optional[date], optional): Start date filter. Defaults to None.
+            end_date (Optional[date], optional): End date filter. Defaults to None.
+            outcome (Optional[str], optional): Outcome filter. Defaults to None.
+            
+        Returns:
+            StatementLambdaElement: Filtered statement
+        """
+        # Each criterion is appended as a lambda so SQLAlchemy caches the
+        # compiled SQL per filter combination and only rebinds the values
+        if user_id:
+            stmt += lambda s: s.where(Trade.user_id == user_id)
+        
+        if symbol:
+            stmt += lambda s: s.where(Trade.symbol == symbol)
+        
+        if setup_type:
+            stmt += lambda s: s.where(Trade.setup_type == setup_type)
+        
+        if start_date:
+            start_datetime = _start_of_day(start_date)
+            stmt += lambda s: s.where(Trade.entry_time >= start_datetime)
+        
+        if end_date:
+            # Half-open upper bound so sub-microsecond timestamps are not dropped
+            end_datetime = _start_of_day(end_date) + _ONE_DAY
+            stmt += lambda s: s.where(Trade.entry_time < end_datetime)
+        
+        if outcome:
+            outcome_enum = _OUTCOME_BY_VALUE.get(outcome)
+            if outcome_enum is None:
+                logger.warning("Unknown trade outcome filter: %s", outcome)
+                stmt += lambda s: s.where(false())
+            else:
+                stmt += lambda s: s.where(Trade.outcome == outcome_enum)
+        
+        return stmt
+    
     def get_trades(
         self,
         user_id: Optional[int] = None,
@@ -116,11 +496,16 @@ class TradeService:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         outcome: Optional[str] = None,
-        skip: int = 0,
+        before_entry_time: Optional[datetime] = None,
+        before_id: Optional[int] = None,
         limit: int = 100
     ) -> List[Trade]:
         """
-        Get trades with filtering and pagination
+        Get trades with filtering and keyset pagination
+        
+        Trades are returned newest first. To fetch the next page, pass the
+        entry_time and id of the last trade of the current page as
+        before_entry_time and before_id.
         
         Args:
             user_id (Optional[int], optional): User ID filter. Defaults to None.
@@ -129,40 +514,76 @@ class TradeService:
             start_date (Optional[date], optional): Start date filter. Defaults to None.
             end_date (Optional[date], optional): End date filter. Defaults to None.
             outcome (Optional[str], optional): Outcome filter. Defaults to None.
-            skip (int, optional): Number of trades to skip. Defaults to 0.
+            before_entry_time (Optional[datetime], optional): Entry time of the last trade
+                of the previous page. Defaults to None.
+            before_id (Optional[int], optional): ID of the last trade of the previous page.
+                Defaults to None.
             limit (int, optional): Maximum number of trades to return. Defaults to 100.
             
         Returns:
             List[Trade]: List of trades
         """
-        query = self.db.query(Trade)
+        stmt = self._filter_trades(
+            lambda_stmt(lambda: select(Trade)),
+            user_id, symbol, setup_type, start_date, end_date, outcome
+        )
         
-        # Apply filters
-        if user_id:
-            query = query.filter(Trade.user_id == user_id)
+        # Seek past the previous page instead of scanning and discarding rows
+        if before_entry_time is not None:
+            if before_id is not None:
+                stmt += lambda s: s.where(
+                    tuple_(Trade.entry_time, Trade.id) < tuple_(before_entry_time, before_id)
+                )
+            else:
+                stmt += lambda s: s.where(Trade.entry_time < before_entry_time)
         
-        if symbol:
-            query = query.filter(Trade.symbol == symbol)
+        # Order by entry time descending, id breaks ties for a stable cursor
+        stmt += lambda s: s.order_by(desc(Trade.entry_time), desc(Trade.id))
         
-        if setup_type:
-            query = query.filter(Trade.setup_type == setup_type)
+        # Apply page size
+        stmt += lambda s: s.limit(limit)
         
-        if start_date:
-            query = query.filter(Trade.entry_time >= datetime.combine(start_date, datetime.min.time()))
-        
-        if end_date:
-            query = query.filter(Trade.entry_time <= datetime.combine(end_date, datetime.max.time()))
+        return self.db.execute(stmt).scalars().all()
+    
+    def get_trades_page(
+        self,
+        user_id: Optional[int] = None,
+        symbol: Optional[str] = None,
+        setup_type: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        outcome: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[Trade], int]:
+        """
+        Get a page of trades together with the total number of matches
         
-        if outcome:
-            query = query.filter(Trade.outcome == outcome)
+        The total is computed with a COUNT(*) OVER () window in the same
+        query, so paginated lists need a single round-trip.
         
-        # Order by entry time descending
-        query = query.order_by(desc(Trade.entry_time))
+        Args:
+            user_id (Optional[int], optional): User ID filter. Defaults to None.
+            symbol (Optional[str], optional): Symbol filter. Defaults to None.
+            setup_type (Optional[str], optional): Setup type filter. Defaults to None.
+            start_date (Optional[date], optional): Start date filter. Defaults to None.
+            end_date (Optional[date], optional): End date filter. Defaults to None.
+            outcome (Optional[str], optional): Outcome filter. Defaults to None.
+            skip (int, optional): Number of trades to skip. Defaults to 0.
+            limit (int, optional): Maximum number of trades to return. Defaults to 100.
+            
+        Returns:
+            Tuple[List[Trade], int]: Trades on the page and total matching trades
+        """
+        stmt = self._filter_trades(
+            lambda_stmt(lambda: select(Trade, func.count().over().label("total"))),
+            user_id, symbol, setup_type, start_date, end_date, outcome
+        )
+        stmt += lambda s: s.order_by(desc(Trade.entry_time)).offset(skip).limit(limit)
         
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        rows = self.db.execute(stmt).all()
         
-        return query.all()
+        return [row.Trade for row in rows], (rows[0].total if rows else 0)
     
     def update_trade(self, trade_id: int, trade_data: TradeUpdate) -> Optional[Trade]:
         """
@@ -187,10 +608,11 @@ class TradeService:
                 trade_data.exit_time = parsed_date
                 
         # Log data for debugging
-        if hasattr(trade_data, 'entry_time') and trade_data.entry_time:
-            logger.info(f"Updating trade with processed entry_time: {trade_data.entry_time} (type: {type(trade_data.entry_time)})")
-        if hasattr(trade_data, 'exit_time') and trade_data.exit_time:
-            logger.info(f"Updating trade with processed exit_time: {trade_data.exit_time} (type: {type(trade_data.exit_time)})")
+        if logger.isEnabledFor(logging.DEBUG):
+            if hasattr(trade_data, 'entry_time') and trade_data.entry_time:
+                logger.debug("Updating trade with processed entry_time: %s (type: %s)", trade_data.entry_time, type(trade_data.entry_time))
+            if hasattr(trade_data, 'exit_time') and trade_data.exit_time:
+                logger.debug("Updating trade with processed exit_time: %s (type: %s)", trade_data.exit_time, type(trade_data.exit_time))
                 
         return self.repository.update(trade_id, trade_data)
     
@@ -223,121 +645,341 @@ class TradeService:
         Returns:
             TradeStatistics: Trade statistics
         """
-        # Default dates if not provided
-        if not start_date:
-            start_date = date(2000, 1, 1)  # Far in the past
-        
-        if not end_date:
-            end_date = date(2100, 1, 1)  # Far in the future
+        # Dashboards refresh the same ranges repeatedly; serve those from cache
+        cache_key = (user_id, start_date, end_date)
+        cached = _get_cached_statistics(cache_key)
+        if cached is not None:
+            return cached
         
-        # Convert dates to datetime
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        end_datetime = datetime.combine(end_date, datetime.max.time())
+        # Half-open [start, end) entry-time range; open ends use fixed bounds
+        start_datetime = _start_of_day(start_date) if start_date else _MIN_DT
+        end_datetime = _start_of_day(end_date) + _ONE_DAY if end_date else _MAX_DT
         
-        # Get trades for the user within date range
-        query = self.db.query(Trade).filter(
+        # Outcome-level totals come back as one row per outcome
+        stmt = lambda_stmt(lambda: select(
+            Trade.outcome,
+            func.count(),
+            func.sum(Trade.profit_loss),
+            func.max(Trade.profit_loss),
+            func.min(Trade.profit_loss)
+        ).where(
             Trade.user_id == user_id,
             Trade.entry_time >= start_datetime,
-            Trade.entry_time <= end_datetime
-        )
+            Trade.entry_time < end_datetime
+        ).group_by(Trade.outcome))
+        
+        total_trades = winning_trades = losing_trades = 0
+        gross_profit = gross_loss = net_profit_loss = 0
+        largest_win = largest_loss = 0
         
-        trades = query.all()
+        for outcome, count, profit_loss, max_profit_loss, min_profit_loss in self.db.execute(stmt):
+            profit_loss = profit_loss or 0
+            total_trades += count
+            net_profit_loss += profit_loss
+            
+            if outcome == TradeOutcome.WIN:
+                winning_trades = count
+                gross_profit = profit_loss
+                largest_win = max_profit_loss or 0
+            elif outcome == TradeOutcome.LOSS:
+                losing_trades = count
+                gross_loss = profit_loss
+                largest_loss = min_profit_loss or 0
         
-        # Calculate statistics
-        total_trades = len(trades)
-        winning_trades = sum(1 for trade in trades if trade.outcome == "Win")
-        losing_trades = sum(1 for trade in trades if trade.outcome == "Loss")
+        # No trades in range (new users, empty windows): skip the group queries
+        if total_trades == 0:
+            statistics = _empty_trade_statistics()
+            _cache_statistics(cache_key, statistics)
+            return statistics
         
         # Avoid division by zero
         win_rate = (winning_trades / total_trades) if total_trades > 0 else 0
         
         # Calculate average win and loss
-        winning_amounts = [trade.profit_loss for trade in trades if trade.outcome == "Win"]
-        losing_amounts = [trade.profit_loss for trade in trades if trade.outcome == "Loss"]
-        
-        average_win = sum(winning_amounts) / len(winning_amounts) if winning_amounts else 0
-        average_loss = sum(losing_amounts) / len(losing_amounts) if losing_amounts else 0
+        average_win = gross_profit / winning_trades if winning_trades else 0
+        average_loss = gross_loss / losing_trades if losing_trades else 0
         
         # Calculate profit factor
-        gross_profit = sum(winning_amounts)
-        gross_loss = abs(sum(losing_amounts))
+        gross_loss = abs(gross_loss)
         profit_factor = gross_profit / gross_loss if gross_loss != 0 else float('inf')
         
-        # Calculate largest win and loss
-        largest_win = max(winning_amounts) if winning_amounts else 0
-        largest_loss = min(losing_amounts) if losing_amounts else 0
-        
-        # Calculate net profit/loss
-        net_profit_loss = sum(trade.profit_loss for trade in trades)
+        # Per-group performance, one row per setup / emotional state / adherence level
+        setup_performance = self._group_performance(
+            Trade.setup_type, user_id, start_datetime, end_datetime
+        )
+        emotional_state_performance = self._group_performance(
+            Trade.emotional_state_key, user_id, start_datetime, end_datetime
+        )
+        plan_adherence_performance = self._group_performance(
+            Trade.plan_adherence_key, user_id, start_datetime, end_datetime
+        )
         
-        # Calculate setup performance
-        setup_performance = {}
-        setup_types = set(trade.setup_type for trade in trades)
+        statistics = TradeStatistics(
+            total_trades=total_trades,
+            winning_trades=winning_trades,
+            losing_trades=losing_trades,
+            win_rate=win_rate,
+            profit_factor=profit_factor,
+            average_win=average_win,
+            average_loss=average_loss,
+            largest_win=largest_win,
+            largest_loss=largest_loss,
+            net_profit_loss=net_profit_loss,
+            setup_performance=setup_performance,
+            emotional_state_performance=emotional_state_performance,
+            plan_adherence_performance=plan_adherence_performance
+        )
+        _cache_statistics(cache_key, statistics)
         
-        for setup in setup_types:
-            setup_trades = [trade for trade in trades if trade.setup_type == setup]
-            setup_total = len(setup_trades)
-            setup_wins = sum(1 for trade in setup_trades if trade.outcome == "Win")
-            setup_profit = sum(trade.profit_loss for trade in setup_trades)
-            
-            setup_performance[setup] = {
-                "total_trades": setup_total,
-                "winning_trades": setup_wins,
-                "win_rate": (setup_wins / setup_total) if setup_total > 0 else 0,
-                "profit_loss": setup_profit
-            }
+        # Return statistics
+        return statistics
+    
+    @staticmethod
+    def summarize_trades(trades) -> TradeStatistics:
+        """
+        Compute trade statistics from already-loaded trades
         
-        # Calculate emotional state performance
-        emotional_state_performance = {}
-        emotional_states = set(trade.emotional_state for trade in trades if trade.emotional_state)
+        Used when the trades are in memory rather than in the database
+        (e.g. imports or backtests), so SQL aggregation is not available.
+        All figures are folded in a single pass over the trades; lists of
+        VECTORIZE_MIN_TRADES or more are reduced with NumPy instead.
         
-        for state in emotional_states:
-            state_trades = [trade for trade in trades if trade.emotional_state == state]
-            state_total = len(state_trades)
-            state_wins = sum(1 for trade in state_trades if trade.outcome == "Win")
-            state_profit = sum(trade.profit_loss for trade in state_trades)
+        Args:
+            trades (Iterable): Trade objects or rows exposing outcome, profit_loss,
+                setup_type, emotional_state and plan_adherence
             
-            emotional_state_performance[state] = {
-                "total_trades": state_total,
-                "winning_trades": state_wins,
-                "win_rate": (state_wins / state_total) if state_total > 0 else 0,
-                "profit_loss": state_profit
-            }
+        Returns:
+            TradeStatistics: Trade statistics
+        """
+        # Large in-memory sets are reduced with NumPy instead of per-trade Python
+        if isinstance(trades, (list, tuple)) and len(trades) >= VECTORIZE_MIN_TRADES:
+            return _summarize_trades_vectorized(trades)
+        
+        total_trades = winning_trades = losing_trades = 0
+        gross_profit = gross_loss = net_profit_loss = 0.0
+        largest_win = float('-inf')
+        largest_loss = float('inf')
         
-        # Calculate plan adherence performance
-        plan_adherence_performance = {}
-        adherence_types = set(trade.plan_adherence for trade in trades if trade.plan_adherence is not None)
+        # Each bucket is [total, wins, profit] so it can be updated in place
+        setup_buckets = {}
+        emotional_state_buckets = {}
+        plan_adherence_buckets = {}
         
-        for adherence in adherence_types:
-            adherence_trades = [trade for trade in trades if trade.plan_adherence == adherence]
-            adherence_total = len(adherence_trades)
-            adherence_wins = sum(1 for trade in adherence_trades if trade.outcome == "Win")
-            adherence_profit = sum(trade.profit_loss for trade in adherence_trades)
+        for trade in trades:
+            profit_loss = trade.profit_loss
+            outcome = trade.outcome
+            win = 0
             
-            plan_adherence_performance[adherence] = {
-                "total_trades": adherence_total,
-                "winning_trades": adherence_wins,
-                "win_rate": (adherence_wins / adherence_total) if adherence_total > 0 else 0,
-                "profit_loss": adherence_profit
-            }
+            total_trades += 1
+            net_profit_loss += profit_loss
+            
+            if outcome == TradeOutcome.WIN:
+                win = 1
+                winning_trades += 1
+                gross_profit += profit_loss
+                if profit_loss > largest_win:
+                    largest_win = profit_loss
+            elif outcome == TradeOutcome.LOSS:
+                losing_trades += 1
+                gross_loss += profit_loss
+                if profit_loss < largest_loss:
+                    largest_loss = profit_loss
+            
+            bucket = setup_buckets.get(trade.setup_type)
+            if bucket is None:
+                bucket = setup_buckets[trade.setup_type] = [0, 0, 0.0]
+            bucket[0] += 1
+            bucket[1] += win
+            bucket[2] += profit_loss
+            
+            if trade.emotional_state:
+                bucket = emotional_state_buckets.get(trade.emotional_state)
+                if bucket is None:
+                    bucket = emotional_state_buckets[trade.emotional_state] = [0, 0, 0.0]
+                bucket[0] += 1
+                bucket[1] += win
+                bucket[2] += profit_loss
+            
+            if trade.plan_adherence is not None:
+                bucket = plan_adherence_buckets.get(trade.plan_adherence)
+                if bucket is None:
+                    bucket = plan_adherence_buckets[trade.plan_adherence] = [0, 0, 0.0]
+                bucket[0] += 1
+                bucket[1] += win
+                bucket[2] += profit_loss
+        
+        average_loss = gross_loss / losing_trades if losing_trades else 0
+        gross_loss = abs(gross_loss)
         
-        # Return statistics
         return TradeStatistics(
             total_trades=total_trades,
             winning_trades=winning_trades,
             losing_trades=losing_trades,
-            win_rate=win_rate,
-            profit_factor=profit_factor,
-            average_win=average_win,
+            win_rate=(winning_trades / total_trades) if total_trades > 0 else 0,
+            profit_factor=gross_profit / gross_loss if gross_loss != 0 else float('inf'),
+            average_win=gross_profit / winning_trades if winning_trades else 0,
             average_loss=average_loss,
-            largest_win=largest_win,
-            largest_loss=largest_loss,
+            largest_win=largest_win if winning_trades else 0,
+            largest_loss=largest_loss if losing_trades else 0,
             net_profit_loss=net_profit_loss,
-            setup_performance=setup_performance,
-            emotional_state_performance=emotional_state_performance,
-            plan_adherence_performance=plan_adherence_performance
+            setup_performance=_performance_from_buckets(setup_buckets),
+            emotional_state_performance=_performance_from_buckets(emotional_state_buckets),
+            plan_adherence_performance=_performance_from_buckets(plan_adherence_buckets)
         )
     
+    def _group_performance(
+        self,
+        column,
+        user_id: int,
+        start_datetime: datetime,
+        end_datetime: datetime
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Aggregate trade count, wins and profit per value of a column
+        
+        Args:
+            column (InstrumentedAttribute): Trade column to group by
+            user_id (int): User ID
+            start_datetime (datetime): Inclusive lower bound on entry time
+            end_datetime (datetime): Exclusive upper bound on entry time
+            
+        Returns:
+            Dict[Any, Dict[str, Any]]: Performance keyed by column value
+        """
+        stmt = lambda_stmt(lambda: select(
+            column,
+            func.count(),
+            func.sum(case((Trade.outcome == TradeOutcome.WIN, 1), else_=0)),
+            func.sum(Trade.profit_loss)
+        ).where(
+            Trade.user_id == user_id,
+            Trade.entry_time >= start_datetime,
+            Trade.entry_time < end_datetime,
+            column.isnot(None)
+        ).group_by(column))
+        
+        return {
+            key: {
+                "total_trades": total,
+                "winning_trades": wins,
+                "win_rate": wins / total,
+                "profit_loss": profit_loss or 0
+            }
+            for key, total, wins, profit_loss in self.db.execute(stmt)
+        }
+    
+    def _user_trades_statement(
+        self,
+        user_id: int,
+        symbol: Optional[str],
+        setup_type: Optional[str],
+        start: Optional[date],
+        end: Optional[date],
+        order_asc: bool,
+        limit: Optional[int]
+    ):
+        """
+        Build the statement shared by get_user_trades and iter_user_trades
+        
+        Args:
+            user_id (int): User ID
+            symbol (Optional[str]): Symbol filter
+            setup_type (Optional[str]): Setup type filter
+            start (Optional[date]): Start date filter
+            end (Optional[date]): End date filter
+            order_asc (bool): Oldest first when True, newest first otherwise
+            limit (Optional[int]): Maximum number of trades to return
+            
+        Returns:
+            StatementLambdaElement: Trade select statement
+        """
+        # Filters compose into a single WHERE clause served by the
+        # (user_id, symbol|setup_type, entry_time) composite indexes
+        stmt = self._filter_trades(
+            lambda_stmt(lambda: select(Trade)),
+            user_id, symbol, setup_type, start, end
+        )
+        
+        if order_asc:
+            stmt += lambda s: s.order_by(Trade.entry_time)
+        else:
+            stmt += lambda s: s.order_by(desc(Trade.entry_time))
+        
+        if limit is not None:
+            stmt += lambda s: s.limit(limit)
+        
+        return stmt
+    
+    def get_user_trades(
+        self,
+        user_id: int,
+        *,
+        symbol: Optional[str] = None,
+        setup_type: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        order_asc: bool = True,
+        limit: Optional[int] = None
+    ) -> List[Trade]:
+        """
+        Get a user's trades matching any combination of filters in one query
+        
+        Args:
+            user_id (int): User ID
+            symbol (Optional[str], optional): Symbol filter. Defaults to None.
+            setup_type (Optional[str], optional): Setup type filter. Defaults to None.
+            start (Optional[date], optional): Start date filter. Defaults to None.
+            end (Optional[date], optional): End date filter. Defaults to None.
+            order_asc (bool, optional): Oldest first when True, newest first otherwise. Defaults to True.
+            limit (Optional[int], optional): Maximum number of trades to return. Defaults to None,
+                which is capped at MAX_TRADE_LIST.
+            
+        Returns:
+            List[Trade]: List of trades
+        """
+        # Bound memory: a list is always materialized in full
+        limit = MAX_TRADE_LIST if limit is None else min(limit, MAX_TRADE_LIST)
+        stmt = self._user_trades_statement(user_id, symbol, setup_type, start, end, order_asc, limit)
+        
+        return self.db.execute(stmt).scalars().all()
+    
+    def iter_user_trades(
+        self,
+        user_id: int,
+        *,
+        symbol: Optional[str] = None,
+        setup_type: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        order_asc: bool = True,
+        limit: Optional[int] = None
+    ) -> Iterator[Trade]:
+        """
+        Stream a user's trades matching the given filters
+        
+        Rows are fetched STREAM_BATCH_SIZE at a time through a server-side
+        cursor, so exports and single-pass consumers such as summarize_trades
+        run in bounded memory regardless of history size.
+        
+        Args:
+            user_id (int): User ID
+            symbol (Optional[str], optional): Symbol filter. Defaults to None.
+            setup_type (Optional[str], optional): Setup type filter. Defaults to None.
+            start (Optional[date], optional): Start date filter. Defaults to None.
+            end (Optional[date], optional): End date filter. Defaults to None.
+            order_asc (bool, optional): Oldest first when True, newest first otherwise. Defaults to True.
+            limit (Optional[int], optional): Maximum number of trades to return. Defaults to None.
+            
+        Returns:
+            Iterator[Trade]: Trades in entry time order
+        """
+        stmt = self._user_trades_statement(user_id, symbol, setup_type, start, end, order_asc, limit)
+        
+        return self.db.execute(
+            stmt,
+            execution_options={"yield_per": STREAM_BATCH_SIZE}
+        ).scalars()
+    
     def get_trades_by_date_range(
         self,
         user_id: int,
@@ -347,6 +989,8 @@ class TradeService:
         """
         Get trades by date range
         
+        Deprecated: use get_user_trades(user_id, start=..., end=...).
+        
         Args:
             user_id (int): User ID
             start_date (date): Start date
@@ -355,24 +999,123 @@ class TradeService:
         Returns:
             List[Trade]: List of trades
         """
-        # Convert dates to datetime
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        end_datetime = datetime.combine(end_date, datetime.max.time())
+        return self.get_user_trades(user_id, start=start_date, end=end_date)
+    
+    def get_trades_by_symbol(self, user_id: int, symbol: str, limit: int = 100) -> List[Trade]:
+        """
+        Get the most recent trades for a symbol
         
-        # Get trades
-        return self.db.query(Trade).filter(
-            Trade.user_id == user_id,
-            Trade.entry_time >= start_datetime,
-            Trade.entry_time <= end_datetime
-        ).order_by(Trade.entry_time).all()
+        Deprecated: use get_user_trades(user_id, symbol=..., order_asc=False).
+        
+        Args:
+            user_id (int): User ID
+            symbol (str): Symbol
+            limit (int, optional): Maximum number of trades to return. Defaults to 100.
+            
+        Returns:
+            List[Trade]: List of trades, newest first
+        """
+        return self.get_user_trades(user_id, symbol=symbol, order_asc=False, limit=limit)
+    
+    def get_trades_by_setup(self, user_id: int, setup_type: str, limit: int = 100) -> List[Trade]:
+        """
+        Get the most recent trades for a setup type
+        
+        Deprecated: use get_user_trades(user_id, setup_type=..., order_asc=False).
+        
+        Args:
+            user_id (int): User ID
+            setup_type (str): Setup type
+            limit (int, optional): Maximum number of trades to return. Defaults to 100.
+            
+        Returns:
+            List[Trade]: List of trades, newest first
+        """
+        return self.get_user_trades(user_id, setup_type=setup_type, order_asc=False, limit=limit)
 
 
+# Mock payloads served until the metrics endpoints are backed by real queries.
+# Built once at import; callers receive deep copies, so nested lists and dicts
+# they modify are never shared with the constants or with other callers.
+_MOCK_PERFORMANCE_METRICS = {
+    "winRate": 65.2,
+    "profitFactor": 2.3,
+    "netProfit": 1250.75,
+    "grossProfit": 2100.50,
+    "grossLoss": -849.75,
+    "averageWin": 175.04,
+    "averageLoss": -94.42,
+    "largestWin": 450.00,
+    "largestLoss": -200.00,
+    "totalTrades": 23,
+    "streakData": {
+        "currentStreak": 3,
+        "currentStreakType": "win",
+        "longestWinStreak": 5,
+        "longestLossStreak": 2,
+        "consistency": 72.5,
+        "lastTwoWeeks": [
+            {"date": "2023-07-01", "outcome": "win", "profit_loss": 125.50},
+            {"date": "2023-07-02", "outcome": "win", "profit_loss": 75.25},
+            {"date": "2023-07-03", "outcome": "loss", "profit_loss": -50.75},
+            {"date": "2023-07-04", "outcome": "no_trade", "profit_loss": 0},
+            {"date": "2023-07-05", "outcome": "win", "profit_loss": 200.00},
+            {"date": "2023-07-06", "outcome": "loss", "profit_loss": -75.25},
+            {"date": "2023-07-07", "outcome": "win", "profit_loss": 150.30},
+            {"date": "2023-07-08", "outcome": "win", "profit_loss": 85.75},
+            {"date": "2023-07-09", "outcome": "no_trade", "profit_loss": 0},
+            {"date": "2023-07-10", "outcome": "no_trade", "profit_loss": 0},
+            {"date": "2023-07-11", "outcome": "win", "profit_loss": 95.25},
+            {"date": "2023-07-12", "outcome": "win", "profit_loss": 120.50},
+            {"date": "2023-07-13", "outcome": "win", "profit_loss": 45.25},
+            {"date": "2023-07-14", "outcome": "win", "profit_loss": 175.00}
+        ]
+    },
+    "dailyPnL": [
+        {"date": "2023-07-01", "pnl": 125.50, "tradeCount": 1},
+        {"date": "2023-07-02", "pnl": 75.25, "tradeCount": 1},
+        {"date": "2023-07-03", "pnl": -50.75, "tradeCount": 1},
+        {"date": "2023-07-05", "pnl": 200.00, "tradeCount": 1},
+        {"date": "2023-07-06", "pnl": -75.25, "tradeCount": 1},
+        {"date": "2023-07-07", "pnl": 150.30, "tradeCount": 1},
+        {"date": "2023-07-08", "pnl": 85.75, "tradeCount": 1},
+        {"date": "2023-07-11", "pnl": 95.25, "tradeCount": 1},
+        {"date": "2023-07-12", "pnl": 120.50, "tradeCount": 1},
+        {"date": "2023-07-13", "pnl": 45.25, "tradeCount": 1},
+        {"date": "2023-07-14", "pnl": 175.00, "tradeCount": 1}
+    ]
+}
+
+_MOCK_TRADE_STATISTICS = {
+    "totalTrades": 23,
+    "winningTrades": 15,
+    "losingTrades": 8,
+    "winRate": 65.2,
+    "profitFactor": 2.3,
+    "averageWin": 175.04,
+    "averageLoss": -94.42,
+    "netProfit": 1250.75
+}
+
 # Function-based API for routes
 
-def create_trade(db: Session, trade_data: Dict[str, Any]) -> Trade:
+def create_trade(
+    db: Session,
+    trade_data: Dict[str, Any],
+    background_tasks: Optional[BackgroundTasks] = None
+) -> Trade:
     """Create a new trade"""
     service = TradeService(db)
-    return service.create_trade(trade_data)
+    return service.create_trade(trade_data, background_tasks)
+
+def create_trades_bulk(
+    db: Session,
+    trades_data: List[TradeCreate],
+    background_tasks: Optional[BackgroundTasks] = None
+) -> List[int]:
+    """Create many trades at once"""
+    service = TradeService(db)
+    return service.create_trades_bulk(trades_data, background_tasks)
 
 def update_trade(db: Session, trade_id: int, trade_data: Dict[str, Any]) -> Optional[Trade]:
     """Update a trade"""
@@ -394,6 +1137,11 @@ def get_trades(db: Session, **kwargs) -> List[Trade]:
     service = TradeService(db)
     return service.get_trades(**kwargs)
 
+def get_trades_page(db: Session, **kwargs) -> Tuple[List[Trade], int]:
+    """Get a page of trades and the total match count"""
+    service = TradeService(db)
+    return service.get_trades_page(**kwargs)
+
 def get_recent_trades(db: Session, limit: int = 5) -> List[Trade]:
     """Get recent trades"""
     service = TradeService(db)
@@ -402,69 +1150,13 @@ def get_recent_trades(db: Session, limit: int = 5) -> List[Trade]:
 def calculate_performance_metrics(db: Session, **kwargs) -> Dict[str, Any]:
     """Calculate performance metrics"""
     # For now, this returns mock data
-    return {
-        "winRate": 65.2,
-        "profitFactor": 2.3,
-        "netProfit": 1250.75,
-        "grossProfit": 2100.50,
-        "grossLoss": -849.75,
-        "averageWin": 175.04,
-        "averageLoss": -94.42,
-        "largestWin": 450.00,
-        "largestLoss": -200.00,
-        "totalTrades": 23,
-        "streakData": {
-            "currentStreak": 3,
-            "currentStreakType": "win",
-            "longestWinStreak": 5,
-            "longestLossStreak": 2,
-            "consistency": 72.5,
-            "lastTwoWeeks": [
-                {"date": "2023-07-01", "outcome": "win", "profit_loss": 125.50},
-                {"date": "2023-07-02", "outcome": "win", "profit_loss": 75.25},
-                {"date": "2023-07-03", "outcome": "loss", "profit_loss": -50.75},
-                {"date": "2023-07-04", "outcome": "no_trade", "profit_loss": 0},
-                {"date": "2023-07-05", "outcome": "win", "profit_loss": 200.00},
-                {"date": "2023-07-06", "outcome": "loss", "profit_loss": -75.25},
-                {"date": "2023-07-07", "outcome": "win", "profit_loss": 150.30},
-                {"date": "2023-07-08", "outcome": "win", "profit_loss": 85.75},
-                {"date": "2023-07-09", "outcome": "no_trade", "profit_loss": 0},
-                {"date": "2023-07-10", "outcome": "no_trade", "profit_loss": 0},
-                {"date": "2023-07-11", "outcome": "win", "profit_loss": 95.25},
-                {"date": "2023-07-12", "outcome": "win", "profit_loss": 120.50},
-                {"date": "2023-07-13", "outcome": "win", "profit_loss": 45.25},
-                {"date": "2023-07-14", "outcome": "win", "profit_loss": 175.00}
-            ]
-        },
-        "dailyPnL": [
-            {"date": "2023-07-01", "pnl": 125.50, "tradeCount": 1},
-            {"date": "2023-07-02", "pnl": 75.25, "tradeCount": 1},
-            {"date": "2023-07-03", "pnl": -50.75, "tradeCount": 1},
-            {"date": "2023-07-05", "pnl": 200.00, "tradeCount": 1},
-            {"date": "2023-07-06", "pnl": -75.25, "tradeCount": 1},
-            {"date": "2023-07-07", "pnl": 150.30, "tradeCount": 1},
-            {"date": "2023-07-08", "pnl": 85.75, "tradeCount": 1},
-            {"date": "2023-07-11", "pnl": 95.25, "tradeCount": 1},
-            {"date": "2023-07-12", "pnl": 120.50, "tradeCount": 1},
-            {"date": "2023-07-13", "pnl": 45.25, "tradeCount": 1},
-            {"date": "2023-07-14", "pnl": 175.00, "tradeCount": 1}
-        ]
-    }
+    return copy.deepcopy(_MOCK_PERFORMANCE_METRICS)
 
 def calculate_trade_statistics(db: Session, **kwargs) -> Dict[str, Any]:
     """Calculate trade statistics"""
     # This can use the TradeService.get_statistics method in the future
     # For now, returning mock data
-    return {
-        "totalTrades": 23,
-        "winningTrades": 15,
-        "losingTrades": 8,
-        "winRate": 65.2,
-        "profitFactor": 2.3,
-        "averageWin": 175.04,
-        "averageLoss": -94.42,
-        "netProfit": 1250.75
-    }
+    return copy.deepcopy(_MOCK_TRADE_STATISTICS)
 
 def upload_trade_screenshot(db: Session, trade_id: int, filename: str, content: bytes) -> str:
     """Upload a screenshot for a trade"""
@@ -522,35 +1214,3 @@ def get_trade_streaks(db: Session) -> Dict[str, Any]:
             {"type": "win", "length": 2, "startDate": "2023-07-01", "endDate": "2023-07-02"}
         ]
     }
-    
-    def get_trades_by_symbol(self, user_id: int, symbol: str) -> List[Trade]:
-        """
-        Get trades by symbol
-        
-        Args:
-            user_id (int): User ID
-            symbol (str): Symbol
-            
-        Returns:
-            List[Trade]: List of trades
-        """
-        return self.db.query(Trade).filter(
-            Trade.user_id == user_id,
-            Trade.symbol == symbol
-        ).order_by(Trade.entry_time).all()
-    
-    def get_trades_by_setup(self, user_id: int, setup_type: str) -> List[Trade]:
-        """
-        Get trades by setup type
-        
-        Args:
-            user_id (int): User ID
-            setup_type (str): Setup type
-            
-        Returns:
-            List[Trade]: List of trades
-        """
-        return self.db.query(Trade).filter(
-            Trade.user_id == user_id,
-            Trade.setup_type == setup_type
-        ).order_by(Trade.entry_time).all()
@@ -1,14 +1,235 @@
 # File: backend/services/tradesage_service.py
 # Purpose: Service for handling TradeSage AI assistant functionality
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+import asyncio
+import copy
 from datetime import datetime, timedelta
+from operator import attrgetter
+import hashlib
+import re
+import threading
+import time
+import numpy as np
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from ..db.repository import TradeRepository, UserRepository, JournalRepository
+from ..models.trade import Trade
 from ..mcp.servers.ai_server import get_ai_client
 from ..mcp.tools.pattern_recognition import identify_trade_patterns, detect_mcp_complex_patterns
-from ..mcp.tools.sentiment_analysis import analyze_text_sentiment
+from ..mcp.tools.sentiment_analysis import analyze_texts_sentiment, EMOTION_NAMES
+from ..utils.jit_helpers import njit, prange
+
+# Days of journals loaded for emotional context when generating an improvement plan
+IMPROVEMENT_PLAN_JOURNAL_DAYS = 90
+
+# Trade fields sent to the AI client, in TradeRepository.ANALYSIS_COLUMNS order
+_TRADE_DATA_FIELDS = (
+    "id",
+    "symbol",
+    "setup_type",
+    "entry_price",
+    "exit_price",
+    "position_size",
+    "entry_time",
+    "exit_time",
+    "planned_risk_reward",
+    "actual_risk_reward",
+    "outcome",
+    "profit_loss",
+    "emotional_state",
+    "plan_adherence",
+    "notes",
+    "tags",
+    "created_at",
+)
+
+# Fetches every field in one call instead of one attribute lookup per field
+_get_trade_data_values = attrgetter(*_TRADE_DATA_FIELDS)
+
+# Pattern types whose recommendations go into the short- and medium-term plan
+_SHORT_TERM_PATTERN_TYPES = frozenset({"emotional_impact", "plan_adherence_correlation", "revenge_trading", "overtrading"})
+_MEDIUM_TERM_PATTERN_TYPES = frozenset({"risk_reward_correlation", "trade_duration_impact", "session_profitability"})
+
+# Improvement plan time frames as (plan key, timeframe, measurable), indexed
+# by the bucket returned from _plan_bucket
+_PLAN_TIMEFRAMES = (
+    ("shortTerm", "2 weeks", "Track in trading journal"),
+    ("mediumTerm", "1 month", "Compare metrics before and after implementation"),
+    ("longTerm", "3 months", "Gradual implementation with periodic assessment"),
+)
+
+def _plan_bucket(pattern_type: Optional[str]) -> int:
+    """
+    Get the improvement plan time frame index for a pattern type
+    
+    Args:
+        pattern_type: Pattern type
+        
+    Returns:
+        0 for patterns needing immediate action, 1 for strategic ones, 2 otherwise
+    """
+    if pattern_type in _SHORT_TERM_PATTERN_TYPES:
+        return 0
+    if pattern_type in _MEDIUM_TERM_PATTERN_TYPES:
+        return 1
+    return 2
+
+# Column of each known emotion category in the emotion matrix
+_EMOTION_INDEX = {emotion: index for index, emotion in enumerate(EMOTION_NAMES)}
+
+def _dominant_emotions(emotion_matrix: np.ndarray, other_emotions: Counter, count: int) -> List[str]:
+    """
+    Get the emotions with the highest totals across journals
+    
+    Ties keep the order in which emotions were first seen, as Counter does.
+    
+    Args:
+        emotion_matrix: Journal x EMOTION_NAMES matrix of emotion scores
+        other_emotions: Totals of emotions outside EMOTION_NAMES
+        count: Number of emotions to return
+        
+    Returns:
+        Emotion names, highest total first
+    """
+    totals = emotion_matrix.sum(axis=0)
+    seen = emotion_matrix != 0
+    columns = np.flatnonzero(seen.any(axis=0))
+    
+    if other_emotions:
+        # Rare path: merge into the string-keyed counter
+        all_emotions = Counter({EMOTION_NAMES[column]: totals[column] for column in columns})
+        all_emotions.update(other_emotions)
+        return [emotion for emotion, _ in all_emotions.most_common(count)]
+    
+    # Order by total, then first journal the emotion appeared in, then category order
+    first_seen = seen.argmax(axis=0)[columns]
+    order = np.lexsort((columns, first_seen, -totals[columns]))
+    
+    return [EMOTION_NAMES[column] for column in columns[order[:count]]]
+
+# Emotions that count as negative when they dominate journal sentiment
+_NEGATIVE_EMOTIONS = frozenset({'fear', 'anger', 'anxiety', 'disappointment', 'regret', 'frustrated', 'confusion'})
+
+# Extracted trade data cache TTL in seconds and maximum number of entries
+TRADE_DATA_CACHE_TTL = 300
+TRADE_DATA_CACHE_SIZE = 50000
+
+# Extracted trade data keyed by trade id; entries are (timestamp, version,
+# trade data dict). An entry is only used while the trade's version, its
+# (created_at, updated_at), still matches, so a trade created with a reused
+# id or edited by another process is extracted again. ORM writes in this
+# process drop the entry straight away (see _forget_trade below).
+_trade_data_cache: Dict[Any, Tuple[float, Tuple[Any, Any], Dict[str, Any]]] = {}
+_trade_data_cache_lock = threading.Lock()
+
+def _trade_version(trade) -> Tuple[Any, Any]:
+    """Get the (created_at, updated_at) pair that identifies a trade's current state"""
+    return trade.created_at, trade.updated_at
+
+# AI response cache TTL in seconds and maximum number of entries
+AI_RESPONSE_CACHE_TTL = 30
+AI_RESPONSE_CACHE_SIZE = 256
+
+# AI responses keyed by (kind, user_id, trade set fingerprint, extra); entries
+# are (timestamp, response). The fingerprint covers every trade's id and
+# version, so it changes whenever a trade in the set is added, removed or
+# edited, and ORM writes in this process also drop the owner's responses.
+# Callers get their own copy of a response, never the cached one.
+_ai_response_cache: Dict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]] = {}
+_ai_response_cache_lock = threading.Lock()
+
+# Questions that refer to the current time, whose answers go stale with the
+# clock rather than with the trades, are never answered from the cache
+_TIME_SENSITIVE_QUESTION = re.compile(
+    r"\b(?:now|today|tonight|yesterday|tomorrow|currently|right now|so far"
+    r"|this (?:morning|afternoon|evening|session|week|month|year)"
+    r"|last (?:hour|trade)|latest|\d{1,2}:\d{2}|\d{4}-\d{2}-\d{2})\b",
+    re.IGNORECASE
+)
+
+def _get_cached_ai_response(key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+    """Get a copy of a cached AI response if present and not expired"""
+    with _ai_response_cache_lock:
+        entry = _ai_response_cache.get(key)
+        if entry is None:
+            return None
+        
+        if time.monotonic() - entry[0] > AI_RESPONSE_CACHE_TTL:
+            del _ai_response_cache[key]
+            return None
+        
+        response = entry[1]
+    
+    return copy.deepcopy(response)
+
+def _cache_ai_response(key: Tuple[Any, ...], response: Dict[str, Any]) -> None:
+    """Add a copy of an AI response to the cache, evicting the oldest entries when full"""
+    response = copy.deepcopy(response)
+    with _ai_response_cache_lock:
+        _ai_response_cache[key] = (time.monotonic(), response)
+        
+        if len(_ai_response_cache) > AI_RESPONSE_CACHE_SIZE:
+            # Remove the oldest 20% of entries
+            entries = sorted(_ai_response_cache.items(), key=lambda item: item[1][0])
+            for old_key, _ in entries[:AI_RESPONSE_CACHE_SIZE // 5]:
+                del _ai_response_cache[old_key]
+
+@event.listens_for(Trade, "after_insert")
+@event.listens_for(Trade, "after_update")
+@event.listens_for(Trade, "after_delete")
+def _forget_trade(mapper, connection, target) -> None:
+    """Drop cached data for a trade, and its owner's AI responses, when the trade is written"""
+    with _trade_data_cache_lock:
+        _trade_data_cache.pop(target.id, None)
+    
+    with _ai_response_cache_lock:
+        for key in [key for key in _ai_response_cache if key[1] == target.user_id]:
+            del _ai_response_cache[key]
+
+def _trade_set_fingerprint(trade_keys: List[Tuple[Any, Tuple[Any, Any]]]) -> str:
+    """
+    Fingerprint a set of trades by every trade's ID and version
+    
+    Args:
+        trade_keys: (trade id, (created_at, updated_at)) pairs
+        
+    Returns:
+        Hex digest that changes when any trade is added, removed, replaced or edited
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for trade_key in sorted(trade_keys, key=lambda trade_key: trade_key[0]):
+        digest.update(repr(trade_key).encode())
+    
+    return digest.hexdigest()
+
+@njit(cache=True, parallel=True)
+def _adherence_counts(adherence, is_win):
+    """
+    Count high (7+) and low (3 and below) plan adherence trades and their wins
+    
+    Args:
+        adherence (np.ndarray): Plan adherence scores
+        is_win (np.ndarray): Boolean win flags
+        
+    Returns:
+        Tuple[int, int, int, int]: High adherence trades and wins, then low adherence trades and wins
+    """
+    high_count = high_wins = low_count = low_wins = 0
+    
+    for i in prange(adherence.shape[0]):
+        if adherence[i] >= 7:
+            high_count += 1
+            if is_win[i]:
+                high_wins += 1
+        elif adherence[i] <= 3:
+            low_count += 1
+            if is_win[i]:
+                low_wins += 1
+    
+    return high_count, high_wins, low_count, low_wins
 
 class TradeSageService:
     """
@@ -36,47 +257,46 @@ class TradeSageService:
             Dictionary containing analysis results
         """
         # Get user trades
-        trades = self.trade_repository.get_by_user(user_id, date_range)
+        # Rows are streamed straight into the analysis dicts, off the event loop
+        trade_data = await asyncio.to_thread(self._load_trade_data, user_id, date_range)
         
-        if not trades:
+        if not trade_data:
             return {
                 "message": "Not enough trade data for analysis",
                 "insights": []
             }
         
-        # Prepare data for analysis
-        trade_data = [self._extract_trade_data(trade) for trade in trades]
-        
-        # Use MCP pattern recognition tools first
-        patterns = []
-        complex_patterns = []
-        
-        # Standard pattern recognition
-        patterns = identify_trade_patterns(trade_data)
-        
-        # Enhanced MCP pattern recognition if enabled
-        if self.use_advanced_mcp and len(trade_data) >= 5:
-            complex_patterns = detect_mcp_complex_patterns(trade_data)
-            
         # Get user preferences for personalization
-        user = self.user_repository.get_by_id(user_id)
-        user_preferences = user.preferences if user and hasattr(user, 'preferences') else {}
+        user = await asyncio.to_thread(self.user_repository.get_by_id, user_id)
+        user_preferences = user.preferences if user else {}
         
         # Get AI client from MCP for enhanced insights
         ai_client = await get_ai_client()
         
-        # Send data to AI for analysis
-        analysis_result = await ai_client.analyze_trading_patterns(
-            trade_data=trade_data,
-            user_preferences=user_preferences
+        # Pattern recognition is CPU-bound and independent of the AI call, so
+        # it runs in worker threads while the AI request is in flight
+        pattern_tasks = [asyncio.to_thread(identify_trade_patterns, trade_data)]
+        
+        # Enhanced MCP pattern recognition if enabled
+        if self.use_advanced_mcp and len(trade_data) >= 5:
+            pattern_tasks.append(asyncio.to_thread(detect_mcp_complex_patterns, trade_data))
+        
+        analysis_result, patterns, *complex_results = await asyncio.gather(
+            ai_client.analyze_trading_patterns(
+                trade_data=trade_data,
+                user_preferences=user_preferences
+            ),
+            *pattern_tasks
         )
+        complex_patterns = complex_results[0] if complex_results else []
         
         # Combine MCP patterns with AI analysis
         insights = analysis_result.get("insights", [])
         recommendations = analysis_result.get("recommendations", [])
         
         # Add pattern insights and recommendations
-        for pattern in patterns + complex_patterns:
+        all_patterns = patterns + complex_patterns
+        for pattern in all_patterns:
             if pattern.get("confidence", 0) > 0.7:  # Only include high confidence patterns
                 insights.append({
                     "type": "pattern",
@@ -90,7 +310,7 @@ class TradeSageService:
                     recommendations.append(pattern["recommendation"])
         
         # Generate summary based on patterns
-        summary = self._generate_summary_from_patterns(patterns + complex_patterns)
+        summary = self._generate_summary_from_patterns(all_patterns)
         
         # Enhanced return with pattern data
         return {
@@ -117,16 +337,36 @@ class TradeSageService:
         start_date = end_date - timedelta(days=30)
         date_range = {"start": start_date, "end": end_date}
         
-        trades = self.trade_repository.get_by_user(user_id, date_range)
+        # Rows are streamed straight into the analysis dicts, off the event loop
+        trade_keys = []
+        trade_data = await asyncio.to_thread(self._load_trade_data, user_id, date_range, trade_keys)
+        
+        # Nothing to analyze for inactive users; skip the AI client entirely
+        if not trade_data:
+            return {
+                "overall": {
+                    "winRate": "N/A",
+                    "totalTrades": 0,
+                    "totalProfit": 0,
+                    "profitPerTrade": 0
+                },
+                "strengths": ["Insufficient data for analysis"],
+                "weaknesses": ["Insufficient data for analysis"],
+                "recommendations": ["Add more trade data for meaningful insights"]
+            }
+        
+        # Dashboards poll this; skip the AI call while the trades are unchanged
+        cache_key = ("insights", user_id, _trade_set_fingerprint(trade_keys))
+        cached = _get_cached_ai_response(cache_key)
+        if cached is not None:
+            return cached
         
         # Get AI client from MCP
         ai_client = await get_ai_client()
         
-        # Prepare data for analysis
-        trade_data = [self._extract_trade_data(trade) for trade in trades]
-        
         # Get performance insights from AI
         insights = await ai_client.get_performance_insights(trade_data)
+        _cache_ai_response(cache_key, insights)
         
         return insights
     
@@ -141,9 +381,10 @@ class TradeSageService:
             Dictionary containing improvement plan
         """
         # Get user trades
-        trades = self.trade_repository.get_by_user(user_id)
+        # Rows are streamed straight into the analysis dicts, off the event loop
+        trade_data = await asyncio.to_thread(self._load_trade_data, user_id)
         
-        if not trades:
+        if not trade_data:
             return {
                 "message": "Not enough trade data for analysis",
                 "strengths": [],
@@ -152,11 +393,13 @@ class TradeSageService:
                 "timeline": "Unable to generate timeline due to insufficient data."
             }
         
-        # Prepare data for analysis
-        trade_data = [self._extract_trade_data(trade) for trade in trades]
-        
-        # Get user journals for emotional context
-        journals = self.journal_repository.get_by_user_id(user_id)
+        # Get user goals, preferences and recent journals (for emotional
+        # context) together instead of separate user and journal lookups
+        journals_since = (datetime.utcnow() - timedelta(days=IMPROVEMENT_PLAN_JOURNAL_DAYS)).date()
+        user = await asyncio.to_thread(self.user_repository.get_with_journals, user_id, journals_since)
+        user_goals = getattr(user, 'goals', []) if user else []
+        user_preferences = user.preferences if user else {}
+        journals = user.journals if user else []
         journal_data = []
         
         if journals:
@@ -165,8 +408,8 @@ class TradeSageService:
                     "id": journal.id,
                     "date": journal.date.isoformat() if journal.date else None,
                     "content": journal.content,
-                    "mood_rating": journal.mood_rating if hasattr(journal, 'mood_rating') else None,
-                    "tags": journal.tags if hasattr(journal, 'tags') else None
+                    "mood_rating": journal.mood_rating,
+                    "tags": journal.tags
                 })
         
         # Use MCP pattern recognition
@@ -174,11 +417,6 @@ class TradeSageService:
         if self.use_advanced_mcp and len(trade_data) >= 10:
             complex_patterns = detect_mcp_complex_patterns(trade_data)
         
-        # Get user goals and preferences
-        user = self.user_repository.get_by_id(user_id)
-        user_goals = user.goals if user and hasattr(user, 'goals') else []
-        user_preferences = user.preferences if user and hasattr(user, 'preferences') else {}
-        
         # Get AI client from MCP
         ai_client = await get_ai_client()
         
@@ -208,30 +446,21 @@ class TradeSageService:
         # Add pattern-specific actions to the plan
         plan = improvement_plan.get("plan", {"shortTerm": [], "mediumTerm": [], "longTerm": []})
         
+        # Classify first, then extend each time frame once
+        actions_by_bucket = ([], [], [])
+        
         for pattern in complex_patterns:
             if pattern.get("confidence", 0) > 0.7 and "recommendation" in pattern:
-                # Add to appropriate time frame based on pattern type
-                if pattern.get("type") in ["emotional_impact", "plan_adherence_correlation", "revenge_trading", "overtrading"]:
-                    # These require immediate action
-                    plan["shortTerm"].append({
-                        "action": pattern["recommendation"],
-                        "timeframe": "2 weeks",
-                        "measurable": "Track in trading journal"
-                    })
-                elif pattern.get("type") in ["risk_reward_correlation", "trade_duration_impact", "session_profitability"]:
-                    # These are more strategic
-                    plan["mediumTerm"].append({
-                        "action": pattern["recommendation"],
-                        "timeframe": "1 month",
-                        "measurable": "Compare metrics before and after implementation"
-                    })
-                else:
-                    # Longer-term changes
-                    plan["longTerm"].append({
-                        "action": pattern["recommendation"],
-                        "timeframe": "3 months",
-                        "measurable": "Gradual implementation with periodic assessment"
-                    })
+                bucket = _plan_bucket(pattern.get("type"))
+                actions_by_bucket[bucket].append({
+                    "action": pattern["recommendation"],
+                    "timeframe": _PLAN_TIMEFRAMES[bucket][1],
+                    "measurable": _PLAN_TIMEFRAMES[bucket][2]
+                })
+        
+        for (plan_key, _, _), actions in zip(_PLAN_TIMEFRAMES, actions_by_bucket):
+            if actions:
+                plan.setdefault(plan_key, []).extend(actions)
         
         # Enhanced return
         return {
@@ -259,14 +488,22 @@ class TradeSageService:
         start_date = end_date - timedelta(days=30)
         date_range = {"start": start_date, "end": end_date}
         
-        trades = self.trade_repository.get_by_user(user_id, date_range)
+        # Rows are streamed straight into the context dicts, off the event loop
+        trade_keys = []
+        trade_data = await asyncio.to_thread(self._load_trade_data, user_id, date_range, trade_keys)
+        
+        # Repeated questions over unchanged trades reuse the previous answer,
+        # unless the question depends on the current time
+        cache_key = None
+        if not _TIME_SENSITIVE_QUESTION.search(question):
+            cache_key = ("answer", user_id, _trade_set_fingerprint(trade_keys), question)
+            cached = _get_cached_ai_response(cache_key)
+            if cached is not None:
+                return cached
         
         # Get AI client from MCP
         ai_client = await get_ai_client()
         
-        # Prepare data for context
-        trade_data = [self._extract_trade_data(trade) for trade in trades]
-        
         # Get answer from AI
         answer = await ai_client.answer_question(
             question=question,
@@ -274,37 +511,95 @@ class TradeSageService:
             user_id=user_id
         )
         
+        # Placeholder answers returned on AI errors have zero confidence
+        if cache_key is not None and answer and answer.get("confidence", 0) > 0:
+            _cache_ai_response(cache_key, answer)
+        
         return answer
     
+    def _load_trade_data(
+        self,
+        user_id: int,
+        date_range: Optional[Dict[str, datetime]] = None,
+        trade_keys: Optional[List[Tuple[Any, Tuple[Any, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Stream a user's trades from the database into AI analysis data
+        
+        Blocking; the async methods run it through asyncio.to_thread so the
+        query does not stall the event loop.
+        
+        Args:
+            user_id: ID of the user
+            date_range: Optional date range for analysis
+            trade_keys: Optional list that receives each trade's (id, version)
+            
+        Returns:
+            List of dictionaries containing extracted trade data
+        """
+        return self._extract_trade_data_bulk(
+            self.trade_repository.iter_analysis_rows_by_user(user_id, date_range),
+            trade_keys
+        )
+    
     def _extract_trade_data(self, trade) -> Dict[str, Any]:
         """
-        Extract relevant data from a trade object for AI analysis
+        Extract relevant data from a trade for AI analysis
         
         Args:
-            trade: Trade object
+            trade: Trade object or analysis row
             
         Returns:
             Dictionary containing extracted trade data
         """
-        return {
-            "id": trade.id,
-            "symbol": trade.symbol,
-            "setup_type": trade.setup_type,
-            "entry_price": trade.entry_price,
-            "exit_price": trade.exit_price,
-            "position_size": trade.position_size,
-            "entry_time": trade.entry_time.isoformat() if trade.entry_time else None,
-            "exit_time": trade.exit_time.isoformat() if trade.exit_time else None,
-            "planned_risk_reward": trade.planned_risk_reward if hasattr(trade, 'planned_risk_reward') else None,
-            "actual_risk_reward": trade.actual_risk_reward if hasattr(trade, 'actual_risk_reward') else None,
-            "outcome": trade.outcome,
-            "profit_loss": trade.profit_loss,
-            "emotional_state": trade.emotional_state if hasattr(trade, 'emotional_state') else None,
-            "plan_adherence": trade.plan_adherence if hasattr(trade, 'plan_adherence') else None,
-            "notes": trade.notes if hasattr(trade, 'notes') else None,
-            "tags": trade.tags if hasattr(trade, 'tags') else None,
-            "created_at": trade.created_at.isoformat() if hasattr(trade, 'created_at') and trade.created_at else None,
-        }
+        # Datetimes stay native; the AI client serializes them with orjson
+        return dict(zip(_TRADE_DATA_FIELDS, _get_trade_data_values(trade)))
+    
+    def _extract_trade_data_bulk(
+        self,
+        trades,
+        trade_keys: Optional[List[Tuple[Any, Tuple[Any, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract AI analysis data from many trades
+        
+        Args:
+            trades: Trade objects or analysis rows
+            trade_keys: Optional list that receives each trade's (id, version)
+            
+        Returns:
+            List of dictionaries containing extracted trade data, shared with
+            the cache and not to be modified
+        """
+        extract = self._extract_trade_data
+        now = time.monotonic()
+        trade_data = []
+        
+        # Repeated questions re-read the same trades; reuse their dicts. The
+        # lock is taken per trade since trades may be a streaming DB cursor.
+        for trade in trades:
+            version = _trade_version(trade)
+            
+            with _trade_data_cache_lock:
+                entry = _trade_data_cache.get(trade.id)
+                
+                if entry is None or entry[1] != version or now - entry[0] > TRADE_DATA_CACHE_TTL:
+                    entry = (now, version, extract(trade))
+                    _trade_data_cache[trade.id] = entry
+            
+            trade_data.append(entry[2])
+            
+            if trade_keys is not None:
+                trade_keys.append((trade.id, version))
+        
+        with _trade_data_cache_lock:
+            if len(_trade_data_cache) > TRADE_DATA_CACHE_SIZE:
+                # Remove the oldest 20% of entries
+                entries = sorted(_trade_data_cache.items(), key=lambda item: item[1][0])
+                for old_key, _ in entries[:TRADE_DATA_CACHE_SIZE // 5]:
+                    del _trade_data_cache[old_key]
+        
+        return trade_data
     
     def _generate_summary_from_patterns(self, patterns: List[Dict[str, Any]]) -> str:
         """
@@ -319,25 +614,31 @@ class TradeSageService:
         if not patterns:
             return None
             
-        # Filter for high confidence patterns
-        high_confidence_patterns = [p for p in patterns if p.get("confidence", 0) > 0.7]
+        # Count types, recommendations and the most confident pattern among
+        # high confidence patterns in a single pass
+        pattern_types = Counter()
+        most_confident = None
+        best_confidence = 0
+        recommendation_count = 0
+        
+        for pattern in patterns:
+            confidence = pattern.get("confidence", 0)
+            if confidence <= 0.7:
+                continue
+            
+            pattern_types[pattern.get("type", "unknown")] += 1
+            if most_confident is None or confidence > best_confidence:
+                most_confident, best_confidence = pattern, confidence
+            if "recommendation" in pattern:
+                recommendation_count += 1
         
-        if not high_confidence_patterns:
+        if most_confident is None:
             return None
-            
-        # Count pattern types
-        pattern_types = {}
-        for pattern in high_confidence_patterns:
-            pattern_type = pattern.get("type", "unknown")
-            if pattern_type not in pattern_types:
-                pattern_types[pattern_type] = 0
-            pattern_types[pattern_type] += 1
         
         # Generate summary
         summary = "Analysis of your trading data has identified several significant patterns. "
         
         # Add most confident pattern first
-        most_confident = max(high_confidence_patterns, key=lambda p: p.get("confidence", 0))
         summary += f"Most notably, {most_confident.get('description')}. "
         
         # Add pattern type counts
@@ -357,7 +658,6 @@ class TradeSageService:
             summary += ". "
         
         # Add recommendation count
-        recommendation_count = sum(1 for p in high_confidence_patterns if "recommendation" in p)
         if recommendation_count > 0:
             summary += f"Based on these patterns, we've generated {recommendation_count} specific recommendations to help improve your trading performance."
         
@@ -381,18 +681,18 @@ class TradeSageService:
                 "recommendations": []
             }
         
-        # Analyze sentiment for each journal
-        sentiment_results = []
-        
-        for journal in journal_entries:
-            content = journal.get("content", "")
-            if content:
-                sentiment = analyze_text_sentiment(content)
-                sentiment_results.append({
-                    "journal_id": journal.get("id"),
-                    "date": journal.get("date"),
-                    "sentiment": sentiment
-                })
+        # Analyze sentiment for all journals with content in one batch
+        journals_with_content = [journal for journal in journal_entries if journal.get("content", "")]
+        sentiments = analyze_texts_sentiment([journal["content"] for journal in journals_with_content])
+        
+        sentiment_results = [
+            {
+                "journal_id": journal.get("id"),
+                "date": journal.get("date"),
+                "sentiment": sentiment
+            }
+            for journal, sentiment in zip(journals_with_content, sentiments)
+        ]
         
         if not sentiment_results:
             return {
@@ -402,29 +702,27 @@ class TradeSageService:
                 "recommendations": []
             }
         
-        # Identify emotional trends
-        all_emotions = {}
+        # Identify emotional trends: known emotion categories go into a
+        # journal x emotion matrix, anything else into a string-keyed counter
+        emotion_matrix = np.zeros((len(sentiment_results), len(EMOTION_NAMES)), dtype=np.float64)
+        other_emotions = Counter()
         sentiment_scores = []
         
-        for result in sentiment_results:
+        for row, result in enumerate(sentiment_results):
             sentiment = result.get("sentiment", {})
-            emotions = sentiment.get("emotions", {})
-            score = sentiment.get("score", 0)
-            
-            sentiment_scores.append((result.get("date"), score))
-            
-            for emotion, value in emotions.items():
-                if emotion not in all_emotions:
-                    all_emotions[emotion] = 0
-                all_emotions[emotion] += value
+            for emotion, value in sentiment.get("emotions", {}).items():
+                column = _EMOTION_INDEX.get(emotion)
+                if column is None:
+                    other_emotions[emotion] += value
+                else:
+                    emotion_matrix[row, column] = value
+            sentiment_scores.append((result.get("date"), sentiment.get("score", 0)))
         
-        # Sort emotions by frequency
-        dominant_emotions = sorted(all_emotions.items(), key=lambda x: x[1], reverse=True)
-        dominant_emotions = [emotion for emotion, _ in dominant_emotions[:5]]  # Top 5 emotions
+        # Top 5 emotions by frequency
+        dominant_emotions = _dominant_emotions(emotion_matrix, other_emotions, 5)
         
         # Determine if negative emotions are dominant
-        negative_emotions = {'fear', 'anger', 'anxiety', 'disappointment', 'regret', 'frustrated', 'confusion'}
-        negative_count = sum(1 for emotion in dominant_emotions[:3] if emotion.lower() in negative_emotions)
+        negative_count = sum(1 for emotion in dominant_emotions[:3] if emotion.lower() in _NEGATIVE_EMOTIONS)
         negative_dominant = negative_count >= 2
         
         # Calculate sentiment trend
@@ -432,13 +730,12 @@ class TradeSageService:
             # Sort by date
             sentiment_scores.sort(key=lambda x: x[0] if x[0] else "")
             
-            # Split into first and second half
-            scores = [score for _, score in sentiment_scores]
-            first_half = scores[:len(scores)//2]
-            second_half = scores[len(scores)//2:]
+            # Compare the averages of the first and second half
+            scores = np.fromiter((score for _, score in sentiment_scores), dtype=np.float64, count=len(sentiment_scores))
+            mid = len(scores) // 2
             
-            first_half_avg = sum(first_half) / len(first_half) if first_half else 0
-            second_half_avg = sum(second_half) / len(second_half) if second_half else 0
+            first_half_avg = scores[:mid].mean()
+            second_half_avg = scores[mid:].mean()
             
             if second_half_avg - first_half_avg > 0.2:
                 trend = "positive"
@@ -486,6 +783,61 @@ class TradeSageService:
             Dictionary containing plan adherence analysis
         """
         if not trades:
+            return self._plan_adherence_result(0, 0, 0, 0, 0, 0)
+        
+        # Convert trades with plan adherence data into columns for the kernel
+        valid_trades = [t for t in trades if t.get("plan_adherence") is not None]
+        valid_count = len(valid_trades)
+        adherence = np.fromiter((t["plan_adherence"] for t in valid_trades), dtype=np.float64, count=valid_count)
+        is_win = np.fromiter((t.get("outcome") == "Win" for t in valid_trades), dtype=np.bool_, count=valid_count)
+        
+        high_count, high_wins, low_count, low_wins = _adherence_counts(adherence, is_win)
+        
+        return self._plan_adherence_result(len(trades), valid_count, high_count, high_wins, low_count, low_wins)
+    
+    def analyze_user_plan_adherence(self, user_id: int) -> Dict[str, Any]:
+        """
+        Analyze plan adherence for a user, aggregated in the database
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            Dictionary containing plan adherence analysis
+        """
+        buckets = self.trade_repository.adherence_buckets(user_id)
+        valid_count = sum(bucket["total"] for bucket in buckets.values())
+        high = buckets.get("high", {"total": 0, "wins": 0})
+        low = buckets.get("low", {"total": 0, "wins": 0})
+        
+        return self._plan_adherence_result(
+            valid_count, valid_count, high["total"], high["wins"], low["total"], low["wins"]
+        )
+    
+    def _plan_adherence_result(
+        self,
+        trade_count: int,
+        valid_count: int,
+        high_count: int,
+        high_wins: int,
+        low_count: int,
+        low_wins: int
+    ) -> Dict[str, Any]:
+        """
+        Build the plan adherence analysis from bucket counts
+        
+        Args:
+            trade_count: Number of trades analyzed
+            valid_count: Number of trades with plan adherence data
+            high_count: Number of high adherence trades
+            high_wins: Number of winning high adherence trades
+            low_count: Number of low adherence trades
+            low_wins: Number of winning low adherence trades
+            
+        Returns:
+            Dictionary containing plan adherence analysis
+        """
+        if not trade_count:
             return {
                 "adherence_correlation": 0,
                 "high_adherence_win_rate": 0,
@@ -493,10 +845,7 @@ class TradeSageService:
                 "recommendation": "Insufficient data for plan adherence analysis."
             }
         
-        # Filter trades with plan adherence data
-        valid_trades = [t for t in trades if t.get("plan_adherence") is not None]
-        
-        if len(valid_trades) < 5:  # Need at least 5 trades
+        if valid_count < 5:  # Need at least 5 trades
             return {
                 "adherence_correlation": 0,
                 "high_adherence_win_rate": 0,
@@ -504,20 +853,13 @@ class TradeSageService:
                 "recommendation": "Insufficient plan adherence data for analysis."
             }
         
-        # Categorize adherence
-        high_adherence_trades = [t for t in valid_trades if t.get("plan_adherence", 0) >= 7]
-        low_adherence_trades = [t for t in valid_trades if t.get("plan_adherence", 0) <= 3]
-        
         # Calculate win rates
-        high_adherence_wins = sum(1 for t in high_adherence_trades if t.get("outcome") == "Win")
-        low_adherence_wins = sum(1 for t in low_adherence_trades if t.get("outcome") == "Win")
-        
-        high_adherence_win_rate = (high_adherence_wins / len(high_adherence_trades) * 100) if high_adherence_trades else 0
-        low_adherence_win_rate = (low_adherence_wins / len(low_adherence_trades) * 100) if low_adherence_trades else 0
+        high_adherence_win_rate = (high_wins / high_count * 100) if high_count else 0
+        low_adherence_win_rate = (low_wins / low_count * 100) if low_count else 0
         
         # Calculate correlation
         correlation = 0
-        if high_adherence_trades and low_adherence_trades:
+        if high_count and low_count:
             correlation = (high_adherence_win_rate - low_adherence_win_rate) / 100
         
         # Generate recommendation
@@ -534,7 +876,7 @@ class TradeSageService:
             "adherence_correlation": correlation,
             "high_adherence_win_rate": high_adherence_win_rate,
             "low_adherence_win_rate": low_adherence_win_rate,
-            "high_adherence_trades": len(high_adherence_trades),
-            "low_adherence_trades": len(low_adherence_trades),
+            "high_adherence_trades": high_count,
+            "low_adherence_trades": low_count,
             "recommendation": recommendation
-        }
\ No newline at end of file
+        }
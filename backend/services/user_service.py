@@ -1,21 +1,220 @@
 # File: backend/services/user_service.py
 # Purpose: User management service
 
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional, Dict, Any
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import JSON, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+import bcrypt
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
 
-from ..db.repository import Repository
+from ..db.repository import UserRepository
 from ..models.user import User
 from ..db.schemas import UserCreate, UserUpdate
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing. New hashes use Argon2id with the OWASP profile; bcrypt
+# hashes still verify and are rehashed on the next successful login.
+_argon2_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1, type=Type.ID)
+
+def _new_password_hash(password: str, salt: Optional[bytes] = None) -> str:
+    """Hash a password with Argon2id, using a fresh random salt unless one is given"""
+    return _argon2_hasher.hash(password, salt=salt)
+
+def _check_password(password: str, hashed_password: Optional[str]) -> bool:
+    """Check a password against an Argon2 or bcrypt hash"""
+    if not hashed_password:
+        return False
+    
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _argon2_hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    if hashed_password.startswith("$2"):
+        try:
+            return bcrypt.checkpw(password.encode(), hashed_password.encode())
+        except ValueError:
+            return False
+    
+    return False
+
+def _check_password_and_rehash(password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password and return a replacement hash if the stored one is outdated
+    
+    Args:
+        password (str): Plain password
+        hashed_password (Optional[str]): Stored password hash
+        
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matched, and the new hash if it should be replaced
+    """
+    if not _check_password(password, hashed_password):
+        return False, None
+    
+    if hashed_password.startswith("$argon2") and not _argon2_hasher.check_needs_rehash(hashed_password):
+        return True, None
+    
+    return True, _new_password_hash(password)
+
+# Worker threads used to hash passwords for bulk user creation
+BULK_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# Password verification cache TTL in seconds and maximum number of entries
+PASSWORD_VERIFY_CACHE_TTL = 300
+PASSWORD_VERIFY_CACHE_SIZE = 10000
+
+# Key for the verification cache digests, sized for BLAKE2b. The cache is per
+# process, so a random pepper is enough when none is configured.
+_PASSWORD_CACHE_PEPPER = (
+    hashlib.blake2b(os.getenv("PASSWORD_CACHE_PEPPER", "").encode(), digest_size=32).digest()
+    if os.getenv("PASSWORD_CACHE_PEPPER")
+    else secrets.token_bytes(32)
+)
+
+# Successful password verifications keyed by (user id, digest); entries are
+# (timestamp, result). The digest is a keyed BLAKE2b of the stored hash and the
+# candidate password, so no raw password is kept and a changed hash never
+# matches an old entry. Failures are never cached, so a wrong password always
+# costs a full hash, the same as an unknown username.
+_password_verify_cache: Dict[Tuple[int, bytes], Tuple[float, bool]] = {}
+_password_verify_cache_lock = threading.Lock()
+
+def _password_cache_key(user_id: int, hashed_password: str, password: str) -> Tuple[int, bytes]:
+    """Build the verification cache key for a user and candidate password"""
+    digest = hashlib.blake2b(
+        f"{hashed_password}:{password}".encode(),
+        key=_PASSWORD_CACHE_PEPPER,
+        digest_size=16
+    ).digest()
+    return user_id, digest
+
+def _get_cached_verification(key: Tuple[int, bytes]) -> Optional[bool]:
+    """Get a cached verification result if present and not expired"""
+    with _password_verify_cache_lock:
+        entry = _password_verify_cache.get(key)
+        if entry is None:
+            return None
+        
+        if time.monotonic() - entry[0] > PASSWORD_VERIFY_CACHE_TTL:
+            del _password_verify_cache[key]
+            return None
+        
+        return entry[1]
+
+def _cache_verification(key: Tuple[int, bytes], result: bool) -> None:
+    """Add a verification result to the cache, evicting the oldest entries when full"""
+    with _password_verify_cache_lock:
+        _password_verify_cache[key] = (time.monotonic(), result)
+        
+        if len(_password_verify_cache) > PASSWORD_VERIFY_CACHE_SIZE:
+            # Remove the oldest 20% of entries
+            entries = sorted(_password_verify_cache.items(), key=lambda item: item[1][0])
+            for old_key, _ in entries[:PASSWORD_VERIFY_CACHE_SIZE // 5]:
+                del _password_verify_cache[old_key]
+
+# Login record cache TTL in seconds and maximum number of entries. The TTL
+# is short because other processes may change a password; a successful
+# login re-checks the hash against the database, and a failed one re-reads
+# it before giving up.
+AUTH_RECORD_CACHE_TTL = 60
+AUTH_RECORD_CACHE_SIZE = 10000
+
+# (user id, hashed password) keyed by username; entries are (timestamp, record)
+_auth_record_cache: Dict[str, Tuple[float, Tuple[int, str]]] = {}
+_auth_record_cache_lock = threading.Lock()
+
+def _get_cached_auth_record(username: str) -> Optional[Tuple[int, str]]:
+    """Get a cached login record if present and not expired"""
+    with _auth_record_cache_lock:
+        entry = _auth_record_cache.get(username)
+        if entry is None:
+            return None
+        
+        if time.monotonic() - entry[0] > AUTH_RECORD_CACHE_TTL:
+            del _auth_record_cache[username]
+            return None
+        
+        return entry[1]
+
+def _cache_auth_record(username: str, record: Tuple[int, str]) -> None:
+    """Add a login record to the cache, evicting the oldest entries when full"""
+    with _auth_record_cache_lock:
+        _auth_record_cache[username] = (time.monotonic(), record)
+        
+        if len(_auth_record_cache) > AUTH_RECORD_CACHE_SIZE:
+            # Remove the oldest 20% of entries
+            entries = sorted(_auth_record_cache.items(), key=lambda item: item[1][0])
+            for old_key, _ in entries[:AUTH_RECORD_CACHE_SIZE // 5]:
+                del _auth_record_cache[old_key]
+
+# Usernames that had no user, keyed by username; values are timestamps.
+# Shares the login record TTL and lock.
+UNKNOWN_USERNAME_CACHE_SIZE = 20000
+_unknown_username_cache: Dict[str, float] = {}
+
+def _is_cached_unknown_username(username: str) -> bool:
+    """Check whether a username was recently looked up and not found"""
+    with _auth_record_cache_lock:
+        cached_at = _unknown_username_cache.get(username)
+        if cached_at is None:
+            return False
+        
+        if time.monotonic() - cached_at > AUTH_RECORD_CACHE_TTL:
+            del _unknown_username_cache[username]
+            return False
+        
+        return True
+
+def _cache_unknown_username(username: str) -> None:
+    """Remember that a username has no user, evicting the oldest entries when full"""
+    with _auth_record_cache_lock:
+        _unknown_username_cache[username] = time.monotonic()
+        
+        if len(_unknown_username_cache) > UNKNOWN_USERNAME_CACHE_SIZE:
+            # Remove the oldest 20% of entries
+            entries = sorted(_unknown_username_cache.items(), key=lambda item: item[1])
+            for old_key, _ in entries[:UNKNOWN_USERNAME_CACHE_SIZE // 5]:
+                del _unknown_username_cache[old_key]
+
+def _invalidate_auth_record(username: Optional[str]) -> None:
+    """Drop the cached login record, or unknown marker, for a username"""
+    if username is None:
+        return
+    
+    with _auth_record_cache_lock:
+        _auth_record_cache.pop(username, None)
+        _unknown_username_cache.pop(username, None)
+
+# Hash checked when the username is unknown, so a miss costs the same as a
+# wrong password. Created on first use to keep imports cheap.
+_dummy_password_hash: Optional[str] = None
+
+def _check_dummy_password(password: str) -> None:
+    """Spend the same time as a real password check, then discard the result"""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = _new_password_hash(secrets.token_hex(16))
+    
+    _check_password(password, _dummy_password_hash)
+
+def _invalidate_verification_cache(user_id: int) -> None:
+    """Drop every cached verification result for a user"""
+    with _password_verify_cache_lock:
+        for key in [key for key in _password_verify_cache if key[0] == user_id]:
+            del _password_verify_cache[key]
 
 class UserService:
     """Service for user management operations"""
@@ -28,7 +227,7 @@ class UserService:
             db (Session): Database session
         """
         self.db = db
-        self.repository = Repository[User, UserCreate, UserUpdate](User, db)
+        self.repository = UserRepository(db)
     
     def create_user(self, user_data: UserCreate) -> User:
         """
@@ -43,30 +242,96 @@ class UserService:
         Raises:
             ValueError: If username or email already exists
         """
-        # Check if username exists
-        if self.get_user_by_username(user_data.username):
+        # Check if username or email exists
+        username_taken, email_taken = self.repository.username_or_email_taken(
+            user_data.username, user_data.email
+        )
+        if username_taken:
             raise ValueError(f"Username '{user_data.username}' already exists")
-        
-        # Check if email exists
-        if self.get_user_by_email(user_data.email):
+        if email_taken:
             raise ValueError(f"Email '{user_data.email}' already exists")
         
         # Hash password
         hashed_password = self._hash_password(user_data.password)
         
-        # Create user dict with hashed password
-        user_dict = user_data.dict()
-        user_dict["hashed_password"] = hashed_password
-        del user_dict["password"]  # Remove plain password
+        # Create user in database from column values, skipping a schema rebuild
+        user = self.repository.create_from_dict(self._user_row(user_data, hashed_password))
+        _invalidate_auth_record(user_data.username)
+        
+        return user
+    
+    def create_users_bulk(self, users_data: List[UserCreate]) -> List[int]:
+        """
+        Create many users with one uniqueness check and one INSERT
+        
+        Passwords are hashed across worker threads; argon2 releases the
+        GIL while hashing.
+        
+        Args:
+            users_data (List[UserCreate]): User data
+            
+        Returns:
+            List[int]: IDs of the created users, in input order
+            
+        Raises:
+            ValueError: If a username or email already exists or is repeated in the batch
+        """
+        if not users_data:
+            return []
+        
+        usernames = [user_data.username for user_data in users_data]
+        emails = [user_data.email for user_data in users_data]
+        
+        # Check for repeats within the batch, then against existing users
+        if len(set(usernames)) != len(usernames):
+            raise ValueError("Duplicate usernames in batch")
+        if len(set(emails)) != len(emails):
+            raise ValueError("Duplicate emails in batch")
         
-        # Add default preferences
-        user_dict["preferences"] = user_dict.get("preferences", {})
+        taken_usernames, taken_emails = self.repository.taken_usernames_and_emails(usernames, emails)
+        if taken_usernames:
+            raise ValueError(f"Usernames already exist: {', '.join(sorted(taken_usernames))}")
+        if taken_emails:
+            raise ValueError(f"Emails already exist: {', '.join(sorted(taken_emails))}")
         
-        # Create user object
-        user_create = UserCreate(**user_dict)
+        # Hash passwords, with all salts drawn from the OS in one read
+        salt_len = _argon2_hasher.salt_len
+        salt_pool = os.urandom(salt_len * len(users_data))
+        salts = [salt_pool[i:i + salt_len] for i in range(0, len(salt_pool), salt_len)]
+        with ThreadPoolExecutor(max_workers=BULK_HASH_WORKERS) as executor:
+            hashed_passwords = list(executor.map(
+                _new_password_hash, [user_data.password for user_data in users_data], salts
+            ))
         
-        # Create user in database
-        return self.repository.create(user_create)
+        rows = self.repository.create_many([
+            self._user_row(user_data, hashed_password)
+            for user_data, hashed_password in zip(users_data, hashed_passwords)
+        ])
+        
+        for username in usernames:
+            _invalidate_auth_record(username)
+        
+        return [row.id for row in rows]
+    
+    @staticmethod
+    def _user_row(user_data: UserCreate, hashed_password: str) -> Dict[str, Any]:
+        """
+        Build User column values from creation data
+        
+        Args:
+            user_data (UserCreate): User data
+            hashed_password (str): Hashed password
+            
+        Returns:
+            Dict[str, Any]: Column values for a new user
+        """
+        return {
+            "username": user_data.username,
+            "email": user_data.email,
+            "full_name": user_data.fullname,
+            "hashed_password": hashed_password,
+            "preferences": {}
+        }
     
     def get_user(self, user_id: int) -> Optional[User]:
         """
@@ -112,23 +377,25 @@ class UserService:
         if not user:
             return None
         
-        # Check if username exists
-        if user_data.username and user_data.username != user.username:
-            if self.get_user_by_username(user_data.username):
-                raise ValueError(f"Username '{user_data.username}' already exists")
-        
-        # Check if email exists
-        if user_data.email and user_data.email != user.email:
-            if self.get_user_by_email(user_data.email):
-                raise ValueError(f"Email '{user_data.email}' already exists")
+        # Check if a changed username or email exists
+        new_username = user_data.username if user_data.username and user_data.username != user.username else None
+        new_email = user_data.email if user_data.email and user_data.email != user.email else None
+        username_taken, email_taken = self.repository.username_or_email_taken(new_username, new_email)
+        if username_taken:
+            raise ValueError(f"Username '{user_data.username}' already exists")
+        if email_taken:
+            raise ValueError(f"Email '{user_data.email}' already exists")
         
         # Update user dict
         user_dict = user_data.dict(exclude_unset=True)
+        _invalidate_auth_record(user.username)
+        _invalidate_auth_record(new_username)
         
-        # Hash password if provided
+        # Hash password if provided; UserUpdate has no hashed_password field, so
+        # set it on the loaded user and let the update below commit it
         if "password" in user_dict:
-            user_dict["hashed_password"] = self._hash_password(user_dict["password"])
-            del user_dict["password"]  # Remove plain password
+            user.hashed_password = self._hash_password(user_dict.pop("password"))
+            _invalidate_verification_cache(user_id)
         
         # Create update object
         user_update = UserUpdate(**user_dict)
@@ -146,6 +413,13 @@ class UserService:
         Returns:
             bool: True if user was deleted, False otherwise
         """
+        user = self.get_user(user_id)
+        if user is None:
+            return False
+        
+        _invalidate_auth_record(user.username)
+        _invalidate_verification_cache(user_id)
+        
         return self.repository.delete(user_id)
     
     def get_user_by_username(self, username: str) -> Optional[User]:
@@ -185,28 +459,182 @@ class UserService:
         Returns:
             bool: True if password is valid, False otherwise
         """
-        return pwd_context.verify(plain_password, hashed_password)
+        return _check_password(plain_password, hashed_password)
     
-    def authenticate_user(self, username: str, password: str) -> Optional[User]:
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify password in a worker thread
+        
+        argon2 and bcrypt release the GIL while hashing, so concurrent verifications
+        run in parallel and the event loop stays responsive.
+        
+        Args:
+            plain_password (str): Plain password
+            hashed_password (str): Hashed password
+            
+        Returns:
+            bool: True if password is valid, False otherwise
+        """
+        return await asyncio.to_thread(_check_password, plain_password, hashed_password)
+    
+    def authenticate_user(self, username: str, password: str, load_relations: Tuple[Any, ...] = ()) -> Optional[User]:
         """
         Authenticate user
         
+        The user's ID and password hash are cached briefly by username, and
+        successful verifications are cached briefly too, so repeated logins
+        skip both the username lookup and password hashing. Wrong passwords
+        and unknown usernames always cost one full password check, so the two
+        cannot be told apart by timing.
+        
         Args:
             username (str): Username
             password (str): Password
+            load_relations (Tuple[Any, ...], optional): User relationships the caller
+                will use, loaded with the user instead of lazily. Defaults to ().
             
         Returns:
             Optional[User]: User if authenticated, None otherwise
         """
-        user = self.get_user_by_username(username)
-        if not user:
+        record = self._get_auth_record(username)
+        if record is None:
+            _check_dummy_password(password)
             return None
         
-        if not self.verify_password(password, user.hashed_password):
+        user_id, hashed_password = record
+        key = _password_cache_key(user_id, hashed_password, password)
+        verified = _get_cached_verification(key)
+        if verified is None:
+            verified = self._verify_and_upgrade(username, user_id, hashed_password, password)
+            if not verified:
+                verified, hashed_password = self._retry_with_current_hash(
+                    username, user_id, hashed_password, password
+                )
+                key = _password_cache_key(user_id, hashed_password, password)
+            if verified:
+                _cache_verification(key, True)
+        
+        if not verified:
             return None
         
+        user = self.repository.get_with_relations(user_id, *load_relations)
+        if user is None or user.username != username:
+            _invalidate_auth_record(username)
+            return None
+        
+        if user.hashed_password != hashed_password:
+            # Changed since the record was cached; verify against the current hash
+            _invalidate_auth_record(username)
+            if not self._verify_and_upgrade(username, user_id, user.hashed_password, password):
+                return None
+        
         return user
     
+    async def authenticate_user_async(
+        self,
+        username: str,
+        password: str,
+        load_relations: Tuple[Any, ...] = ()
+    ) -> Optional[User]:
+        """
+        Authenticate user without blocking the event loop
+        
+        Args:
+            username (str): Username
+            password (str): Password
+            load_relations (Tuple[Any, ...], optional): User relationships to load
+                with the user. Defaults to ().
+            
+        Returns:
+            Optional[User]: User if authenticated, None otherwise
+        """
+        return await asyncio.to_thread(self.authenticate_user, username, password, load_relations)
+    
+    def _get_auth_record(self, username: str) -> Optional[Tuple[int, str]]:
+        """
+        Get the ID and password hash for a username, from the cache if possible
+        
+        Args:
+            username (str): Username
+            
+        Returns:
+            Optional[Tuple[int, str]]: User ID and password hash if the user exists
+        """
+        record = _get_cached_auth_record(username)
+        if record is not None:
+            return record
+        
+        if _is_cached_unknown_username(username):
+            return None
+        
+        row = self.db.execute(
+            select(User.id, User.hashed_password).where(User.username == username)
+        ).first()
+        if row is None:
+            _cache_unknown_username(username)
+            return None
+        
+        record = (row.id, row.hashed_password)
+        _cache_auth_record(username, record)
+        
+        return record
+    
+    def _retry_with_current_hash(
+        self,
+        username: str,
+        user_id: int,
+        hashed_password: str,
+        password: str
+    ) -> Tuple[bool, str]:
+        """
+        Re-read a user's password hash after a failed check and retry if it changed
+        
+        The cached login record may predate a password change made by another
+        process, so the new password would otherwise be rejected until the
+        record expires.
+        
+        Args:
+            username (str): Username
+            user_id (int): User ID
+            hashed_password (str): Password hash the failed check used
+            password (str): Plain password
+            
+        Returns:
+            Tuple[bool, str]: Whether the password matched, and the hash it was checked against
+        """
+        current_hash = self.db.scalar(select(User.hashed_password).where(User.id == user_id))
+        if current_hash is None or current_hash == hashed_password:
+            return False, hashed_password
+        
+        _cache_auth_record(username, (user_id, current_hash))
+        
+        return self._verify_and_upgrade(username, user_id, current_hash, password), current_hash
+    
+    def _verify_and_upgrade(self, username: str, user_id: int, hashed_password: str, password: str) -> bool:
+        """
+        Verify a user's password, rehashing it if the stored hash is outdated
+        
+        Args:
+            username (str): Username
+            user_id (int): User ID
+            hashed_password (str): Stored password hash
+            password (str): Plain password
+            
+        Returns:
+            bool: True if password is valid, False otherwise
+        """
+        verified, new_hash = _check_password_and_rehash(password, hashed_password)
+        
+        if verified and new_hash:
+            self.db.execute(
+                update(User).where(User.id == user_id).values(hashed_password=new_hash)
+            )
+            self.db.commit()
+            _invalidate_auth_record(username)
+            logger.info("Rehashed password for user %s", user_id)
+        
+        return verified
+    
     def _hash_password(self, password: str) -> str:
         """
         Hash password
@@ -217,7 +645,19 @@ class UserService:
         Returns:
             str: Hashed password
         """
-        return pwd_context.hash(password)
+        return _new_password_hash(password)
+    
+    async def _hash_password_async(self, password: str) -> str:
+        """
+        Hash password in a worker thread
+        
+        Args:
+            password (str): Plain password
+            
+        Returns:
+            str: Hashed password
+        """
+        return await asyncio.to_thread(_new_password_hash, password)
     
     def update_preferences(self, user_id: int, preferences: Dict[str, Any]) -> Optional[User]:
         """
@@ -227,9 +667,25 @@ class UserService:
             user_id (int): User ID
             preferences (Dict[str, Any]): User preferences
             
+        On PostgreSQL the merge happens in the UPDATE itself, so there is no
+        read-modify-write and concurrent updates to other keys are kept.
+        
         Returns:
             Optional[User]: Updated user if found, None otherwise
         """
+        if self.db.get_bind().dialect.name == "postgresql":
+            merged = func.coalesce(cast(User.preferences, JSONB), literal({}, JSONB)).op("||")(
+                literal(preferences, JSONB)
+            )
+            user = self.db.scalars(
+                update(User)
+                .where(User.id == user_id)
+                .values(preferences=cast(merged, JSON))
+                .returning(User)
+            ).first()
+            self.db.commit()
+            return user
+        
         # Get user
         user = self.get_user(user_id)
         if not user:
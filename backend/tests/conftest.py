@@ -3,43 +3,105 @@
 Test configuration and fixtures for the trading journal backend
 """
 
+from unittest.mock import MagicMock
+
+import httpx
 import pytest
-import tempfile
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import pytest_asyncio
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
-# Import your app components
-from backend.main import app  # Adjust import path as needed
+@pytest.fixture(scope="session")
+def test_engine():
+    """Create one in-memory database and schema for the test session"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    
+    # pysqlite issues its own BEGIN, which breaks SAVEPOINTs; let SQLAlchemy do it
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    # Create tables
+    import backend.models  # noqa: F401 - registers every model on Base
+    from backend.db.database import Base
+    Base.metadata.create_all(bind=engine)
+    
+    yield engine
+    
+    engine.dispose()
 
 @pytest.fixture(scope="function")
-def test_db():
-    """Create a temporary database for testing"""
-    # Create temporary database file
-    db_fd, db_path = tempfile.mkstemp()
-    database_url = f"sqlite:///{db_path}"
+def test_db(test_engine):
+    """Create a database session whose changes are rolled back after the test"""
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    
+    # Commits inside the test release SAVEPOINTs instead of ending the outer transaction
+    db = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
     
     try:
-        engine = create_engine(database_url, connect_args={"check_same_thread": False})
-        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        
-        # Create tables
-        from backend.models import Base  # Adjust import as needed
-        Base.metadata.create_all(bind=engine)
-        
-        db = TestingSessionLocal()
         yield db
-        
     finally:
         db.close()
-        os.close(db_fd)
-        os.unlink(db_path)
+        transaction.rollback()
+        connection.close()
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI app, with Firebase stubbed out for the whole session"""
+    import firebase_admin
+    from firebase_admin import firestore
+    
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # The Firebase client is created when its module is imported and again
+        # at app startup; both would otherwise need real credentials
+        monkeypatch.setattr(firebase_admin, "initialize_app", lambda *args, **kwargs: None)
+        monkeypatch.setattr(firestore, "client", lambda *args, **kwargs: MagicMock(name="firestore_client"))
+        
+        # Imported here so tests that only need the database do not load the app
+        from backend.api.main import app
+        
+        yield app
+
+@pytest.fixture(scope="session")
+def app_client(app):
+    """Start the FastAPI app once per session behind a TestClient"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client(app):
+    """
+    Create one async test client for the session, calling the app in-process
+    
+    ASGITransport skips the lifespan and the TestClient thread hop, and the
+    client's connection state is reused across tests.
+    """
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=True)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
 
 @pytest.fixture
-def client():
-    """Create test client for FastAPI app"""
-    return TestClient(app)
+def client(app_client, test_db):
+    """Test client whose requests use the rolled-back test session"""
+    from backend.db.database import get_db
+    
+    app = app_client.app
+    app.dependency_overrides[get_db] = lambda: test_db
+    try:
+        yield app_client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
 
 @pytest.fixture
 def sample_trade_data():
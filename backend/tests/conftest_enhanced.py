@@ -4,51 +4,82 @@ Enhanced test configuration with MCP server testing support
 """
 
 import pytest
-import tempfile
+import pytest_asyncio
+import httpx
 import os
 import asyncio
 from unittest.mock import AsyncMock, Mock
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 import json
 from datetime import datetime, timedelta
+import numpy as np
 
 # Import your app components
-from backend.main import app
+from backend.api.main import app
+
+@pytest.fixture(scope="session")
+def test_engine():
+    """Create one in-memory database and schema for the test session"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    
+    # pysqlite issues its own BEGIN, which breaks SAVEPOINTs; let SQLAlchemy do it
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    # Create tables
+    import backend.models  # noqa: F401 - registers every model on Base
+    from backend.db.database import Base
+    Base.metadata.create_all(bind=engine)
+    
+    yield engine
+    
+    engine.dispose()
 
 @pytest.fixture(scope="function")
-def test_db():
-    """Create a temporary database for testing"""
-    db_fd, db_path = tempfile.mkstemp()
-    database_url = f"sqlite:///{db_path}"
+def test_db(test_engine):
+    """Create a database session whose changes are rolled back after the test"""
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    
+    # Commits inside the test release SAVEPOINTs instead of ending the outer transaction
+    db = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
     
     try:
-        engine = create_engine(database_url, connect_args={"check_same_thread": False})
-        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        
-        # Create tables
-        from backend.models import Base
-        Base.metadata.create_all(bind=engine)
-        
-        db = TestingSessionLocal()
         yield db
-        
     finally:
         db.close()
-        os.close(db_fd)
-        os.unlink(db_path)
+        transaction.rollback()
+        connection.close()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create test client for FastAPI app"""
-    return TestClient(app)
+    """Create one test client for FastAPI app, shared by the whole session"""
+    with TestClient(app) as test_client:
+        yield test_client
 
-@pytest.fixture
-def async_client():
-    """Create async test client for testing async endpoints"""
-    from httpx import AsyncClient
-    return AsyncClient(app=app, base_url="http://test")
+@pytest_asyncio.fixture(scope="session")
+async def async_client():
+    """
+    Create one async test client for the session, calling the app in-process
+    
+    ASGITransport skips the lifespan and the TestClient thread hop, and the
+    client's connection state is reused across tests.
+    """
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=True)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
 
 # Sample Data Fixtures
 @pytest.fixture
@@ -207,32 +238,73 @@ def sample_user_data():
     }
 
 # Performance Testing Fixtures
+@pytest.fixture(scope="session")
+def large_trade_dataset_columns():
+    """Large performance dataset as NumPy columns, one array per trade field"""
+    count = 1000
+    i = np.arange(count)
+    is_win = i % 2 == 0
+    
+    entry_times = np.datetime64("2024-01-01T00:00:00") + (i % 365).astype("timedelta64[D]")
+    entry_prices = (15000 + i % 100).astype(np.float64)
+    
+    return {
+        "id": i + 1,
+        "setup_type": np.array(["MMXM_Breaker", "ICT_FVG", "MMXM_Mitigation"])[i % 3],
+        "entry_price": entry_prices,
+        "exit_price": entry_prices + np.where(is_win, 10.0, -5.0),
+        "entry_time": entry_times,
+        "exit_time": entry_times + np.timedelta64(30, "m"),
+        "outcome": np.where(is_win, "win", "loss"),
+        "profit_loss": np.where(is_win, 10.0, -5.0),
+        "emotional_state": np.array(["confident", "nervous", "calm"])[i % 3],
+        "plan_adherence": 7 + i % 3,
+        "batch": i // 100,
+    }
+
 @pytest.fixture
-def large_trade_dataset():
-    """Generate large dataset for performance testing"""
-    trades = []
-    base_date = datetime(2024, 1, 1)
+def large_trade_dataset(large_trade_dataset_columns):
+    """
+    Generate large dataset for performance testing
+    
+    The columns are computed once per session; the dicts (and their tags
+    lists) are rebuilt for every test, so a test that edits a trade cannot
+    change what later tests see.
+    """
+    columns = large_trade_dataset_columns
     
-    for i in range(1000):
-        trade_date = base_date + timedelta(days=i % 365)
-        trades.append({
-            "id": i + 1,
+    return [
+        {
+            "id": trade_id,
             "symbol": "NQ",
-            "setup_type": ["MMXM_Breaker", "ICT_FVG", "MMXM_Mitigation"][i % 3],
-            "entry_price": 15000 + (i % 100),
-            "exit_price": 15000 + (i % 100) + (10 if i % 2 == 0 else -5),
+            "setup_type": setup_type,
+            "entry_price": int(entry_price),
+            "exit_price": int(exit_price),
             "position_size": 1,
-            "entry_time": trade_date.isoformat(),
-            "exit_time": (trade_date + timedelta(minutes=30)).isoformat(),
-            "outcome": "win" if i % 2 == 0 else "loss",
-            "profit_loss": 10 if i % 2 == 0 else -5,
-            "emotional_state": ["confident", "nervous", "calm"][i % 3],
-            "plan_adherence": 7 + (i % 3),
-            "notes": f"Trade {i+1} notes",
-            "tags": ["test_data", f"batch_{i//100}"]
-        })
-    
-    return trades
+            "entry_time": entry_time,
+            "exit_time": exit_time,
+            "outcome": outcome,
+            "profit_loss": int(profit_loss),
+            "emotional_state": emotional_state,
+            "plan_adherence": plan_adherence,
+            "notes": f"Trade {trade_id} notes",
+            "tags": ["test_data", f"batch_{batch}"]
+        }
+        for trade_id, setup_type, entry_price, exit_price, entry_time, exit_time,
+            outcome, profit_loss, emotional_state, plan_adherence, batch in zip(
+            columns["id"].tolist(),
+            columns["setup_type"].tolist(),
+            columns["entry_price"].tolist(),
+            columns["exit_price"].tolist(),
+            np.datetime_as_string(columns["entry_time"], unit="s").tolist(),
+            np.datetime_as_string(columns["exit_time"], unit="s").tolist(),
+            columns["outcome"].tolist(),
+            columns["profit_loss"].tolist(),
+            columns["emotional_state"].tolist(),
+            columns["plan_adherence"].tolist(),
+            columns["batch"].tolist()
+        )
+    ]
 
 # Database State Fixtures
 @pytest.fixture
@@ -4,29 +4,25 @@ Test cases for trading journal API endpoints
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from backend.main import app
-
-client = TestClient(app)
 
 class TestHealthEndpoints:
     """Test basic health and info endpoints"""
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test the root endpoint"""
         response = client.get("/")
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
     
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Test health check endpoint"""
         response = client.get("/api/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
     
-    def test_api_info(self):
+    def test_api_info(self, client):
         """Test API info endpoint"""
         response = client.get("/api/info")
         assert response.status_code == 200
@@ -34,17 +30,43 @@ class TestHealthEndpoints:
         assert "name" in data
         assert "version" in data
 
+class TestAsyncClient:
+    """The session-wide in-process async client"""
+    
+    @pytest.mark.asyncio
+    async def test_root_endpoint(self, async_client):
+        """Requests reach the app without going through TestClient"""
+        response = await async_client.get("/")
+        assert response.status_code == 200
+        assert "message" in response.json()
+    
+    @pytest.mark.asyncio
+    async def test_client_is_shared(self, async_client):
+        """Later tests reuse the same open client"""
+        assert not async_client.is_closed
+        response = await async_client.get("/api/info")
+        assert response.status_code == 200
+
+class TestClientDatabase:
+    """The client fixture routes requests to the test database"""
+    
+    def test_requests_use_test_session(self, client, test_db):
+        """get_db resolves to the rolled-back test session, not the app database"""
+        from backend.db.database import get_db
+        
+        assert client.app.dependency_overrides[get_db]() is test_db
+
 class TestTradeEndpoints:
     """Test trade-related API endpoints"""
     
-    def test_get_trades_empty(self):
+    def test_get_trades_empty(self, client):
         """Test getting trades when database is empty"""
         response = client.get("/api/trades")
         assert response.status_code == 200
         data = response.json()
         assert "trades" in data
     
-    def test_create_trade(self, sample_trade_data):
+    def test_create_trade(self, client, sample_trade_data):
         """Test creating a new trade"""
         response = client.post("/api/trades", json=sample_trade_data)
         # This might return 201 or 200 depending on your implementation
@@ -55,7 +77,7 @@ class TestTradeEndpoints:
             assert data["symbol"] == sample_trade_data["symbol"]
             assert data["setup_type"] == sample_trade_data["setup_type"]
     
-    def test_create_trade_invalid_data(self):
+    def test_create_trade_invalid_data(self, client):
         """Test creating trade with invalid data"""
         invalid_data = {
             "symbol": "",  # Empty symbol should be invalid
@@ -65,7 +87,7 @@ class TestTradeEndpoints:
         # Should return validation error
         assert response.status_code in [400, 422]
     
-    def test_get_trade_by_id(self):
+    def test_get_trade_by_id(self, client):
         """Test getting a specific trade by ID"""
         # First create a trade
         trade_data = {
@@ -87,7 +109,7 @@ class TestTradeEndpoints:
 class TestStatisticsEndpoints:
     """Test statistics-related API endpoints"""
     
-    def test_get_statistics(self):
+    def test_get_statistics(self, client):
         """Test getting trading statistics"""
         response = client.get("/api/statistics")
         assert response.status_code == 200
@@ -98,14 +120,14 @@ class TestStatisticsEndpoints:
         for field in expected_fields:
             assert field in data
     
-    def test_get_statistics_with_timeframe(self):
+    def test_get_statistics_with_timeframe(self, client):
         """Test getting statistics with timeframe filter"""
         response = client.get("/api/statistics?timeframe=1W")
         assert response.status_code == 200
         data = response.json()
         assert "total_trades" in data
     
-    def test_get_statistics_with_date_range(self):
+    def test_get_statistics_with_date_range(self, client):
         """Test getting statistics with custom date range"""
         params = {
             "start_date": "2024-01-01",
@@ -117,7 +139,7 @@ class TestStatisticsEndpoints:
 class TestDashboardEndpoints:
     """Test dashboard-related API endpoints"""
     
-    def test_get_dashboard_data(self):
+    def test_get_dashboard_data(self, client):
         """Test getting dashboard data"""
         response = client.get("/api/dashboard")
         # This endpoint might not exist yet
@@ -133,12 +155,12 @@ class TestDashboardEndpoints:
 class TestJournalEndpoints:
     """Test journal-related API endpoints"""
     
-    def test_get_journal_entries(self):
+    def test_get_journal_entries(self, client):
         """Test getting journal entries"""
         response = client.get("/api/journal")
         assert response.status_code in [200, 404]  # 404 if not implemented yet
     
-    def test_create_journal_entry(self):
+    def test_create_journal_entry(self, client):
         """Test creating a journal entry"""
         journal_data = {
             "date": "2024-01-01",
@@ -153,17 +175,17 @@ class TestJournalEndpoints:
 class TestErrorHandling:
     """Test error handling scenarios"""
     
-    def test_invalid_endpoint(self):
+    def test_invalid_endpoint(self, client):
         """Test accessing non-existent endpoint"""
         response = client.get("/api/nonexistent")
         assert response.status_code == 404
     
-    def test_invalid_method(self):
+    def test_invalid_method(self, client):
         """Test using wrong HTTP method"""
         response = client.delete("/api/trades")  # If DELETE is not supported
         assert response.status_code in [404, 405]  # Method not allowed or not found
     
-    def test_malformed_json(self):
+    def test_malformed_json(self, client):
         """Test sending malformed JSON"""
         response = client.post(
             "/api/trades",
@@ -176,7 +198,7 @@ class TestErrorHandling:
 class TestPerformance:
     """Test API performance"""
     
-    def test_response_time(self):
+    def test_response_time(self, client):
         """Test that basic endpoints respond quickly"""
         import time
         
@@ -191,7 +213,7 @@ class TestPerformance:
 class TestIntegration:
     """Integration tests that test multiple components together"""
     
-    def test_trade_creation_and_statistics_update(self, sample_trade_data):
+    def test_trade_creation_and_statistics_update(self, client, sample_trade_data):
         """Test that creating trades updates statistics"""
         # Get initial statistics
         initial_stats = client.get("/api/statistics")
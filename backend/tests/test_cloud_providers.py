@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test cases for the local cloud storage provider
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from backend.services.cloud_service.providers import LocalStorageProvider, _remove_tree
+
+def _make_tree(root, names):
+    for name in names:
+        os.makedirs(os.path.join(root, name, "nested"))
+        with open(os.path.join(root, name, "nested", "data.txt"), "w") as f:
+            f.write(name)
+
+class TestRemoveTree:
+    """Parallel directory deletion"""
+    
+    def test_removes_directory_tree(self, tmp_path):
+        """Every subdirectory and the root are deleted"""
+        target = tmp_path / "store" / "folder"
+        _make_tree(str(target), ["a", "b", "c"])
+        
+        _remove_tree(str(target))
+        
+        assert not target.exists()
+    
+    def test_symlink_target_is_left_alone(self, tmp_path):
+        """A link to a directory is refused before anything behind it is touched"""
+        outside = tmp_path / "outside"
+        _make_tree(str(outside), ["a", "b", "c"])
+        store = tmp_path / "store"
+        store.mkdir()
+        link = store / "link"
+        link.symlink_to(outside, target_is_directory=True)
+        
+        with pytest.raises(OSError):
+            _remove_tree(str(link))
+        
+        assert sorted(os.listdir(outside)) == ["a", "b", "c"]
+        assert (outside / "a" / "nested" / "data.txt").exists()
+    
+    def test_delete_file_reports_error_for_symlink(self, tmp_path):
+        """LocalStorageProvider.delete_file keeps the link target intact"""
+        outside = tmp_path / "outside"
+        _make_tree(str(outside), ["a", "b"])
+        store = tmp_path / "store"
+        store.mkdir()
+        (store / "link").symlink_to(outside, target_is_directory=True)
+        provider = LocalStorageProvider({"storage_dir": str(store)})
+        
+        result = asyncio.run(provider.delete_file("link"))
+        
+        assert result["status"] == "error"
+        assert sorted(os.listdir(outside)) == ["a", "b"]
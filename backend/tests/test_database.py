@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test cases for database schema upgrades
+"""
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+import backend.models  # noqa: F401 - registers every model on Base
+from backend.db.database import Base, upgrade_trade_group_keys
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """Database whose trades table predates the group key columns"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    
+    with engine.begin() as conn:
+        for key in ("emotional_state_key", "plan_adherence_key"):
+            conn.execute(text(f"DROP INDEX ix_trades_user_{key}"))
+            conn.execute(text(f"ALTER TABLE trades DROP COLUMN {key}"))
+        conn.execute(text(
+            "INSERT INTO trades (user_id, symbol, emotional_state, plan_adherence) "
+            "VALUES (1, 'NQ', 'CALM', 'NO_PLAN'), (1, 'ES', NULL, NULL)"
+        ))
+    
+    yield engine
+    
+    engine.dispose()
+
+class TestTradeGroupKeyUpgrade:
+    """upgrade_trade_group_keys"""
+    
+    def test_adds_columns_and_indexes(self, legacy_engine):
+        """Missing columns and their indexes are created"""
+        upgrade_trade_group_keys(legacy_engine)
+        
+        inspector = inspect(legacy_engine)
+        columns = {column["name"] for column in inspector.get_columns("trades")}
+        indexes = {index["name"] for index in inspector.get_indexes("trades")}
+        assert {"emotional_state_key", "plan_adherence_key"} <= columns
+        assert {"ix_trades_user_emotional_state_key", "ix_trades_user_plan_adherence_key"} <= indexes
+    
+    def test_backfills_keys_from_enum_values(self, legacy_engine):
+        """Existing rows get the enum value as their key; NULL enums stay NULL"""
+        upgrade_trade_group_keys(legacy_engine)
+        
+        with legacy_engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT symbol, emotional_state_key, plan_adherence_key FROM trades ORDER BY symbol"
+            )).all()
+        assert rows == [("ES", None, None), ("NQ", "Calm", "No Plan")]
+    
+    def test_is_idempotent(self, legacy_engine):
+        """Running the upgrade twice changes nothing the second time"""
+        upgrade_trade_group_keys(legacy_engine)
+        upgrade_trade_group_keys(legacy_engine)
+        
+        with legacy_engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM trades WHERE emotional_state_key = 'Calm'")).scalar() == 1
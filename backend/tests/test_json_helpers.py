@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Test cases for JSON field helpers
+"""
+
+from backend.utils.json_helpers import process_json_field
+
+class TestProcessJsonField:
+    """process_json_field with cached string parsing"""
+    
+    def test_parsed_lists_are_not_shared(self):
+        """Mutating one parsed list does not leak into the next parse"""
+        first = process_json_field('["a", "b"]')
+        first.append("c")
+        
+        assert process_json_field('["a", "b"]') == ["a", "b"]
+    
+    def test_nested_containers_are_not_shared(self):
+        """Nested containers are copied along with the outer one"""
+        first = process_json_field('{"shots": [{"url": "x"}]}')
+        first["shots"][0]["url"] = "changed"
+        first["shots"].append({"url": "y"})
+        
+        assert process_json_field('{"shots": [{"url": "x"}]}') == {"shots": [{"url": "x"}]}
+    
+    def test_plain_text_is_wrapped(self):
+        """Non-JSON text becomes a one-item list"""
+        assert process_json_field("breakout") == ["breakout"]
+        assert process_json_field("[not json") == ["[not json"]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test cases for repository queries
+"""
+
+from datetime import date, datetime
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from backend.db.repository import TradeRepository, UserRepository
+from backend.models.journal import Journal
+from backend.models.user import User
+
+class TradeIn(BaseModel):
+    """Trade creation payload carrying the model's enum values and owner"""
+    user_id: int
+    symbol: str = "NQ"
+    setup_type: str = "ICT_FVG"
+    entry_price: float = 15000.0
+    exit_price: float = 15005.0
+    position_size: float = 1
+    entry_time: datetime = datetime(2024, 1, 2, 9, 30)
+    exit_time: datetime = datetime(2024, 1, 2, 10, 0)
+    outcome: str = "Win"
+    profit_loss: float = 100.0
+    emotional_state: Optional[str] = None
+    plan_adherence: Optional[str] = None
+
+@pytest.fixture
+def user(test_db):
+    """User owning the test trades"""
+    user = User(username="trader", email="trader@example.com", hashed_password="x")
+    test_db.add(user)
+    test_db.commit()
+    return user
+
+class TestUserRepositoryJournals:
+    """UserRepository.get_with_journals"""
+    
+    def test_since_limits_loaded_journals(self, test_db):
+        """Only journals on or after the cutoff are loaded"""
+        user = User(username="writer", email="writer@example.com", hashed_password="x")
+        test_db.add(user)
+        test_db.flush()
+        test_db.add_all([
+            Journal(user_id=user.id, date=date(2024, 1, 1), content="old"),
+            Journal(user_id=user.id, date=date(2024, 3, 1), content="cutoff"),
+            Journal(user_id=user.id, date=date(2024, 3, 2), content="new"),
+        ])
+        test_db.commit()
+        user_id = user.id
+        test_db.expunge_all()
+        
+        loaded = UserRepository(test_db).get_with_journals(user_id, since=date(2024, 3, 1))
+        
+        assert sorted(journal.content for journal in loaded.journals) == ["cutoff", "new"]
+    
+    def test_without_since_loads_all(self, test_db):
+        """No cutoff keeps the previous behavior"""
+        user = User(username="writer", email="writer@example.com", hashed_password="x")
+        test_db.add(user)
+        test_db.flush()
+        test_db.add_all([
+            Journal(user_id=user.id, date=date(2024, 1, 1), content="old"),
+            Journal(user_id=user.id, date=date(2024, 3, 2), content="new"),
+        ])
+        test_db.commit()
+        user_id = user.id
+        test_db.expunge_all()
+        
+        assert len(UserRepository(test_db).get_with_journals(user_id).journals) == 2
+
+class TestTradeRepositoryAdherenceBuckets:
+    """TradeRepository.adherence_buckets"""
+    
+    def test_buckets_follow_plan_adherence_values(self, test_db, user):
+        """Followed counts as high, Deviated and No Plan as low, Partial as neither"""
+        repository = TradeRepository(test_db)
+        for plan_adherence, outcome in [
+            ("Followed", "Win"), ("Followed", "Win"), ("Followed", "Loss"),
+            ("Partial", "Win"),
+            ("Deviated", "Loss"), ("No Plan", "Win"),
+            (None, "Win"),
+        ]:
+            repository.create(TradeIn(user_id=user.id, plan_adherence=plan_adherence, outcome=outcome))
+        
+        buckets = repository.adherence_buckets(user.id)
+        
+        assert buckets == {
+            "high": {"total": 3, "wins": 2},
+            "low": {"total": 2, "wins": 1},
+            None: {"total": 1, "wins": 1},
+        }
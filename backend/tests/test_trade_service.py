@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test cases for trade statistics caching
+"""
+
+from datetime import datetime
+
+import pytest
+
+from backend.db.repository import TradeRepository
+from backend.db.schemas import TradeUpdate
+from backend.models.trade import EmotionalState, PlanAdherence, TradeOutcome
+from backend.models.user import User
+from backend.services import trade_service
+from backend.services.trade_service import TradeService
+
+@pytest.fixture(autouse=True)
+def clear_statistics_cache():
+    """Start every test with an empty statistics cache"""
+    trade_service._statistics_cache.clear()
+    yield
+    trade_service._statistics_cache.clear()
+
+@pytest.fixture
+def user(test_db):
+    """User owning the test trades"""
+    user = User(username="stats", email="stats@example.com", hashed_password="x")
+    test_db.add(user)
+    test_db.commit()
+    return user
+
+def _trade_row(user, profit_loss=100.0):
+    return {
+        "user_id": user.id,
+        "symbol": "NQ",
+        "setup_type": "ICT_FVG",
+        "entry_price": 15000.0,
+        "exit_price": 15005.0,
+        "position_size": 1,
+        "entry_time": datetime(2024, 1, 2, 9, 30),
+        "exit_time": datetime(2024, 1, 2, 10, 0),
+        "outcome": TradeOutcome.WIN,
+        "profit_loss": profit_loss
+    }
+
+class TestStatisticsCache:
+    """TradeService.get_statistics caching"""
+    
+    def test_callers_get_independent_copies(self, test_db, user):
+        """Mutating returned statistics does not change later results"""
+        TradeRepository(test_db).create_from_dict(_trade_row(user))
+        service = TradeService(test_db)
+        
+        first = service.get_statistics(user.id)
+        first.total_trades = 999
+        first.setup_performance.clear()
+        second = service.get_statistics(user.id)
+        
+        assert second.total_trades == 1
+        assert "ICT_FVG" in second.setup_performance
+    
+    def test_repository_create_invalidates(self, test_db, user):
+        """A trade written straight through the repository is counted at once"""
+        repository = TradeRepository(test_db)
+        repository.create_from_dict(_trade_row(user))
+        service = TradeService(test_db)
+        assert service.get_statistics(user.id).total_trades == 1
+        
+        repository.create_from_dict(_trade_row(user))
+        
+        assert service.get_statistics(user.id).total_trades == 2
+    
+    def test_repository_create_many_invalidates(self, test_db, user):
+        """Bulk inserts clear the cache for every affected user"""
+        repository = TradeRepository(test_db)
+        repository.create_from_dict(_trade_row(user))
+        service = TradeService(test_db)
+        assert service.get_statistics(user.id).total_trades == 1
+        
+        repository.create_many([_trade_row(user), _trade_row(user)])
+        
+        assert service.get_statistics(user.id).total_trades == 3
+    
+    def test_repository_update_invalidates(self, test_db, user):
+        """Updating a trade through the repository refreshes the statistics"""
+        repository = TradeRepository(test_db)
+        trade = repository.create_from_dict(_trade_row(user, profit_loss=100.0))
+        service = TradeService(test_db)
+        assert service.get_statistics(user.id).net_profit_loss == 100.0
+        
+        repository.update(trade.id, TradeUpdate(profit_loss=250.0))
+        
+        assert service.get_statistics(user.id).net_profit_loss == 250.0
+    
+    def test_repository_delete_invalidates(self, test_db, user):
+        """Deleting a trade through the repository refreshes the statistics"""
+        repository = TradeRepository(test_db)
+        trade = repository.create_from_dict(_trade_row(user))
+        service = TradeService(test_db)
+        assert service.get_statistics(user.id).total_trades == 1
+        
+        repository.delete(trade.id)
+        
+        assert service.get_statistics(user.id).total_trades == 0
+
+class TestGroupKeys:
+    """Emotional state and plan adherence breakdowns"""
+    
+    def test_create_from_dict_trades_are_grouped(self, test_db, user):
+        """Trades created from raw column values get their group keys"""
+        row = _trade_row(user)
+        row.update(emotional_state="Calm", plan_adherence=PlanAdherence.FOLLOWED)
+        trade = TradeRepository(test_db).create_from_dict(row)
+        
+        assert (trade.emotional_state_key, trade.plan_adherence_key) == ("Calm", "Followed")
+        statistics = TradeService(test_db).get_statistics(user.id)
+        assert list(statistics.emotional_state_performance) == ["Calm"]
+        assert list(statistics.plan_adherence_performance) == ["Followed"]
+    
+    def test_orm_assignment_updates_keys(self, test_db, user):
+        """Changing the enum columns directly keeps the keys in sync"""
+        trade = TradeRepository(test_db).create_from_dict(_trade_row(user))
+        
+        trade.emotional_state = EmotionalState.FEARFUL
+        trade.plan_adherence = "DEVIATED"
+        test_db.commit()
+        assert (trade.emotional_state_key, trade.plan_adherence_key) == ("Fearful", "Deviated")
+        
+        trade.emotional_state = None
+        test_db.commit()
+        assert trade.emotional_state_key is None
+        statistics = TradeService(test_db).get_statistics(user.id)
+        assert list(statistics.plan_adherence_performance) == ["Deviated"]
+
+class TestMockMetrics:
+    """Mock metrics payloads served by the function-based API"""
+    
+    def test_nested_values_are_not_shared(self, test_db):
+        """Editing nested data in one response leaves later responses intact"""
+        first = trade_service.calculate_performance_metrics(test_db)
+        first["streakData"]["lastTwoWeeks"].clear()
+        first["dailyPnL"][0]["pnl"] = 0
+        
+        second = trade_service.calculate_performance_metrics(test_db)
+        
+        assert len(second["streakData"]["lastTwoWeeks"]) == 14
+        assert second["dailyPnL"][0]["pnl"] == 125.50
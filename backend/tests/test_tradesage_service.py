@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test cases for TradeSage caching
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from backend.models.trade import Trade, TradeOutcome
+from backend.models.user import User
+from backend.services import tradesage_service
+from backend.services.tradesage_service import TradeSageService
+
+@pytest.fixture(autouse=True)
+def clear_tradesage_caches():
+    """Start every test with empty module-level caches"""
+    caches = (tradesage_service._trade_data_cache, tradesage_service._ai_response_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+@pytest.fixture
+def user(test_db):
+    """User owning the test trades"""
+    user = User(username="sage", email="sage@example.com", hashed_password="x")
+    test_db.add(user)
+    test_db.commit()
+    return user
+
+@pytest.fixture
+def service(test_db):
+    """TradeSage service bound to the rolled-back test session"""
+    return TradeSageService(test_db)
+
+def _add_trade(db, user, symbol="NQ", entry_time=datetime(2024, 1, 2, 9, 30)):
+    trade = Trade(
+        user_id=user.id,
+        symbol=symbol,
+        setup_type="ICT_FVG",
+        entry_price=15000.0,
+        exit_price=15010.0,
+        position_size=1,
+        entry_time=entry_time,
+        exit_time=entry_time + timedelta(minutes=30),
+        outcome=TradeOutcome.WIN,
+        profit_loss=200.0
+    )
+    db.add(trade)
+    db.commit()
+    return trade
+
+class TestTradeDataCache:
+    """Extracted trade data is reused only while the trade is unchanged"""
+    
+    def test_unchanged_trade_is_reused(self, service, test_db, user):
+        """A second load returns the same cached dict"""
+        _add_trade(test_db, user)
+        
+        first = service._load_trade_data(user.id)
+        second = service._load_trade_data(user.id)
+        
+        assert first[0] is second[0]
+    
+    def test_orm_update_in_same_second_is_seen(self, service, test_db, user):
+        """Edits through the ORM drop the entry even if updated_at does not move"""
+        trade = _add_trade(test_db, user)
+        service._load_trade_data(user.id)
+        
+        trade.symbol = "ES"
+        test_db.commit()
+        assert service._load_trade_data(user.id)[0]["symbol"] == "ES"
+        
+        trade.symbol = "YM"
+        test_db.commit()
+        assert service._load_trade_data(user.id)[0]["symbol"] == "YM"
+    
+    def test_reused_id_after_delete_is_not_served_stale(self, service, test_db, user):
+        """A new trade that reuses a deleted trade's id gets its own data"""
+        deleted = _add_trade(test_db, user, symbol="NQ")
+        service._load_trade_data(user.id)
+        
+        deleted_id = deleted.id
+        test_db.delete(deleted)
+        test_db.commit()
+        replacement = _add_trade(test_db, user, symbol="RTY")
+        
+        assert replacement.id == deleted_id
+        assert service._load_trade_data(user.id)[0]["symbol"] == "RTY"
+    
+    def test_update_outside_the_orm_changes_the_version(self, service, test_db, user):
+        """A write that skips ORM events still sets updated_at, so the version differs"""
+        trade = _add_trade(test_db, user)
+        service._load_trade_data(user.id)
+        
+        test_db.execute(update(Trade).where(Trade.id == trade.id).values(symbol="ES"))
+        test_db.commit()
+        
+        assert service._load_trade_data(user.id)[0]["symbol"] == "ES"
+
+class FakeAIClient:
+    """AI client that counts calls and returns fresh responses"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def get_performance_insights(self, trade_data):
+        self.calls += 1
+        return {"overall": {"totalTrades": len(trade_data)}, "strengths": ["discipline"]}
+    
+    async def answer_question(self, question, trade_data, user_id):
+        self.calls += 1
+        return {"answer": f"answer {self.calls}", "confidence": 0.9}
+
+@pytest.fixture
+def ai_client(monkeypatch):
+    """Replace the MCP AI client with a counting fake"""
+    client = FakeAIClient()
+    
+    async def get_fake_client():
+        return client
+    
+    monkeypatch.setattr(tradesage_service, "get_ai_client", get_fake_client)
+    return client
+
+class TestAIResponseCache:
+    """AI responses are reused only for the same trades and question"""
+    
+    def test_insights_are_cached_and_copied(self, service, test_db, user, ai_client):
+        """A repeat call skips the AI client and gets its own copy"""
+        _add_trade(test_db, user, entry_time=datetime.utcnow() - timedelta(days=1))
+        
+        first = asyncio.run(service.get_performance_insights(user.id))
+        first["strengths"].append("mutated by caller")
+        second = asyncio.run(service.get_performance_insights(user.id))
+        
+        assert ai_client.calls == 1
+        assert second["strengths"] == ["discipline"]
+    
+    def test_trade_write_drops_cached_insights(self, service, test_db, user, ai_client):
+        """Editing a trade in the set forces a new AI call"""
+        trade = _add_trade(test_db, user, entry_time=datetime.utcnow() - timedelta(days=1))
+        asyncio.run(service.get_performance_insights(user.id))
+        
+        trade.profit_loss = -50.0
+        test_db.commit()
+        asyncio.run(service.get_performance_insights(user.id))
+        
+        assert ai_client.calls == 2
+    
+    def test_repeated_question_is_cached(self, service, test_db, user, ai_client):
+        """The same question over the same trades is answered once"""
+        _add_trade(test_db, user, entry_time=datetime.utcnow() - timedelta(days=1))
+        
+        asyncio.run(service.answer_trading_question(user.id, "What is my best setup?"))
+        asyncio.run(service.answer_trading_question(user.id, "What is my best setup?"))
+        
+        assert ai_client.calls == 1
+    
+    @pytest.mark.parametrize("question", [
+        "How am I doing today?",
+        "Should I trade right now?",
+        "What happened at 10:30?",
+        "How did 2024-01-02 go?",
+    ])
+    def test_time_sensitive_question_bypasses_cache(self, service, test_db, user, ai_client, question):
+        """Questions about the current time always reach the AI client"""
+        _add_trade(test_db, user, entry_time=datetime.utcnow() - timedelta(days=1))
+        
+        asyncio.run(service.answer_trading_question(user.id, question))
+        asyncio.run(service.answer_trading_question(user.id, question))
+        
+        assert ai_client.calls == 2
+        assert not tradesage_service._ai_response_cache
+
+class TestTradeSetFingerprint:
+    """_trade_set_fingerprint"""
+    
+    def test_changes_with_any_version(self):
+        """Same ids with a different created_at or updated_at give a different digest"""
+        created = datetime(2024, 1, 2, 9, 30)
+        base = [(1, (created, None)), (2, (created, None))]
+        
+        assert tradesage_service._trade_set_fingerprint(base) != tradesage_service._trade_set_fingerprint(
+            [(1, (created, None)), (2, (created + timedelta(seconds=1), None))]
+        )
+        assert tradesage_service._trade_set_fingerprint(base) != tradesage_service._trade_set_fingerprint(
+            [(1, (created, None)), (2, (created, created))]
+        )
+    
+    def test_ignores_order(self):
+        """Trade order does not change the digest"""
+        created = datetime(2024, 1, 2, 9, 30)
+        keys = [(1, (created, None)), (2, (created, None))]
+        
+        assert tradesage_service._trade_set_fingerprint(keys) == tradesage_service._trade_set_fingerprint(keys[::-1])
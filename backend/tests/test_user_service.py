@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test cases for user authentication and its caches
+"""
+
+import bcrypt
+import pytest
+from sqlalchemy import select, update
+
+from backend.models.user import User
+from backend.services import user_service
+from backend.services.user_service import UserService
+from backend.db.schemas import UserCreate, UserUpdate
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    """Start every test with empty module-level login caches"""
+    caches = (
+        user_service._password_verify_cache,
+        user_service._auth_record_cache,
+        user_service._unknown_username_cache,
+    )
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+@pytest.fixture
+def service(test_db):
+    """User service bound to the rolled-back test session"""
+    return UserService(test_db)
+
+def _make_user(service, username="trader", password="correct-horse"):
+    return service.create_user(UserCreate(
+        username=username,
+        email=f"{username}@example.com",
+        password=password
+    ))
+
+@pytest.fixture
+def password_checks(monkeypatch):
+    """Record the hash passed to every password check"""
+    checked = []
+    check_password = user_service._check_password
+    
+    def recording_check(password, hashed_password):
+        checked.append(hashed_password)
+        return check_password(password, hashed_password)
+    
+    monkeypatch.setattr(user_service, "_check_password", recording_check)
+    return checked
+
+class TestAuthenticationTiming:
+    """Wrong passwords and unknown usernames must cost the same"""
+    
+    def test_failed_checks_are_not_cached(self, service):
+        """A wrong password is hashed again on every attempt"""
+        _make_user(service)
+        
+        assert service.authenticate_user("trader", "wrong") is None
+        assert service.authenticate_user("trader", "wrong") is None
+        assert not user_service._password_verify_cache
+    
+    @pytest.mark.parametrize("username", ["trader", "nobody"])
+    def test_every_failure_runs_one_argon2_check(self, service, password_checks, username):
+        """Wrong passwords and unknown usernames each cost exactly one Argon2 verify"""
+        _make_user(service)
+        
+        for attempt in range(1, 4):
+            assert service.authenticate_user(username, "wrong") is None
+            assert len(password_checks) == attempt
+        
+        assert all(hashed.startswith("$argon2") for hashed in password_checks)
+        assert not user_service._password_verify_cache
+
+class TestAuthenticationCaches:
+    """Login record and verification caches"""
+    
+    def test_successful_login_is_cached(self, service):
+        """A second login with the same password skips the hash check"""
+        user = _make_user(service)
+        
+        assert service.authenticate_user("trader", "correct-horse").id == user.id
+        assert user_service._get_cached_auth_record("trader")[0] == user.id
+        assert len(user_service._password_verify_cache) == 1
+        
+        assert service.authenticate_user("trader", "correct-horse").id == user.id
+    
+    def test_unknown_username_is_cached_until_created(self, service):
+        """Creating a user clears the unknown-username marker"""
+        assert service.authenticate_user("newcomer", "pw") is None
+        assert user_service._is_cached_unknown_username("newcomer")
+        
+        _make_user(service, username="newcomer", password="pw")
+        
+        assert not user_service._is_cached_unknown_username("newcomer")
+        assert service.authenticate_user("newcomer", "pw") is not None
+    
+    def test_password_change_through_service_clears_caches(self, service):
+        """The old password stops working as soon as it is changed"""
+        user = _make_user(service)
+        assert service.authenticate_user("trader", "correct-horse") is not None
+        
+        service.update_user(user.id, UserUpdate(password="new-password"))
+        
+        assert service.authenticate_user("trader", "correct-horse") is None
+        assert service.authenticate_user("trader", "new-password") is not None
+    
+    def test_password_changed_elsewhere_is_accepted(self, service, test_db):
+        """A hash changed behind the cache is re-read when the check fails"""
+        user = _make_user(service)
+        assert service.authenticate_user("trader", "correct-horse") is not None
+        
+        # Another process changes the password without touching this process's caches
+        test_db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(hashed_password=user_service._new_password_hash("new-password"))
+        )
+        test_db.commit()
+        
+        assert service.authenticate_user("trader", "new-password") is not None
+        assert service.authenticate_user("trader", "correct-horse") is None
+
+class TestPasswordUpgrade:
+    """Outdated hashes are replaced on login"""
+    
+    def test_bcrypt_hash_is_rehashed_with_argon2(self, service, test_db):
+        """A bcrypt user can log in and is moved to Argon2id"""
+        user = _make_user(service)
+        legacy_hash = bcrypt.hashpw(b"correct-horse", bcrypt.gensalt(rounds=4)).decode()
+        test_db.execute(update(User).where(User.id == user.id).values(hashed_password=legacy_hash))
+        test_db.commit()
+        
+        assert service.authenticate_user("trader", "correct-horse") is not None
+        
+        stored = test_db.scalar(select(User.hashed_password).where(User.id == user.id))
+        assert stored.startswith("$argon2id")
+        assert service.authenticate_user("trader", "correct-horse") is not None
+    
+    def test_wrong_password_does_not_rehash(self, service, test_db):
+        """A failed login leaves the stored hash alone"""
+        user = _make_user(service)
+        legacy_hash = bcrypt.hashpw(b"correct-horse", bcrypt.gensalt(rounds=4)).decode()
+        test_db.execute(update(User).where(User.id == user.id).values(hashed_password=legacy_hash))
+        test_db.commit()
+        
+        assert service.authenticate_user("trader", "wrong") is None
+        assert test_db.scalar(select(User.hashed_password).where(User.id == user.id)) == legacy_hash
+
+class TestBulkCreation:
+    """create_users_bulk"""
+    
+    def test_creates_users_in_order(self, service):
+        """Returned IDs follow input order and every password works"""
+        users = [
+            UserCreate(username=f"bulk_{i}", email=f"bulk_{i}@example.com", password=f"pw-{i}")
+            for i in range(3)
+        ]
+        
+        ids = service.create_users_bulk(users)
+        
+        assert [service.get_user(user_id).username for user_id in ids] == ["bulk_0", "bulk_1", "bulk_2"]
+        for i in range(3):
+            assert service.authenticate_user(f"bulk_{i}", f"pw-{i}").id == ids[i]
+    
+    def test_uses_distinct_salts(self, service):
+        """Equal passwords still get different hashes"""
+        ids = service.create_users_bulk([
+            UserCreate(username="twin_a", email="twin_a@example.com", password="same"),
+            UserCreate(username="twin_b", email="twin_b@example.com", password="same"),
+        ])
+        
+        hashes = {service.get_user(user_id).hashed_password for user_id in ids}
+        assert len(hashes) == 2
+    
+    def test_rejects_duplicates_in_batch(self, service, test_db):
+        """Repeated usernames within one batch raise before anything is written"""
+        users = [
+            UserCreate(username="dup", email="dup1@example.com", password="pw"),
+            UserCreate(username="dup", email="dup2@example.com", password="pw"),
+        ]
+        
+        with pytest.raises(ValueError):
+            service.create_users_bulk(users)
+        assert test_db.scalar(select(User).where(User.username == "dup")) is None
+    
+    def test_rejects_existing_users(self, service):
+        """Usernames already in the database raise"""
+        _make_user(service)
+        
+        with pytest.raises(ValueError):
+            service.create_users_bulk([
+                UserCreate(username="trader", email="other@example.com", password="pw")
+            ])
+    
+    def test_empty_batch(self, service):
+        """An empty batch creates nothing"""
+        assert service.create_users_bulk([]) == []
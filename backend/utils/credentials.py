@@ -3,29 +3,39 @@ Sample module showing how to use environment variables for sensitive data
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+@lru_cache(maxsize=1)
 def get_google_api_credentials():
     """
     Get Google API credentials from environment variables
+    
+    The result is read once and returned as a read-only mapping; call
+    get_google_api_credentials.cache_clear() after changing the environment.
     """
     api_key = os.getenv('GOOGLE_API_KEY')
     
     if not api_key:
         raise EnvironmentError("GOOGLE_API_KEY environment variable is not set")
     
-    return {
+    return MappingProxyType({
         'api_key': api_key
-    }
+    })
 
+@lru_cache(maxsize=1)
 def get_firebase_credentials():
     """
     Get Firebase credentials from environment variables
+    
+    The result is read once and returned as a read-only mapping; call
+    get_firebase_credentials.cache_clear() after changing the environment.
     """
-    return {
+    return MappingProxyType({
         'api_key': os.getenv('FIREBASE_API_KEY'),
         'auth_domain': os.getenv('FIREBASE_AUTH_DOMAIN'),
         'project_id': os.getenv('FIREBASE_PROJECT_ID'),
@@ -33,7 +43,7 @@ def get_firebase_credentials():
         'messaging_sender_id': os.getenv('FIREBASE_MESSAGING_SENDER_ID'),
         'app_id': os.getenv('FIREBASE_APP_ID'),
         'measurement_id': os.getenv('FIREBASE_MEASUREMENT_ID')
-    }
+    })
 
 # Example usage
 if __name__ == "__main__":
@@ -1,7 +1,22 @@
 
+import sys
+import threading
 from datetime import datetime
 from typing import Optional, Union, Any
 
+# Python 3.11+ fromisoformat accepts a trailing 'Z'
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+)
+
+# Last strptime format that matched on this thread, tried first next time
+_last_format = threading.local()
+
 def parse_date_string(date_string):
     if isinstance(date_string, datetime):
         return date_string
@@ -10,24 +25,28 @@ def parse_date_string(date_string):
         return None
         
     try:
-        if date_string.endswith('Z'):
+        if not _FROMISOFORMAT_ACCEPTS_Z and date_string.endswith('Z'):
             date_string = date_string[:-1] + '+00:00'
         
         return datetime.fromisoformat(date_string)
     except ValueError:
         pass
     
-    formats = [
-        '%Y-%m-%dT%H:%M:%S.%f',
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d',
-    ]
+    last_fmt = getattr(_last_format, 'fmt', None)
+    if last_fmt is not None:
+        try:
+            return datetime.strptime(date_string, last_fmt)
+        except ValueError:
+            pass
     
-    for fmt in formats:
+    for fmt in _FORMATS:
+        if fmt == last_fmt:
+            continue
         try:
-            return datetime.strptime(date_string, fmt)
+            parsed = datetime.strptime(date_string, fmt)
         except ValueError:
             continue
+        _last_format.fmt = fmt
+        return parsed
     
     return None
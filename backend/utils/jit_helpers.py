@@ -0,0 +1,29 @@
+# File: backend/utils/jit_helpers.py
+# Purpose: Optional Numba JIT decorators for numeric kernels
+
+# Services import njit and prange from here instead of from numba, so numba
+# stays an optional dependency. When it is installed the real decorators are
+# re-exported. When it is not, njit returns the function unchanged (both as
+# @njit and @njit(cache=True, ...)) and prange is plain range, so the same
+# kernels run as ordinary Python. NUMBA_AVAILABLE tells callers which one
+# they got, e.g. to use a compiled kernel only when it is really compiled.
+
+from typing import Any, Callable
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args: Any, **kwargs: Any) -> Callable:
+        """
+        No-op stand-in for numba.njit
+
+        Supports both bare @njit and @njit(...) with options; the options are
+        ignored and the decorated function is returned as-is.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
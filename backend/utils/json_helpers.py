@@ -1,33 +1,116 @@
 
 import json
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 
-def ensure_json_serializable(value):
-    if value is None:
-        return value
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_JSON_PRIMITIVES = (str, int, float, bool, type(None))
+
+# Exact types checked with one set lookup before falling back to isinstance
+_JSON_PRIMITIVE_TYPES = frozenset(_JSON_PRIMITIVES)
+
+def _is_primitive(value):
+    return type(value) in _JSON_PRIMITIVE_TYPES or isinstance(value, _JSON_PRIMITIVES)
+
+def _is_pure_json(value):
+    # True when value is already made only of JSON primitives, lists and str-keyed dicts
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        
+        if _is_primitive(item):
+            continue
+        
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            for key in item:
+                if not isinstance(key, str):
+                    return False
+            stack.extend(item.values())
+        else:
+            return False
     
-    if isinstance(value, (str, int, float, bool)):
+    return True
+
+def ensure_json_serializable(value):
+    # Already JSON-safe values are returned as-is instead of rebuilt
+    if _is_pure_json(value):
         return value
     
-    if isinstance(value, (list, tuple)):
-        return [ensure_json_serializable(item) for item in value]
-    
-    if isinstance(value, dict):
-        return {key: ensure_json_serializable(val) for key, val in value.items()}
+    return _rebuild_json_safe(value)
+
+def _rebuild_json_safe(value):
+    # Iterative walk, so nesting depth is not limited by the recursion limit.
+    # Containers are copied in C with list()/dict(), which keeps primitive
+    # children in place; only the other children are revisited and replaced.
+    root = [None]
+    stack = [(value, root, 0)]
+    while stack:
+        item, parent, key = stack.pop()
+        
+        if _is_primitive(item):
+            parent[key] = item
+        elif isinstance(item, (list, tuple)):
+            rebuilt = list(item)
+            parent[key] = rebuilt
+            stack.extend(
+                (child, rebuilt, index) for index, child in enumerate(rebuilt) if not _is_primitive(child)
+            )
+        elif isinstance(item, dict):
+            rebuilt = dict(item)
+            parent[key] = rebuilt
+            stack.extend(
+                (child, rebuilt, child_key) for child_key, child in rebuilt.items() if not _is_primitive(child)
+            )
+        else:
+            parent[key] = str(item)
     
-    return str(value)
+    return root[0]
+
+# First characters a JSON document can start with
+_JSON_START_CHARS = frozenset('{["-0123456789tfn')
+
+# Returned by _parse_json_string for strings that are not valid JSON
+_INVALID_JSON = object()
+
+@lru_cache(maxsize=4096)
+def _parse_json_string(text):
+    # Parsed values are shared between callers with the same string; process_json_field
+    # copies containers before returning them
+    try:
+        return _json_loads(text)
+    except ValueError:
+        return _INVALID_JSON
 
 def process_json_field(field_value):
     if field_value is None:
         return None
     
     if isinstance(field_value, (list, dict)):
-        return ensure_json_serializable(field_value)
+        # Lists and dicts from the ORM or Pydantic are usually already clean
+        if _is_pure_json(field_value):
+            return field_value
+        return _rebuild_json_safe(field_value)
     
     if isinstance(field_value, str):
-        try:
-            return json.loads(field_value)
-        except json.JSONDecodeError:
+        # Plain text can't be JSON unless it starts like a JSON value; skip the parse
+        stripped = field_value.lstrip()
+        if not stripped or stripped[0] not in _JSON_START_CHARS:
+            return [field_value]
+        
+        parsed = _parse_json_string(field_value)
+        if parsed is _INVALID_JSON:
             return [field_value]
+        if isinstance(parsed, (list, dict)):
+            # Callers assign the result to ORM attributes and may mutate it, so hand
+            # out a fresh copy (nested containers included) rather than the cached one
+            return _rebuild_json_safe(parsed)
+        return parsed
     
     return [str(field_value)]
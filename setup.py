@@ -2,35 +2,37 @@
 # Purpose: Setup script for initializing the Trading Journal application
 
 import os
+import re
 import sys
 import subprocess
 import argparse
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Minimum supported Python and Node.js versions
+MIN_PYTHON_VERSION = (3, 9)
+MIN_NODE_MAJOR_VERSION = 20
 
 def check_python_version():
     """Check if Python version is 3.9 or higher"""
-    required_major = 3
-    required_minor = 9
-    
-    current_major = sys.version_info.major
-    current_minor = sys.version_info.minor
-    
-    if current_major < required_major or (current_major == required_major and current_minor < required_minor):
-        print(f"Error: Python {required_major}.{required_minor} or higher is required")
-        print(f"Current Python version: {current_major}.{current_minor}")
+    if sys.version_info[:2] < MIN_PYTHON_VERSION:
+        print(f"Error: Python {MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher is required")
+        print(f"Current Python version: {sys.version_info.major}.{sys.version_info.minor}")
         sys.exit(1)
 
+def parse_major_version(version):
+    """Get the major version from strings like 'v20.11.1' or '20.0.0-rc.1', or None"""
+    match = re.match(r"v?(\d+)", version.strip())
+    return int(match.group(1)) if match else None
+
 def check_node_version():
     """Check if Node.js is installed and version is 20 or higher"""
     try:
         node_version = subprocess.check_output(["node", "--version"]).decode("utf-8").strip()
-        # Remove 'v' prefix and split by '.'
-        version_parts = node_version[1:].split('.')
-        
-        major_version = int(version_parts[0])
+        major_version = parse_major_version(node_version)
         
-        if major_version < 20:
-            print(f"Error: Node.js 20 or higher is required")
+        if major_version is None or major_version < MIN_NODE_MAJOR_VERSION:
+            print(f"Error: Node.js {MIN_NODE_MAJOR_VERSION} or higher is required")
             print(f"Current Node.js version: {node_version}")
             sys.exit(1)
         
@@ -39,46 +41,104 @@ def check_node_version():
         print("Error: Node.js is not installed or not in PATH")
         sys.exit(1)
 
+# Virtual environment location, absolute so it does not depend on the working directory
+VENV_DIR = os.path.abspath("venv")
+VENV_PYTHON = os.path.join(VENV_DIR, "Scripts" if os.name == "nt" else "bin", "python")
+
+def get_python_executable():
+    """Get the virtual environment's Python, or the current one when there is no venv"""
+    return VENV_PYTHON if os.path.isdir(VENV_DIR) else sys.executable
+
 def create_virtual_env():
     """Create Python virtual environment"""
-    if os.path.exists("venv"):
+    if os.path.isdir(VENV_DIR):
         print("Virtual environment already exists")
         return
     
     print("Creating virtual environment...")
-    subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+    subprocess.run([sys.executable, "-m", "venv", VENV_DIR], check=True)
     print("Virtual environment created successfully")
 
+# pip's HTTP/wheel cache and the pre-downloaded wheels used by the fallback install
+PIP_CACHE_DIR = ".pipcache"
+WHEEL_CACHE_DIR = ".wheelcache"
+
+# Environment for pip runs: skip the self-update check and never prompt
+PIP_ENV = {**os.environ, "PIP_DISABLE_PIP_VERSION_CHECK": "1", "PIP_NO_INPUT": "1"}
+
+def read_requirement_groups(path):
+    """
+    Read a requirements file as (section name, requirements) groups
+    
+    A comment line after a blank line starts a new section, e.g. "# Security".
+    """
+    groups = []
+    name = "other"
+    requirements = []
+    previous_blank = True
+    
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            
+            if line.startswith("#"):
+                if previous_blank:
+                    if requirements:
+                        groups.append((name, requirements))
+                    name = line.lstrip("#").strip()
+                    requirements = []
+            elif line:
+                requirements.append(line)
+            
+            previous_blank = not line
+    
+    if requirements:
+        groups.append((name, requirements))
+    
+    return groups
+
 def install_backend_dependencies():
     """Install backend dependencies"""
     print("Installing backend dependencies...")
     
-    # Determine the correct pip executable
-    pip_executable = os.path.join("venv", "bin", "pip") if os.name != "nt" else os.path.join("venv", "Scripts", "pip")
+    # Run pip through the target interpreter, which also lets pip upgrade itself on Windows
+    pip_command = [get_python_executable(), "-m", "pip"]
     
     try:
         # First, upgrade pip
-        subprocess.run([pip_executable, "install", "--upgrade", "pip"], check=True)
+        subprocess.run([*pip_command, "install", "--upgrade", "pip"], check=True, env=PIP_ENV)
         
-        # Try to install dependencies with binary preference
-        print("Attempting to install dependencies with binary preference...")
-        subprocess.run([pip_executable, "install", "--prefer-binary", "-r", "requirements.txt"], check=True)
+        # Try to install dependencies from wheels only, so nothing is compiled
+        print("Attempting to install dependencies from binary wheels...")
+        subprocess.run([*pip_command, "install", "--only-binary=:all:", "--cache-dir", PIP_CACHE_DIR,
+                        "-r", "requirements.txt"], check=True, env=PIP_ENV)
         
     except subprocess.CalledProcessError:
         print("\nStandard installation failed. Trying alternative installation method...\n")
         
-        # Try installing packages one by one
-        with open("requirements.txt", "r") as f:
-            requirements = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        # Fetch every available wheel once, so the retries below install
+        # them from disk and only fall back to building the rest from source
+        subprocess.run([*pip_command, "download", "--only-binary=:all:", "--cache-dir", PIP_CACHE_DIR,
+                        "-d", WHEEL_CACHE_DIR, "-r", "requirements.txt"], env=PIP_ENV)
+        fallback_install = [*pip_command, "install", "--prefer-binary", "--cache-dir", PIP_CACHE_DIR,
+                            "--find-links", WHEEL_CACHE_DIR]
         
-        # Install each package separately
-        for req in requirements:
-            try:
-                print(f"Installing {req}...")
-                subprocess.run([pip_executable, "install", "--prefer-binary", req], check=True)
-            except subprocess.CalledProcessError as e:
-                print(f"Warning: Failed to install {req}. Error: {e}")
-                print(f"Continuing with other packages...")
+        # Install each requirements.txt section in one pip call, so a bad pin
+        # only sends its own section to the package-by-package fallback
+        for group_name, requirements in read_requirement_groups("requirements.txt"):
+            print(f"Installing {group_name} packages...")
+            result = subprocess.run([*fallback_install, *requirements], env=PIP_ENV)
+            if result.returncode == 0:
+                continue
+            
+            print(f"Warning: Failed to install {group_name} packages together. Installing them one by one...")
+            for req in requirements:
+                try:
+                    print(f"Installing {req}...")
+                    subprocess.run([*fallback_install, req], check=True, env=PIP_ENV)
+                except subprocess.CalledProcessError as e:
+                    print(f"Warning: Failed to install {req}. Error: {e}")
+                    print(f"Continuing with other packages...")
     
     print("Backend dependencies installation completed")
     print("Note: If some packages failed to install, you may need to install them manually.")
@@ -88,26 +148,14 @@ def install_frontend_dependencies():
     """Install frontend dependencies"""
     print("Installing frontend dependencies...")
     
-    # Change to frontend directory
-    os.chdir("frontend")
-    
-    # Install dependencies
-    subprocess.run(["npm", "install"], check=True)
-    
-    # Change back to root directory
-    os.chdir("..")
+    # Install dependencies in the frontend directory; cwd is passed instead
+    # of changing directory so this can run alongside the backend install
+    subprocess.run(["npm", "install"], check=True, cwd="frontend")
     
     print("Frontend dependencies installed successfully")
 
-def initialize_database():
-    """Initialize database"""
-    print("Initializing database...")
-    
-    # Determine the correct python executable
-    python_executable = os.path.join("venv", "bin", "python") if os.name != "nt" else os.path.join("venv", "Scripts", "python")
-    
-    # Run database initialization script
-    db_init_script = """
+# Database initialization code run inside the virtual environment
+DB_INIT_SCRIPT = """
 import sys
 import os
 
@@ -122,22 +170,18 @@ initialize_db()
 
 print("Database initialized successfully")
 """
+
+def initialize_database():
+    """Initialize database"""
+    print("Initializing database...")
     
-    with open("init_db.py", "w") as f:
-        f.write(db_init_script)
-    
-    # Run initialization script
-    subprocess.run([python_executable, "init_db.py"], check=True)
+    python_executable = get_python_executable()
     
-    # Remove temporary script
-    os.remove("init_db.py")
+    # Run database initialization in the venv interpreter, passed inline
+    subprocess.run([python_executable, "-c", DB_INIT_SCRIPT], check=True)
 
-def create_env_files():
-    """Create environment files"""
-    print("Creating environment files...")
-    
-    # Backend .env file
-    backend_env = """# Backend environment variables
+# Backend .env file
+BACKEND_ENV = """# Backend environment variables
 DATABASE_URL=sqlite:///./tradingjournalapp.db
 SECRET_KEY=supersecretkey_change_this_in_production
 ALGORITHM=HS256
@@ -167,29 +211,15 @@ MCP_ALERT_SERVER_PORT=5005
 MCP_SENTIMENT_ANALYSIS_SERVER_HOST=localhost
 MCP_SENTIMENT_ANALYSIS_SERVER_PORT=5006
 """
-    
-    # Frontend .env file
-    frontend_env = """# Frontend environment variables
+
+# Frontend .env file
+FRONTEND_ENV = """# Frontend environment variables
 REACT_APP_API_URL=http://localhost:8000
 REACT_APP_MCP_API_URL=http://localhost:5000
 """
-    
-    # Create backend .env file
-    with open(os.path.join("backend", ".env"), "w") as f:
-        f.write(backend_env)
-    
-    # Create frontend .env file
-    with open(os.path.join("frontend", ".env"), "w") as f:
-        f.write(frontend_env)
-    
-    print("Environment files created successfully")
 
-def create_start_scripts():
-    """Create start scripts"""
-    print("Creating start scripts...")
-    
-    # Backend start script
-    backend_start = """#!/bin/bash
+# Backend start script
+BACKEND_START = """#!/bin/bash
 # Activate virtual environment
 if [ -d "venv" ]; then
     source venv/bin/activate
@@ -199,31 +229,16 @@ fi
 cd backend
 uvicorn api.main:app --reload --host 0.0.0.0 --port 8000
 """
-    
-    # Frontend start script
-    frontend_start = """#!/bin/bash
+
+# Frontend start script
+FRONTEND_START = """#!/bin/bash
 # Start frontend server
 cd frontend
 npm start
 """
-    
-    # Create backend start script
-    with open("start_backend.sh", "w") as f:
-        f.write(backend_start)
-    
-    # Create frontend start script
-    with open("start_frontend.sh", "w") as f:
-        f.write(frontend_start)
-    
-    # Make scripts executable
-    if os.name != "nt":
-        os.chmod("start_backend.sh", 0o755)
-        os.chmod("start_frontend.sh", 0o755)
-    
-    # Create Windows batch files
-    if os.name == "nt":
-        # Backend batch file
-        backend_batch = """@echo off
+
+# Backend batch file
+BACKEND_BATCH = """@echo off
 :: Activate virtual environment
 call venv\\Scripts\\activate
 
@@ -231,21 +246,44 @@ call venv\\Scripts\\activate
 cd backend
 uvicorn api.main:app --reload --host 0.0.0.0 --port 8000
 """
-        
-        # Frontend batch file
-        frontend_batch = """@echo off
+
+# Frontend batch file
+FRONTEND_BATCH = """@echo off
 :: Start frontend server
 cd frontend
 npm start
 """
-        
-        # Create backend batch file
-        with open("start_backend.bat", "w") as f:
-            f.write(backend_batch)
-        
-        # Create frontend batch file
-        with open("start_frontend.bat", "w") as f:
-            f.write(frontend_batch)
+
+def write_file(path, content):
+    """Write a generated file in one call"""
+    with open(path, "w") as f:
+        f.write(content)
+
+def create_env_files():
+    """Create environment files"""
+    print("Creating environment files...")
+    
+    write_file(os.path.join("backend", ".env"), BACKEND_ENV)
+    write_file(os.path.join("frontend", ".env"), FRONTEND_ENV)
+    
+    print("Environment files created successfully")
+
+def create_start_scripts():
+    """Create start scripts"""
+    print("Creating start scripts...")
+    
+    write_file("start_backend.sh", BACKEND_START)
+    write_file("start_frontend.sh", FRONTEND_START)
+    
+    # Make scripts executable
+    if os.name != "nt":
+        os.chmod("start_backend.sh", 0o755)
+        os.chmod("start_frontend.sh", 0o755)
+    
+    # Create Windows batch files
+    if os.name == "nt":
+        write_file("start_backend.bat", BACKEND_BATCH)
+        write_file("start_frontend.bat", FRONTEND_BATCH)
     
     print("Start scripts created successfully")
 
@@ -255,6 +293,8 @@ def main():
     parser.add_argument("--no-venv", action="store_true", help="Skip virtual environment creation")
     parser.add_argument("--backend-only", action="store_true", help="Setup backend only")
     parser.add_argument("--frontend-only", action="store_true", help="Setup frontend only")
+    parser.add_argument("--no-parallel", dest="parallel", action="store_false",
+                        help="Install backend and frontend dependencies one after the other")
     
     args = parser.parse_args()
     
@@ -263,8 +303,11 @@ def main():
     # Check Python version
     check_python_version()
     
-    # Setup backend
-    if not args.frontend_only:
+    # Check Node.js version before starting any installs
+    if not args.backend_only:
+        check_node_version()
+    
+    def setup_backend():
         # Create virtual environment
         if not args.no_venv:
             create_virtual_env()
@@ -275,13 +318,21 @@ def main():
         # Initialize database
         initialize_database()
     
-    # Setup frontend
+    steps = []
+    if not args.frontend_only:
+        steps.append(setup_backend)
     if not args.backend_only:
-        # Check Node.js version
-        check_node_version()
-        
-        # Install frontend dependencies
-        install_frontend_dependencies()
+        steps.append(install_frontend_dependencies)
+    
+    if args.parallel and len(steps) > 1:
+        # pip and npm install into separate trees, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            futures = [executor.submit(step) for step in steps]
+            for future in futures:
+                future.result()
+    else:
+        for step in steps:
+            step()
     
     # Create environment files
     create_env_files()
@@ -6,14 +6,38 @@ Uses factory_boy to generate realistic test data
 
 import factory
 import factory.fuzzy
+from faker import Faker
 from datetime import datetime, timedelta, time
-from decimal import Decimal
 import random
-from typing import List, Dict, Any
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+
+import numpy as np
 
 # Import models (adjust imports based on your actual models)
 # from backend.models import Trade, DailyPlan, JournalEntry, User
 
+# Shared generator for values built inside LazyFunction bodies
+_FAKER = Faker()
+_FAKER.seed_instance(0)
+
+
+def _choice(options):
+    """Declaration drawing one of ``options`` per record without a fuzzer object"""
+    options = tuple(options)
+    return factory.LazyFunction(lambda: random.choice(options))
+
+
+def _recent_trading_days(days: int = 182) -> tuple:
+    """Weekdays from ``days`` ago through today as ``date`` objects"""
+    today = np.datetime64(datetime.now().date())
+    calendar = np.arange(today - days, today + 1)
+    return tuple(calendar[np.is_busday(calendar)].tolist())
+
+
+# Computed once at import so factories pick dates without parsing offsets
+_RECENT_TRADING_DAYS = _recent_trading_days()
+
 
 class UserFactory(factory.Factory):
     """Factory for creating test users"""
@@ -26,12 +50,12 @@ class UserFactory(factory.Factory):
     email = factory.LazyAttribute(lambda obj: f"{obj.username}@example.com")
     first_name = factory.Faker('first_name')
     last_name = factory.Faker('last_name')
-    trading_style = factory.fuzzy.FuzzyChoice(['day_trader', 'swing_trader', 'scalper'])
-    experience_level = factory.fuzzy.FuzzyChoice(['beginner', 'intermediate', 'advanced', 'expert'])
+    trading_style = _choice(['day_trader', 'swing_trader', 'scalper'])
+    experience_level = _choice(['beginner', 'intermediate', 'advanced', 'expert'])
     preferred_instruments = factory.LazyFunction(
         lambda: random.sample(['NQ', 'ES', 'YM', 'RTY', 'CL', 'GC'], k=random.randint(1, 3))
     )
-    risk_tolerance = factory.fuzzy.FuzzyChoice(['conservative', 'moderate', 'aggressive'])
+    risk_tolerance = _choice(['conservative', 'moderate', 'aggressive'])
     created_at = factory.Faker('date_time_between', start_date='-1y', end_date='now')
     is_active = True
 
@@ -43,23 +67,23 @@ class TradeFactory(factory.Factory):
         model = dict  # Replace with actual Trade model
     
     id = factory.Sequence(lambda n: n)
-    user_id = factory.SubFactory(UserFactory)
+    user_id = factory.Sequence(lambda n: n)
     
     # Basic trade information
-    symbol = factory.fuzzy.FuzzyChoice(['NQ', 'ES', 'YM', 'RTY'])
-    setup_type = factory.fuzzy.FuzzyChoice([
+    symbol = _choice(['NQ', 'ES', 'YM', 'RTY'])
+    setup_type = _choice([
         'MMXM_Breaker', 'MMXM_Mitigation', 'MMXM_Displacement',
         'ICT_FVG', 'ICT_OB', 'ICT_MSS', 'ICT_BOS',
         'Supply_Zone', 'Demand_Zone', 'Liquidity_Grab'
     ])
     
     # Price and position data
-    entry_price = factory.fuzzy.FuzzyDecimal(14500.0, 15500.0, 2)
-    exit_price = factory.LazyAttribute(lambda obj: obj.entry_price + random.uniform(-50, 50))
+    entry_price = factory.LazyFunction(lambda: round(random.uniform(14500.0, 15500.0), 2))
+    exit_price = factory.LazyAttribute(lambda obj: round(obj.entry_price + random.uniform(-50, 50), 2))
     position_size = factory.fuzzy.FuzzyInteger(1, 5)
     
     # Timing
-    trade_date = factory.Faker('date_between', start_date='-6m', end_date='today')
+    trade_date = factory.LazyFunction(lambda: random.choice(_RECENT_TRADING_DAYS))
     entry_time = factory.LazyAttribute(lambda obj: 
         datetime.combine(obj.trade_date, time(
             hour=random.randint(9, 15),
@@ -84,13 +108,13 @@ class TradeFactory(factory.Factory):
     )
     
     # Trading psychology
-    emotional_state = factory.fuzzy.FuzzyChoice([
+    emotional_state = _choice([
         'confident', 'nervous', 'calm', 'excited', 'frustrated', 'focused', 'impatient'
     ])
     plan_adherence = factory.fuzzy.FuzzyInteger(1, 10)
     
     # Additional data
-    market_conditions = factory.fuzzy.FuzzyChoice([
+    market_conditions = _choice([
         'trending_up', 'trending_down', 'ranging', 'volatile', 'low_volume'
     ])
     notes = factory.Faker('text', max_nb_chars=200)
@@ -111,28 +135,28 @@ class TradeFactory(factory.Factory):
 class WinningTradeFactory(TradeFactory):
     """Factory for creating winning trades"""
     
-    exit_price = factory.LazyAttribute(lambda obj: obj.entry_price + random.uniform(10, 50))
+    exit_price = factory.LazyAttribute(lambda obj: round(obj.entry_price + random.uniform(10, 50), 2))
     outcome = 'win'
-    emotional_state = factory.fuzzy.FuzzyChoice(['confident', 'calm', 'focused', 'excited'])
+    emotional_state = _choice(['confident', 'calm', 'focused', 'excited'])
     plan_adherence = factory.fuzzy.FuzzyInteger(7, 10)
 
 
 class LosingTradeFactory(TradeFactory):
     """Factory for creating losing trades"""
     
-    exit_price = factory.LazyAttribute(lambda obj: obj.entry_price - random.uniform(10, 30))
+    exit_price = factory.LazyAttribute(lambda obj: round(obj.entry_price - random.uniform(10, 30), 2))
     outcome = 'loss'
-    emotional_state = factory.fuzzy.FuzzyChoice(['frustrated', 'nervous', 'impatient'])
+    emotional_state = _choice(['frustrated', 'nervous', 'impatient'])
     plan_adherence = factory.fuzzy.FuzzyInteger(3, 8)
 
 
 class BreakevenTradeFactory(TradeFactory):
     """Factory for creating breakeven trades"""
     
-    exit_price = factory.LazyAttribute(lambda obj: obj.entry_price + random.uniform(-2, 2))
+    exit_price = factory.LazyAttribute(lambda obj: round(obj.entry_price + random.uniform(-2, 2), 2))
     outcome = 'breakeven'
     profit_loss = factory.LazyAttribute(lambda obj: random.uniform(-5, 5))
-    emotional_state = factory.fuzzy.FuzzyChoice(['calm', 'neutral', 'focused'])
+    emotional_state = _choice(['calm', 'neutral', 'focused'])
 
 
 class DailyPlanFactory(factory.Factory):
@@ -142,12 +166,12 @@ class DailyPlanFactory(factory.Factory):
         model = dict  # Replace with actual DailyPlan model
     
     id = factory.Sequence(lambda n: n)
-    user_id = factory.SubFactory(UserFactory)
+    user_id = factory.Sequence(lambda n: n)
     
-    date = factory.Faker('date_between', start_date='-6m', end_date='today')
+    date = factory.LazyFunction(lambda: random.choice(_RECENT_TRADING_DAYS))
     
     # Market analysis
-    market_bias = factory.fuzzy.FuzzyChoice(['bullish', 'bearish', 'neutral'])
+    market_bias = _choice(['bullish', 'bearish', 'neutral'])
     key_levels = factory.LazyFunction(lambda: sorted([
         round(15000 + random.uniform(-100, 100), 2) for _ in range(random.randint(3, 6))
     ]))
@@ -167,12 +191,12 @@ class DailyPlanFactory(factory.Factory):
     })
     
     # Mental preparation
-    mental_state = factory.fuzzy.FuzzyChoice(['focused', 'confident', 'calm', 'energized', 'cautious'])
+    mental_state = _choice(['focused', 'confident', 'calm', 'energized', 'cautious'])
     market_expectations = factory.Faker('text', max_nb_chars=150)
     
     # Notes and observations
     notes = factory.Faker('text', max_nb_chars=300)
-    weather = factory.fuzzy.FuzzyChoice(['sunny', 'cloudy', 'rainy', 'clear'])
+    weather = _choice(['sunny', 'cloudy', 'rainy', 'clear'])
     sleep_quality = factory.fuzzy.FuzzyInteger(1, 10)
     
     created_at = factory.LazyAttribute(lambda obj: 
@@ -188,10 +212,10 @@ class JournalEntryFactory(factory.Factory):
         model = dict  # Replace with actual JournalEntry model
     
     id = factory.Sequence(lambda n: n)
-    user_id = factory.SubFactory(UserFactory)
+    user_id = factory.Sequence(lambda n: n)
     
-    date = factory.Faker('date_between', start_date='-6m', end_date='today')
-    entry_type = factory.fuzzy.FuzzyChoice(['daily_review', 'trade_reflection', 'lesson_learned', 'goal_setting'])
+    date = factory.LazyFunction(lambda: random.choice(_RECENT_TRADING_DAYS))
+    entry_type = _choice(['daily_review', 'trade_reflection', 'lesson_learned', 'goal_setting'])
     
     # Content
     title = factory.Faker('sentence', nb_words=5)
@@ -204,10 +228,10 @@ class JournalEntryFactory(factory.Factory):
     
     # Insights and lessons
     insights = factory.LazyFunction(lambda: [
-        factory.Faker('sentence', nb_words=6).generate() for _ in range(random.randint(1, 3))
+        _FAKER.sentence(nb_words=6) for _ in range(random.randint(1, 3))
     ])
     lessons_learned = factory.LazyFunction(lambda: [
-        factory.Faker('sentence', nb_words=8).generate() for _ in range(random.randint(0, 2))
+        _FAKER.sentence(nb_words=8) for _ in range(random.randint(0, 2))
     ])
     
     # Tags and categorization
@@ -237,11 +261,11 @@ class MarketDataFactory(factory.Factory):
     timestamp = factory.Faker('date_time_between', start_date='-1d', end_date='now')
     
     # Price data
-    open_price = factory.fuzzy.FuzzyDecimal(14800.0, 15200.0, 2)
-    high_price = factory.LazyAttribute(lambda obj: obj.open_price + random.uniform(0, 50))
-    low_price = factory.LazyAttribute(lambda obj: obj.open_price - random.uniform(0, 50))
+    open_price = factory.LazyFunction(lambda: round(random.uniform(14800.0, 15200.0), 2))
+    high_price = factory.LazyAttribute(lambda obj: round(obj.open_price + random.uniform(0, 50), 2))
+    low_price = factory.LazyAttribute(lambda obj: round(obj.open_price - random.uniform(0, 50), 2))
     close_price = factory.LazyAttribute(lambda obj: 
-        obj.open_price + random.uniform(-25, 25)
+        round(obj.open_price + random.uniform(-25, 25), 2)
     )
     
     # Volume and activity
@@ -262,10 +286,10 @@ class AlertFactory(factory.Factory):
         model = dict
     
     id = factory.Sequence(lambda n: n)
-    user_id = factory.SubFactory(UserFactory)
+    user_id = factory.Sequence(lambda n: n)
     
     name = factory.Faker('sentence', nb_words=4)
-    alert_type = factory.fuzzy.FuzzyChoice([
+    alert_type = _choice([
         'price_target', 'risk_management', 'performance_milestone', 
         'trading_pattern', 'market_condition'
     ])
@@ -280,7 +304,7 @@ class AlertFactory(factory.Factory):
     # Actions
     action = factory.LazyFunction(lambda: {
         'type': random.choice(['email', 'push_notification', 'sms']),
-        'message': factory.Faker('sentence', nb_words=10).generate(),
+        'message': _FAKER.sentence(nb_words=10),
         'priority': random.choice(['low', 'medium', 'high'])
     })
     
@@ -293,42 +317,55 @@ class AlertFactory(factory.Factory):
 
 # Utility functions for generating test datasets
 
-def create_realistic_trading_session(user_id: int = 1, date: str = None) -> Dict[str, Any]:
+# Trade factories mixed into a session and their probabilities per session type
+_SESSION_TRADE_FACTORIES = (WinningTradeFactory, LosingTradeFactory, BreakevenTradeFactory)
+_SESSION_TRADE_MIX = {
+    'good_day': (0.7, 0.3, 0.0),   # More winning trades
+    'bad_day': (0.3, 0.7, 0.0),    # More losing trades
+    'mixed_day': (1 / 3, 1 / 3, 1 / 3),
+}
+
+
+def create_realistic_trading_session(
+    user_id: int = 1,
+    date: str = None,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, Any]:
     """Create a realistic trading session with multiple trades and a daily plan"""
     
+    if rng is None:
+        rng = np.random.default_rng()
     if date is None:
-        date = factory.Faker('date_between', start_date='-30d', end_date='today').generate()
+        date = _FAKER.date_between(start_date='-30d', end_date='today')
     
     # Create daily plan
     daily_plan = DailyPlanFactory(user_id=user_id, date=date)
     
     # Create trades for the day
     num_trades = random.randint(2, 6)
-    trades = []
+    trades = [None] * num_trades
     
     # Determine session outcome (good day, bad day, mixed)
     session_type = random.choice(['good_day', 'bad_day', 'mixed_day'])
     
-    for i in range(num_trades):
-        if session_type == 'good_day':
-            # More winning trades
-            trade_factory = WinningTradeFactory if random.random() > 0.3 else LosingTradeFactory
-        elif session_type == 'bad_day':
-            # More losing trades
-            trade_factory = LosingTradeFactory if random.random() > 0.3 else WinningTradeFactory
-        else:
-            # Mixed results
-            trade_factory = random.choice([WinningTradeFactory, LosingTradeFactory, BreakevenTradeFactory])
-        
-        trade = trade_factory(
+    # Pick every trade's factory at once, then build each factory's trades in one batch
+    picks = rng.choice(len(_SESSION_TRADE_FACTORIES), size=num_trades, p=_SESSION_TRADE_MIX[session_type])
+    entry_times = [
+        datetime.combine(date, time(hour=9 + i, minute=random.randint(0, 59)))
+        for i in range(num_trades)
+    ]
+    for kind, trade_factory in enumerate(_SESSION_TRADE_FACTORIES):
+        indices = np.flatnonzero(picks == kind).tolist()
+        if not indices:
+            continue
+        batch = trade_factory.build_batch(
+            len(indices),
             user_id=user_id,
             trade_date=date,
-            entry_time=datetime.combine(date, time(
-                hour=9 + i,
-                minute=random.randint(0, 59)
-            ))
+            entry_time=factory.Iterator([entry_times[i] for i in indices], cycle=False)
         )
-        trades.append(trade)
+        for i, trade in zip(indices, batch):
+            trades[i] = trade
     
     # Create journal entry for the day
     journal_entry = JournalEntryFactory(
@@ -348,46 +385,61 @@ def create_realistic_trading_session(user_id: int = 1, date: str = None) -> Dict
 def create_performance_dataset(
     user_id: int = 1,
     days: int = 90,
-    win_rate: float = 0.65
+    win_rate: float = 0.65,
+    seed: Optional[int] = None
 ) -> Dict[str, List[Any]]:
-    """Create a performance dataset with specified characteristics"""
-    
+    """
+    Create a performance dataset with specified characteristics
+    
+    With a ``seed`` the dataset's content (days, trade counts, prices, text)
+    is the same on every run with the same arguments on the same day. This
+    reseeds the global ``random`` module and factory_boy's and Faker's shared
+    generators, which every factory draws from. Record ids still come from
+    the factories' sequences.
+    """
+    
+    if seed is not None:
+        random.seed(seed)
+        factory.random.reseed_random(seed)
+        _FAKER.seed_instance(seed)
+    rng = np.random.default_rng(seed)
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
     all_trades = []
     all_plans = []
     all_journal_entries = []
+    total_wins = 0
     
-    current_date = start_date
-    while current_date <= end_date:
-        # Skip weekends
-        if current_date.weekday() < 5:
-            # Determine if trading happened (90% chance on weekdays)
-            if random.random() < 0.9:
-                session = create_realistic_trading_session(user_id, current_date)
-                
-                # Adjust win rate
-                winning_trades = sum(1 for trade in session['trades'] if trade['outcome'] == 'win')
-                total_trades = len(session['trades'])
-                current_win_rate = winning_trades / total_trades if total_trades > 0 else 0
-                
-                # Adjust trades to match target win rate
-                if current_win_rate < win_rate and total_trades > 0:
-                    # Convert some losing trades to winning
-                    losing_indices = [i for i, trade in enumerate(session['trades']) if trade['outcome'] == 'loss']
-                    if losing_indices:
-                        idx = random.choice(losing_indices)
-                        session['trades'][idx] = WinningTradeFactory(
-                            user_id=user_id,
-                            trade_date=current_date
-                        )
-                
-                all_trades.extend(session['trades'])
-                all_plans.append(session['daily_plan'])
-                all_journal_entries.append(session['journal_entry'])
+    # Weekdays in the window, each traded with a 90% chance
+    calendar = np.arange(np.datetime64(start_date), np.datetime64(end_date) + 1)
+    weekdays = calendar[np.is_busday(calendar)]
+    trading_days = weekdays[rng.random(weekdays.size) < 0.9]
+    
+    for current_date in trading_days.tolist():
+        session = create_realistic_trading_session(user_id, current_date, rng)
+        
+        # Adjust win rate
+        winning_trades = sum(1 for trade in session['trades'] if trade['outcome'] == 'win')
+        total_trades = len(session['trades'])
+        current_win_rate = winning_trades / total_trades if total_trades > 0 else 0
         
-        current_date += timedelta(days=1)
+        # Adjust trades to match target win rate
+        if current_win_rate < win_rate and total_trades > 0:
+            # Convert some losing trades to winning
+            losing_indices = [i for i, trade in enumerate(session['trades']) if trade['outcome'] == 'loss']
+            if losing_indices:
+                idx = losing_indices[rng.integers(len(losing_indices))]
+                session['trades'][idx] = WinningTradeFactory(
+                    user_id=user_id,
+                    trade_date=current_date
+                )
+                winning_trades += 1
+        
+        total_wins += winning_trades
+        all_trades.extend(session['trades'])
+        all_plans.append(session['daily_plan'])
+        all_journal_entries.append(session['journal_entry'])
     
     return {
         'trades': all_trades,
@@ -396,7 +448,7 @@ def create_performance_dataset(
         'summary': {
             'total_trades': len(all_trades),
             'total_days': len(all_plans),
-            'actual_win_rate': sum(1 for trade in all_trades if trade['outcome'] == 'win') / len(all_trades),
+            'actual_win_rate': total_wins / len(all_trades),
             'date_range': (start_date, end_date)
         }
     }
@@ -429,7 +481,12 @@ def create_test_user_with_history(
     )
     
     # Create alerts
-    alerts = [AlertFactory(user_id=user['id']) for _ in range(random.randint(2, 5))]
+    alerts = AlertFactory.build_batch(random.randint(2, 5), user_id=user['id'])
+    
+    # P&L per trading day in a single pass
+    daily_pnl = defaultdict(float)
+    for trade in history['trades']:
+        daily_pnl[trade['trade_date']] += trade['profit_loss']
     
     return {
         'user': user,
@@ -438,15 +495,9 @@ def create_test_user_with_history(
         'performance_summary': {
             'total_trades': len(history['trades']),
             'win_rate': history['summary']['actual_win_rate'],
-            'total_pnl': sum(trade['profit_loss'] for trade in history['trades']),
-            'best_day': max([
-                sum(trade['profit_loss'] for trade in history['trades'] if trade['trade_date'] == date)
-                for date in set(trade['trade_date'] for trade in history['trades'])
-            ]),
-            'worst_day': min([
-                sum(trade['profit_loss'] for trade in history['trades'] if trade['trade_date'] == date)
-                for date in set(trade['trade_date'] for trade in history['trades'])
-            ])
+            'total_pnl': sum(daily_pnl.values()),
+            'best_day': max(daily_pnl.values()),
+            'worst_day': min(daily_pnl.values())
         }
     }
 
@@ -458,8 +509,8 @@ def create_stress_test_data(num_users: int = 100, trades_per_user: int = 1000) -
     users_data = []
     
     for i in range(num_users):
-        user = UserFactory()
-        trades = [TradeFactory(user_id=user['id']) for _ in range(trades_per_user)]
+        user = UserFactory.build()
+        trades = TradeFactory.build_batch(trades_per_user, user_id=user['id'])
         users_data.append({
             'user': user,
             'trades': trades
@@ -473,14 +524,10 @@ def create_edge_case_data() -> Dict[str, List]:
     return {
         'extreme_winners': [WinningTradeFactory(profit_loss=1000 + random.uniform(0, 500)) for _ in range(5)],
         'extreme_losers': [LosingTradeFactory(profit_loss=-500 - random.uniform(0, 300)) for _ in range(5)],
-        'micro_positions': [TradeFactory(position_size=0.1) for _ in range(10)],
+        'micro_positions': TradeFactory.build_batch(10, position_size=0.1),
         'large_positions': [TradeFactory(position_size=50 + random.randint(0, 50)) for _ in range(10)],
-        'same_day_multiple': [
-            TradeFactory(trade_date=datetime.now().date()) for _ in range(20)
-        ],
-        'weekend_trades': [
-            TradeFactory(trade_date=datetime.now().date() + timedelta(days=6)) for _ in range(5)
-        ]
+        'same_day_multiple': TradeFactory.build_batch(20, trade_date=datetime.now().date()),
+        'weekend_trades': TradeFactory.build_batch(5, trade_date=datetime.now().date() + timedelta(days=6))
     }
 
 